@@ -1,4 +1,9 @@
 from odoo import models, fields, api
+from odoo.tools.sql import column_exists, create_column
+
+# Recompute pending is_commercial_partner values with SQL, when at
+# least that many partners are written at once.
+SQL_RECOMPUTE_MIN_SIZE = 1000
 
 
 class ResPartner(models.Model):
@@ -15,3 +20,79 @@ class ResPartner(models.Model):
     def _compute_is_commercial_partner(self):
         for rec in self:
             rec.is_commercial_partner = rec == rec.commercial_partner_id
+
+    def _auto_init(self):
+        """Extend to set is_commercial_partner with SQL on install.
+
+        Column is created and filled before ORM sees it, so it is not
+        recomputed for every partner one by one.
+        """
+        cr = self.env.cr
+        if not column_exists(cr, 'res_partner', 'is_commercial_partner'):
+            create_column(cr, 'res_partner', 'is_commercial_partner', 'bool')
+            # Constraints of other modules are not loaded yet.
+            self._recompute_is_commercial_partner_sql(validate=False)
+        return super()._auto_init()
+
+    @api.model
+    def _recompute_is_commercial_partner_sql(
+            self, partner_ids=None, validate=True):
+        """Recompute is_commercial_partner using one SQL update.
+
+        Can be used in migrations or after mass changes, bypassing ORM
+        compute. Pending ORM recomputation is discarded for updated
+        partners.
+
+        Args:
+            partner_ids (list): IDs of partners to recompute. If not
+                specified, all partners are recomputed (default: {None}).
+            validate (bool): check constraints depending on
+                is_commercial_partner for partners whose value changed,
+                like ORM compute does (default: {True}).
+
+        Returns:
+            int: number of updated rows.
+
+        """
+        if partner_ids is not None and not partner_ids:
+            return 0
+        field = self._fields['is_commercial_partner']
+        self.flush(['commercial_partner_id'])
+        query = """
+            UPDATE res_partner
+            SET is_commercial_partner = COALESCE(
+                id = commercial_partner_id, FALSE)
+            WHERE is_commercial_partner IS DISTINCT FROM COALESCE(
+                id = commercial_partner_id, FALSE)
+        """
+        params = []
+        if partner_ids is not None:
+            query += " AND id IN %s"
+            params.append(tuple(partner_ids))
+        self.env.cr.execute(query + " RETURNING id", params)
+        updated_ids = [row[0] for row in self.env.cr.fetchall()]
+        if partner_ids is None:
+            records = self.env.records_to_compute(field)
+        else:
+            records = self.browse(partner_ids)
+        self.env.remove_to_compute(field, records)
+        self.invalidate_cache(['is_commercial_partner'], partner_ids)
+        if validate and updated_ids:
+            self.browse(updated_ids)._validate_fields(
+                ['is_commercial_partner'])
+        return len(updated_ids)
+
+    def write(self, vals):
+        """Extend to recompute is_commercial_partner with SQL in bulk.
+
+        Threshold is checked against written partners only, but all
+        pending values are recomputed (including contacts of written
+        partners), validating constraints that depend on them.
+        """
+        res = super().write(vals)
+        if len(self) >= SQL_RECOMPUTE_MIN_SIZE:
+            field = self._fields['is_commercial_partner']
+            records = self.env.records_to_compute(field)
+            if records:
+                self._recompute_is_commercial_partner_sql(records.ids)
+        return res
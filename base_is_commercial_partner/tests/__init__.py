@@ -1,2 +1,2 @@
-from . import test_is_commercial_partner
-__all__ = [test_is_commercial_partner]
+from . import test_is_commercial_partner, test_is_commercial_partner_benchmark
+__all__ = [test_is_commercial_partner, test_is_commercial_partner_benchmark]
@@ -1,5 +1,9 @@
+from unittest.mock import patch
+
 from odoo.tests import common
 
+from odoo.addons.base_is_commercial_partner.models import res_partner
+
 
 class TestISCommercialPartner(common.SavepointCase):
     """Test is_commercial_partner field."""
@@ -35,3 +39,31 @@ class TestISCommercialPartner(common.SavepointCase):
         """
         self.partner_child.parent_id = False
         self.assertTrue(self.partner_child.is_commercial_partner)
+
+    def test_05_recompute_is_commercial_partner_sql(self):
+        """Recompute wrong values using SQL."""
+        self.env.cr.execute(
+            "UPDATE res_partner SET is_commercial_partner = NOT "
+            "is_commercial_partner WHERE id IN %s",
+            ((self.partner.id, self.partner_child.id),)
+        )
+        ResPartner = self.env['res.partner']
+        # Only specified partners are recomputed.
+        self.assertEqual(
+            ResPartner._recompute_is_commercial_partner_sql(
+                [self.partner.id]),
+            1
+        )
+        self.assertTrue(self.partner.is_commercial_partner)
+        self.assertTrue(self.partner_child.is_commercial_partner)
+        self.assertEqual(
+            ResPartner._recompute_is_commercial_partner_sql(), 1)
+        self.assertFalse(self.partner_child.is_commercial_partner)
+
+    def test_06_is_commercial_partner_bulk_write(self):
+        """Recompute with SQL on bulk write."""
+        field = self.env['res.partner']._fields['is_commercial_partner']
+        with patch.object(res_partner, 'SQL_RECOMPUTE_MIN_SIZE', 1):
+            self.partner_child.parent_id = False
+            self.assertFalse(self.env.records_to_compute(field))
+        self.assertTrue(self.partner_child.is_commercial_partner)
@@ -0,0 +1,88 @@
+import time
+import logging
+
+from odoo.tests import common, tagged
+
+_logger = logging.getLogger(__name__)
+
+# Half of them are contacts of other half.
+PARTNERS_COUNT = 1000000
+REPARENT_COUNT = 10000
+
+
+@tagged('-standard', 'base_is_commercial_partner_benchmark')
+class TestIsCommercialPartnerBenchmark(common.SavepointCase):
+    """Benchmark is_commercial_partner recompute on many partners.
+
+    Not run by default. Use
+    `--test-tags base_is_commercial_partner_benchmark`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Insert partners directly, to not spend time on ORM."""
+        super().setUpClass()
+        cls.ResPartner = cls.env['res.partner']
+        cr = cls.env.cr
+        cr.execute("""
+            INSERT INTO res_partner (
+                name, display_name, active, is_company, type
+            )
+            SELECT 'Bench Company ' || n, 'Bench Company ' || n, TRUE,
+                TRUE, 'contact'
+            FROM generate_series(1, %s) n
+            RETURNING id
+        """, (PARTNERS_COUNT // 2,))
+        cls.company_ids = [r[0] for r in cr.fetchall()]
+        cr.execute("""
+            UPDATE res_partner SET commercial_partner_id = id
+            WHERE id IN %s
+        """, (tuple(cls.company_ids),))
+        cr.execute("""
+            INSERT INTO res_partner (
+                name, display_name, active, is_company, type, parent_id,
+                commercial_partner_id
+            )
+            SELECT 'Bench Contact', 'Bench Contact', TRUE, FALSE,
+                'contact', id, id
+            FROM res_partner
+            WHERE id IN %s
+            RETURNING id
+        """, (tuple(cls.company_ids),))
+        cls.contact_ids = [r[0] for r in cr.fetchall()]
+        cr.execute("ANALYZE res_partner")
+
+    def _measure(self, label, func):
+        self.ResPartner.flush()
+        queries_before = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        res = func()
+        self.ResPartner.flush()
+        queries = self.env.cr.sql_log_count - queries_before
+        _logger.info(
+            "%s: %s queries, %.2f s", label, queries,
+            time.perf_counter() - start)
+        return res, queries
+
+    def test_01_recompute_all(self):
+        """Recompute flag for all partners, like on install."""
+        self.env.cr.execute(
+            "UPDATE res_partner SET is_commercial_partner = NULL")
+        updated, queries = self._measure(
+            "SQL recompute of all partners",
+            self.ResPartner._recompute_is_commercial_partner_sql)
+        self.assertGreaterEqual(updated, PARTNERS_COUNT)
+        self.assertLess(queries, 5)
+        self.env.cr.execute("""
+            SELECT count(*) FROM res_partner
+            WHERE is_commercial_partner AND id IN %s
+        """, (tuple(self.company_ids),))
+        self.assertEqual(self.env.cr.fetchone()[0], len(self.company_ids))
+
+    def test_02_mass_reparent(self):
+        """Detach many contacts from their parents."""
+        contacts = self.ResPartner.browse(self.contact_ids[:REPARENT_COUNT])
+        self._measure(
+            "Reparent %s contacts" % REPARENT_COUNT,
+            lambda: contacts.write({'parent_id': False}))
+        self.assertTrue(all(contacts.mapped('is_commercial_partner')))
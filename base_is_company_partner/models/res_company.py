@@ -1,4 +1,4 @@
-from odoo import models, tools
+from odoo import models, api, tools
 
 
 class ResCompany(models.Model):
@@ -12,11 +12,32 @@ class ResCompany(models.Model):
             [('partner_id', '=', partner_id)], limit=1
         ).id
 
+    def _update_is_company_partner(self, partners):
+        self.env['res.partner']._update_is_company_partner(partners.ids)
+
     # NOTE. cache is always cleared on write in standard Odoo already,
-    # so we don't need to extend write.
+    # so we don't need to extend write for that.
+
+    @api.model
+    def create(self, vals):
+        """Extend to mark company partner."""
+        company = super().create(vals)
+        self._update_is_company_partner(company.partner_id)
+        return company
+
+    def write(self, vals):
+        """Extend to update is_company_partner of old and new partners."""
+        if 'partner_id' not in vals and 'active' not in vals:
+            return super().write(vals)
+        partners = self.mapped('partner_id')
+        res = super().write(vals)
+        self._update_is_company_partner(partners | self.mapped('partner_id'))
+        return res
 
     def unlink(self):
-        """Extend to clear _is_company_partner cache."""
+        """Extend to clear _is_company_partner cache and unmark partners."""
+        partners = self.mapped('partner_id')
         res = super().unlink()
         self._find_partner_company_id.clear_cache(self.env[self._name])
+        self._update_is_company_partner(partners)
         return res
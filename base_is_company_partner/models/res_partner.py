@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class ResPartner(models.Model):
@@ -6,31 +6,49 @@ class ResPartner(models.Model):
 
     _inherit = 'res.partner'
 
+    # Maintained by res.company, when its partner_id or active changes.
+    # Archived companies are ignored.
     is_company_partner = fields.Boolean(
-        compute='_compute_is_company_partner',
-        search='_search_is_company_partner'
+        readonly=True,
+        index=True,
+        copy=False,
     )
 
-    def _compute_is_company_partner(self):
-        _find_partner_company_id = self.env[
-            'res.company'
-        ]._find_partner_company_id
-        for partner in self:
-            partner.is_company_partner = bool(
-                _find_partner_company_id(partner.id)
-            )
+    def init(self):
+        """Extend to set is_company_partner for existing partners."""
+        res = super().init()
+        self._update_is_company_partner()
+        return res
+
+    @api.model
+    def _update_is_company_partner(self, partner_ids=None):
+        """Set is_company_partner using one SQL update.
+
+        Args:
+            partner_ids (list): IDs of partners to update. If not
+                specified, all partners are updated (default: {None}).
 
-    def _search_is_company_partner(self, op, value):
-        # We always find company partners, because there will be much
-        # less such partners than not company partners. This way we can
-        # reverse search if needed.
-        # Must use sudo to search for all companies (for non admin
-        # users).
-        companies = self.env['res.company'].sudo().search([])
-        partner_company_ids = companies.mapped('partner_id.id')
-        bool_val = bool(value)
-        # Searching for company partners.
-        if op == '=' and bool_val or op == '!=' and not bool_val:
-            return [('id', 'in', partner_company_ids)]
-        # Otherwise reverse result to find not company partners.
-        return [('id', 'not in', partner_company_ids)]
+        Returns:
+            None
+
+        """
+        self.env['res.company'].flush(['partner_id', 'active'])
+        query = """
+            UPDATE res_partner p
+            SET is_company_partner = EXISTS(
+                SELECT 1 FROM res_company c
+                WHERE c.partner_id = p.id AND c.active
+            )
+            WHERE is_company_partner IS DISTINCT FROM EXISTS(
+                SELECT 1 FROM res_company c
+                WHERE c.partner_id = p.id AND c.active
+            )
+        """
+        params = []
+        if partner_ids is not None:
+            if not partner_ids:
+                return
+            query += " AND p.id IN %s"
+            params.append(tuple(partner_ids))
+        self.env.cr.execute(query, params)
+        self.invalidate_cache(['is_company_partner'], partner_ids)
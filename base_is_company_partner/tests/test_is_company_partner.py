@@ -92,3 +92,40 @@ class TestIsCompanyPartner(TestBaseCommon):
         self.assertTrue(self.ResCompany._find_partner_company_id(partner_2.id))
         partner_2.invalidate_cache()
         self.assertTrue(partner_2.with_user(self.user_demo).is_company_partner)
+
+    def test_03_is_company_partner_stored(self):
+        """Check is_company_partner is searched as stored column.
+
+        Case 1: search query does not include companies.
+        Case 2: flag is restored for partners with wrong value.
+        """
+        # Case 1.
+        query = self.ResPartner._where_calc(
+            [('is_company_partner', '=', True)]
+        )
+        sql, _params = query.select()
+        self.assertIn('"is_company_partner"', sql)
+        self.assertNotIn('res_company', sql)
+        # Case 2.
+        self.env.cr.execute(
+            "UPDATE res_partner SET is_company_partner = NOT "
+            "COALESCE(is_company_partner, FALSE) WHERE id IN %s",
+            ((self.partner_main.id, self.partner_azure.id),)
+        )
+        self.ResPartner._update_is_company_partner()
+        self.assertTrue(self.partner_main.is_company_partner)
+        self.assertFalse(self.partner_azure.is_company_partner)
+
+    def test_04_is_company_partner_archived(self):
+        """Archive and unarchive company referring to partner."""
+        company_2 = self.ResCompany.create({'name': 'NewCompany2'})
+        partner = company_2.partner_id
+        company_2.active = False
+        self.assertFalse(partner.is_company_partner)
+        self.assertFalse(
+            self.ResPartner.search([
+                ('is_company_partner', '=', True), ('id', '=', partner.id)
+            ])
+        )
+        company_2.active = True
+        self.assertTrue(partner.is_company_partner)
@@ -3,6 +3,7 @@ from . import (
     base,
     datetime,
     ir_config_parameter,
+    ir_rule,
     odootil,
     odootil_base_struct,
     odootil_bin_field,
@@ -19,6 +20,7 @@ __all__ = [
     base,
     datetime,
     ir_config_parameter,
+    ir_rule,
     odootil,
     odootil_base_struct,
     odootil_bin_field,
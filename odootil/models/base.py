@@ -2,7 +2,7 @@ import itertools
 import collections
 from footil.sorting import ReverseComparator
 
-from odoo import models, api, _
+from odoo import models, api, tools, _
 from odoo.osv import expression
 from odoo.exceptions import ValidationError
 from odoo.tests.common import Form
@@ -10,42 +10,56 @@ from odoo.tests.common import Form
 from ..tools.search import get_name_search_domain
 
 PSQL_DESC = 'desc'
+PSQL_NULLS_FIRST = 'nulls first'
+PSQL_NULLS_LAST = 'nulls last'
 
+# key: field name, options: e.g. 'desc NULLS LAST', reverse: whether
+# key order is reversed (descending), nulls_first: whether empty values
+# go first.
+OrderItem = collections.namedtuple(
+    'OrderItem', ['key', 'options', 'reverse', 'nulls_first'])
+# Field types, which values are never empty, when sorting.
+NOT_EMPTY_FIELD_TYPES = ('boolean', 'integer', 'float', 'monetary')
 
-class NewIdSorted(models.NewId):
-    """Subclass for NewId to make it sortable with real record.
 
-    Comparing is done in three ways:
-        - Both have origin. Comparing origin.
-        - Only one has origin. Less than is the one with origin.
-        - None have origin. Comparing with pos (position).
+class OrderSpec(object):
+    """Parsed order spec, as used by attribute _order.
+
+    If NULLS placement is not specified, it is same as in PostgreSQL:
+    nulls go last in ascending order and first in descending order.
     """
 
-    id_iter = itertools.count()
-    __slots__ = ('pos', '_pseudo_id')
-
-    def __init__(self, origin=None, ref=None, pos=0):
-        """Override to include original position in recordset."""
-        super().__init__(origin=origin, ref=ref)
-        self.pos = pos
-        self._pseudo_id = next(self.id_iter)
-
-    def __lt__(self, other):
-        """Compare int or other NewIdSorted object."""
-        if self.origin and other.origin:
-            return self.origin < other.origin
-        # The one with origin is less than without origin.
-        if not self.origin and other.origin:
-            return False
-        if self.origin and not other.origin:
-            return True
-        # None have origin. Comparing with position.
-        return self.pos < other.pos
+    __slots__ = ('items', 'keys')
+
+    def __init__(self, order_spec):
+        """Parse order_spec into items."""
+        self.items = tuple(
+            self._parse_item(item) for item in order_spec.split(',')
+            if item.strip()
+        )
+        self.keys = tuple(item.key for item in self.items)
+
+    @staticmethod
+    def _parse_item(item):
+        # E.g. 'name asc NULLS FIRST' -> ('name', 'asc NULLS FIRST')
+        key, *options = item.strip().split(' ', 1)
+        options = options[0] if options else ''
+        options_lower = ' '.join(options.lower().split())
+        reverse = PSQL_DESC in options_lower
+        if PSQL_NULLS_FIRST in options_lower:
+            nulls_first = True
+        elif PSQL_NULLS_LAST in options_lower:
+            nulls_first = False
+        else:
+            nulls_first = reverse
+        return OrderItem(key, options, reverse, nulls_first)
 
     def __repr__(self):
-        """Return reproducible object in string."""
-        class_name = self.__class__.__name__
-        return '%s(origin=%s, pos=%s)' % (class_name, self.origin, self.pos)
+        """Return object representation with its order spec."""
+        return '%s(%r)' % (
+            self.__class__.__name__,
+            ', '.join(' '.join(filter(None, i[:2])) for i in self.items)
+        )
 
 
 class Base(models.AbstractModel):
@@ -55,8 +69,7 @@ class Base(models.AbstractModel):
 
     # Check helpers.
 
-    def __prepare_search_multicompany_method(
-            self, domain, offset=0, limit=None, order=None, options=None):
+    def __to_multicompany_domain(self, domain, options):
         def is_multi_comp_used(multi_comp_rule_xml_id, company_id):
             # Multi company is used, if there is explicit rule to
             # enable/disable it or if company_id was passed as argument.
@@ -65,7 +78,8 @@ class Base(models.AbstractModel):
                 # Rule that defines if multi-company rule is enabled (
                 # shared globally or per company)
                 return (
-                    self.sudo().env.ref(multi_comp_rule_xml_id).active
+                    self.env['ir.rule'].is_rule_active(
+                        multi_comp_rule_xml_id)
                     # Can filter per company, only if company is passed,
                     # otherwise would filter for partners that have no
                     # company set only.
@@ -78,19 +92,20 @@ class Base(models.AbstractModel):
                 return [('company_id', 'in', [company_id, False])]
             return []
 
-        def to_multicompany_domain(domain):
-            company_domain = get_company_domain(
-                options.get('multi_comp_rule_xml_id'),
-                options.get('company_id', False))
-            return expression.AND([domain, company_domain])
+        company_domain = get_company_domain(
+            options.get('multi_comp_rule_xml_id'),
+            options.get('company_id', False))
+        return expression.AND([domain, company_domain])
 
+    def __prepare_search_multicompany_method(
+            self, domain, offset=0, limit=None, order=None, options=None):
         def _search_multicompany_method(count=False):
             return self.with_context(active_test=active_test).search(
                 domain, offset=offset, limit=limit, order=order, count=count)
 
         if not options:
             options = {}
-        domain = to_multicompany_domain(domain)
+        domain = self.__to_multicompany_domain(domain, options)
         active_test = options.get('active_test', False)
         return _search_multicompany_method
 
@@ -164,6 +179,76 @@ class Base(models.AbstractModel):
         return self.__prepare_search_multicompany_method(
             domain, options=options)(count=True)
 
+    @api.model
+    def search_multicompany_grouped(
+        self,
+        fname,
+        values,
+        domain=None,
+        options=None,
+            ignore_case=True):
+        """Count multi-company friendly records per field value.
+
+        Bulk variant of `search_multicompany_count`, that checks many
+        values using single grouped query. Multi-company domain is
+        resolved once, so all values are checked for the same company.
+
+        Args:
+            fname (str): stored non translatable field name with its own
+                column (e.g. char, integer, many2one) to match values
+                against.
+            values (iterable): values to count records for. Values are
+                cast to field column type.
+            domain (list): base domain for search. Should not include
+                multi-company leaf (default: {None}).
+            options (dict): same options as in
+                `search_multicompany_count` (default: {None}).
+            ignore_case (bool): whether to compare values case
+                insensitively, like '=ilike' operator without wildcards.
+                Used only for text columns (default: {True}).
+
+        Raises:
+            ValueError: if field has no column or is translatable.
+
+        Returns:
+            dict: matched records count per value. Values without
+                matches are not included.
+
+        """
+        field = self._fields[fname]
+        if not (field.store and field.column_type) or field.translate:
+            raise ValueError(
+                "Field '%s' of model '%s' must be stored in its own column "
+                "and not translatable." % (fname, self._name)
+            )
+        # Cast without type modifiers, so values are not truncated to
+        # varchar size.
+        column_type = field.column_type[0]
+        ignore_case = ignore_case and column_type in ('varchar', 'text')
+        values = list({v for v in values if v})
+        if not values:
+            return {}
+        options = options or {}
+        domain = self.__to_multicompany_domain(domain or [], options)
+        Model = self.with_context(
+            active_test=options.get('active_test', False))
+        Model._flush_search(domain, fields=[fname])
+        query = Model._where_calc(domain)
+        Model._apply_ir_rules(query, 'read')
+        column = '"%s"."%s"' % (self._table, fname)
+        if ignore_case:
+            column = 'lower(%s)' % column
+        subquery, params = query.select(
+            '%s AS value' % column, '"%s".id' % self._table)
+        value_expr = 'lower(v.value)' if ignore_case else 'v.value'
+        self.env.cr.execute("""
+            SELECT v.value, COUNT(t.id)
+            FROM unnest(%%s::%s[]) AS v(value)
+            JOIN (%s) AS t ON t.value = %s
+            GROUP BY v.value
+        """ % (column_type, subquery, value_expr), [values] + params)
+        return dict(self.env.cr.fetchall())
+
     # Search helpers.
 
     @api.model
@@ -205,17 +290,30 @@ class Base(models.AbstractModel):
         """Filter keys, leaving only those that could be writable."""
         return [k for k in keys if k not in models.MAGIC_COLUMNS]
 
+    @api.model
+    @tools.ormcache('order_spec')
+    def _get_order_spec(self, order_spec):
+        return OrderSpec(order_spec)
+
+    @api.model
+    def get_order_spec(self, order_spec=None):
+        """Return parsed order spec (OrderSpec), cached per model.
+
+        Args:
+            order_spec (str): sorting spec as used by attribute _order.
+                If not specified, model's _order is used
+                (default: {None}).
+
+        Returns:
+            OrderSpec
+
+        """
+        return self._get_order_spec(order_spec or self._order)
+
     @api.model
     def _orderby_to_items(self, order_spec=None):
-        order_spec = order_spec or self._order
-        for item in order_spec.split(','):
-            # Remove leading white space that might be hanging after
-            # splitting.
-            item = item.lstrip()
-            # E.g. 'name asc NULLS FIRST' -> ('name', 'asc NULLS FIRST')
-            key, *options = item.split(' ', 1)
-            options = options[0] if options else ''
-            yield (key.replace(' ', ''), options)
+        for item in self.get_order_spec(order_spec).items:
+            yield (item.key, item.options)
 
     @api.model
     def orderby_to_keys(self, order_spec=None):
@@ -223,27 +321,24 @@ class Base(models.AbstractModel):
 
         Strips all options, like asc, desc, NULLS {FIRST | LAST}.
         """
-        return [item[0] for item in self._orderby_to_items(
-            order_spec=order_spec)]
+        return list(self.get_order_spec(order_spec).keys)
 
     @api.model
     def orderby_to_writable_keys(self, order_spec=None):
         """Transform Model's _order to list with writable keys."""
-        return self.to_writable_keys(self.orderby_to_keys(
-            order_spec=order_spec))
+        return self.to_writable_keys(self.get_order_spec(order_spec).keys)
 
     @api.model
     def orderby_to_sort_keys(self, order_spec=None):
         """Transform Model's _order to list of tuple keys.
 
         First item in tuple is key, second boolean value, indicating if
-        key order must be reversed (usually descending).
+        key order must be reversed (usually descending) and third one,
+        indicating if empty values go first.
         """
-        def is_reversed(options):
-            return PSQL_DESC in options.lower()
         return [
-            (i[0], is_reversed(i[1])) for i in self._orderby_to_items(
-                order_spec=order_spec)
+            (item.key, item.reverse, item.nulls_first)
+            for item in self.get_order_spec(order_spec).items
         ]
 
     @api.model
@@ -251,11 +346,38 @@ class Base(models.AbstractModel):
         """Return function that uses sort_keys for sort function.
 
         Takes into account reverse option, so comparison is done in
-        reverse using ReverseComparator class.
+        reverse using ReverseComparator class. Empty values (None, False
+        or empty recordset) are placed like NULLS FIRST/LAST would place
+        them in SQL. If sort key has no nulls_first item, PostgreSQL
+        default is used (nulls go first only in descending order).
+        Values of numeric and boolean fields are never empty.
+
+        Args:
+            sort_keys (list): (key, reverse) or (key, reverse,
+                nulls_first) tuples, like `orderby_to_sort_keys` returns.
+
+        Returns:
+            function
+
         """
+        def get_value_key(value, reverse, nulls_first, can_be_empty):
+            if can_be_empty and (
+                value is None or value is False or (
+                    isinstance(value, models.BaseModel) and not value)):
+                return (0 if nulls_first else 2, None)
+            return (1, ReverseComparator(value) if reverse else value)
+
+        items = []
+        for key, reverse, *nulls_first in sort_keys:
+            field = self._fields.get(key)
+            items.append((
+                key,
+                reverse,
+                nulls_first[0] if nulls_first else reverse,
+                not (field and field.type in NOT_EMPTY_FIELD_TYPES),
+            ))
         return lambda x: tuple(
-            ReverseComparator(x[k]) if rev else x[k] for (k, rev) in sort_keys
-        )
+            get_value_key(x[key], *options) for key, *options in items)
 
     # recordset helpers.
 
@@ -286,30 +408,158 @@ class Base(models.AbstractModel):
             int
 
         """
+        record.ensure_one()
         if not end:
             end = len(self)
         if start > end:
             raise ValidationError(_("end index must be greater than start."))
-        for i in range(start, end):
-            if self[i] == record:
-                return i
+        if record._name == self._name:
+            ids = self._ids
+            record_id = record.id
+            for i in range(start, end):
+                # NewId without origin and ref is only equal to itself.
+                if ids[i] is record_id or ids[i] == record_id:
+                    return i
         if raise_if_not_found:
-            if not msg:
-                msg = _("%s is not in recordset") % record
-            raise ValidationError(msg)
+            self._raise_record_not_found(record, msg=msg)
         return -1
 
+    def _raise_record_not_found(self, record, msg=None):
+        if not msg:
+            msg = _("%s is not in recordset") % record
+        raise ValidationError(msg)
+
+    @staticmethod
+    def _get_record_index_keys(id_):
+        # NewId is equal to other NewId with same origin or same ref,
+        # but its hash uses only one of them, so it is indexed by both.
+        if not isinstance(id_, models.NewId):
+            return (id_,)
+        keys = []
+        if id_.origin:
+            keys.append(('origin', id_.origin))
+        if id_.ref:
+            keys.append(('ref', id_.ref))
+        # NewId without origin and ref is only equal to itself.
+        return tuple(keys) or (('new', id(id_)),)
+
+    def build_record_index(self):
+        """Return mapping of record ID to its lowest index in recordset.
+
+        Virtual records are mapped by their NewId origin and ref (same
+        as NewId equality), so virtual record can be found by its copy
+        too.
+
+        Returns:
+            dict
+
+        """
+        index = {}
+        for pos, id_ in enumerate(self._ids):
+            for key in self._get_record_index_keys(id_):
+                index.setdefault(key, pos)
+        return index
+
+    def get_record_indexes(
+        self,
+        records,
+        msg=None,
+        raise_if_not_found=True,
+            record_index=None):
+        """Get lowest zero-based index of each record in recordset.
+
+        Recordset is indexed once, so it is faster than calling
+        `get_record_index` for each record.
+
+        Args:
+            records (recordset): records to find index positions for.
+            msg (str): custom exception message to use if record is not
+                found inside recordset (default: {None}).
+            raise_if_not_found (bool): raise ValidationError if any
+                record is not in recordset (default: {True})
+            record_index (dict): index built with `build_record_index`,
+                to reuse it between calls (default: {None}).
+
+        Returns:
+            list of index positions (-1 for records not found), in same
+            order as records.
+
+        """
+        if records._name != self._name:
+            records_index = {}
+        elif record_index is None:
+            records_index = self.build_record_index()
+        else:
+            records_index = record_index
+        res = []
+        for id_ in records._ids:
+            pos = min(
+                (
+                    records_index[key]
+                    for key in self._get_record_index_keys(id_)
+                    if key in records_index
+                ),
+                default=-1
+            )
+            if pos == -1 and raise_if_not_found:
+                self._raise_record_not_found(records.browse(id_), msg=msg)
+            res.append(pos)
+        return res
+
+    def _get_virtual_sort_column(self, item):
+        if item.key == 'id':
+            # Real records go first by id, then virtual ones keep their
+            # position.
+            return [
+                (0, id_) if id_ else (1, pos)
+                for pos, id_ in enumerate(self._ids)
+            ]
+        field = self._fields[item.key]
+        # Rank makes empty values go first or last in sort direction.
+        # Booleans are never empty, like integers and floats.
+        null_rank = int(item.nulls_first == item.reverse)
+        value_rank = 1 - null_rank
+        if field.type in NOT_EMPTY_FIELD_TYPES:
+            return [(value_rank, record[item.key]) for record in self]
+        # First access fetches field for all prefetched records.
+        values = [record[item.key] for record in self]
+        if field.type == 'many2one':
+            ranks = self._get_many2one_sort_ranks(field, values)
+            # Virtual records without origin go after real ones.
+            values = [
+                value and (ranks.get(value._origin.id, len(ranks)),)
+                for value in values
+            ]
+        return [
+            (value_rank, value) if value else (null_rank, None)
+            for value in values
+        ]
+
+    @api.model
+    def _get_many2one_sort_ranks(self, field, values):
+        # Map related record ID to its position in comodel order, using
+        # single query.
+        ids = {value._origin.id for value in values if value._origin}
+        if not ids:
+            return {}
+        Comodel = self.env[field.comodel_name].sudo().with_context(
+            active_test=False)
+        return {
+            id_: rank for rank, id_ in enumerate(
+                Comodel.search([('id', 'in', list(ids))])._ids)
+        }
+
     def sorted_virtual(self, order_spec=None, reverse=False):
         """Return sorted recordset. Records can have pseudo NewId.
 
-        If order_spec has no 'id' column, it uses recordset `sorted`
-        method.
+        Sort values are read per column and positions are sorted with
+        one stable sort per key (from last to first), so no objects are
+        created per record and result is built with single browse.
 
-        If need to sort by 'id', sort data from recordset is extracted
-        into separate list and attributes are sorted like recordset,
-        except for 'id' attribute. 'id' attribute is sorted using
-        NewIdSorted class. Read NewIdSorted docstring about 'id'
-        attribute sorting.
+        'id' is sorted with real records first, then virtual records,
+        keeping their original order. Many2one values are sorted by
+        comodel order. Empty values are placed like NULLS FIRST/LAST
+        would place them in SQL (booleans are never empty).
 
         Args:
             order_spec (str): sorting spec as used by attribute _order
@@ -321,42 +571,60 @@ class Base(models.AbstractModel):
             recordset: sorted recordset.
 
         """
-        def create_data_to_sort(record, pos, keys):
-            vals = {k: record[k] for k in keys}
-            newid_kwargs = {'pos': pos}
-            if record.id:  # real record
-                newid_kwargs['origin'] = record.id
-            else:  # virtual record
-                newid_kwargs['ref'] = record.id.ref
-            # False is NewId record that can have ref.
-            vals['id'] = NewIdSorted(**newid_kwargs)
-            return vals
-
-        def to_sortable_with_map(keys):
-            records_map = {}
-            to_sort = []
-            for pos, record in enumerate(self):
-                data = create_data_to_sort(record, pos, keys)
-                records_map[data['id']._pseudo_id] = record
-                to_sort.append(data)
-            return to_sort, records_map  # map is to convert back.
-
-        def extract_sorted_records(sorted_data, records_map):
-            sorted_recordset = self.env[self._name]
-            for dummy in sorted_data:
-                sorted_recordset |= records_map[dummy['id']._pseudo_id]
-            return sorted_recordset
-
-        order_keys = self.orderby_to_keys(order_spec)
-        sort_keys = self.orderby_to_sort_keys(order_spec)
-        key_func = self.get_sort_key_function(sort_keys)
-        # Only need to hack, if order contains 'id'
-        if 'id' in order_keys:
-            to_sort, records_map = to_sortable_with_map(
-                self.to_writable_keys(order_keys))
-            sorted_data = sorted(to_sort, key=key_func, reverse=reverse)
-            return extract_sorted_records(sorted_data, records_map)
-        return self.sorted(key=key_func, reverse=reverse)
+        positions = list(range(len(self)))
+        for item in reversed(self.get_order_spec(order_spec).items):
+            column = self._get_virtual_sort_column(item)
+            positions.sort(
+                key=column.__getitem__, reverse=item.reverse != reverse)
+        ids = self._ids
+        return self.browse([ids[pos] for pos in positions])
+
+    @api.model
+    def new_batch(self, values=None, origins=None, refs=None):
+        """Return multiple new virtual records, created in one pass.
+
+        All NewIds are created first and browsed at once. Values of
+        plain (non relational, non monetary) fields are converted once
+        and shared by all records, other values are set per record, same
+        as `new` does.
+
+        Args:
+            values (dict): values to set on all records
+                (default: {None}).
+            origins (recordset): records to use as origin, one new record
+                per origin record (default: {None}).
+            refs (iterable): references to NewId, one new record per
+                reference. Used if origins are not specified
+                (default: {None}).
+
+        Returns:
+            recordset with NewId.
+
+        """
+        if origins is not None:
+            new_ids = [models.NewId(origin=id_) for id_ in origins._ids]
+        else:
+            new_ids = [models.NewId(ref=ref) for ref in refs or ()]
+        records = self.browse(new_ids)
+        if not values or not records:
+            return records
+        shared_values = {}
+        record_values = {}
+        for fname, value in values.items():
+            field = self._fields[fname]
+            if field.relational or field.type == 'monetary':
+                record_values[fname] = value
+            else:
+                shared_values[field] = value
+        cache = self.env.cache
+        for field, value in shared_values.items():
+            cache_value = field.convert_to_cache(
+                value, records[0], validate=False)
+            cache.update(records, field, itertools.repeat(cache_value))
+        if record_values:
+            for record in records:
+                record._update_cache(record_values, validate=False)
+        return records
 
     def new_multi(
         self,
@@ -364,8 +632,8 @@ class Base(models.AbstractModel):
             refs=None):
         """Return new virtual record using provided record values.
 
-        This is wrapper for `new` method to handle multiple virtual
-        records at once.
+        This is wrapper for `new_batch` method to handle multiple
+        virtual records at once.
 
         Args:
             values (dict): extra values to use in update.
@@ -378,20 +646,11 @@ class Base(models.AbstractModel):
             recordset with NewId.
 
         """
-        def get_items_and_key():
-            if self:
-                return (self, 'origin')
-            return (refs, 'ref')
-
-        if not values:
-            values = {}
-        items, key = get_items_and_key()
-        if items:
-            new_recs = self.env[self._name]
-            for item in items:
-                new_recs |= self.new(values=values, **{key: item})
-            return new_recs
-        return self.new(values=values)
+        if self:
+            return self.new_batch(values=values, origins=self)
+        if refs:
+            return self.new_batch(values=values, refs=refs)
+        return self.new(values=values or {})
 
     # Selection field helpers.
 
@@ -0,0 +1,25 @@
+from odoo import models, api, tools
+
+
+class IrRule(models.Model):
+    """Extend to add record rule helpers."""
+
+    _inherit = 'ir.rule'
+
+    @api.model
+    @tools.ormcache('xml_id')
+    def is_rule_active(self, xml_id):
+        """Return True if record rule identified by XMLID is active.
+
+        Result is kept in registry cache. ir.rule already clears it (in
+        all workers) when any record rule is created, written or
+        removed.
+
+        Args:
+            xml_id (str): record rule XMLID.
+
+        Returns:
+            bool
+
+        """
+        return self.sudo().env.ref(xml_id).active
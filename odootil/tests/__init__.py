@@ -4,6 +4,7 @@ from . import (
     test_context_timestamp_iso,
     test_get_selection_label,
     test_ir_config_parameter,
+    test_ir_rule,
     test_monetary_format,
     test_num2words,
     test_set_sequence_number,
@@ -14,6 +15,7 @@ from . import (
     test_ir_actions_helpers,
     test_search_helpers,
     test_recordset_helpers,
+    test_recordset_helpers_benchmark,
     test_orderby_helpers,
     test_view_helpers,
     test_constraint_helpers,
@@ -26,6 +28,7 @@ __all__ = [
     test_context_timestamp_iso,
     test_get_selection_label,
     test_ir_config_parameter,
+    test_ir_rule,
     test_monetary_format,
     test_num2words,
     test_set_sequence_number,
@@ -36,6 +39,7 @@ __all__ = [
     test_ir_actions_helpers,
     test_search_helpers,
     test_recordset_helpers,
+    test_recordset_helpers_benchmark,
     test_orderby_helpers,
     test_view_helpers,
     test_constraint_helpers,
@@ -1,7 +1,13 @@
+import time
+import logging
+import tracemalloc
+
 from odoo.tests import common
 from odoo.exceptions import AccessError
 from odoo.tools.misc import mute_logger
 
+_logger = logging.getLogger(__name__)
+
 MODELS_PATH = 'odoo.models'
 BASE_MODELS_PATH = 'odoo.addons.base.models.ir_model'
 # Note. This path exists only if module base_fields_access is installed.
@@ -20,6 +26,43 @@ def _wrap_empty_iterable(objects):
     return objects
 
 
+def measure(self, label, func, trace_alloc=False):
+    """Run func and log its duration and SQL queries count.
+
+    Pending ORM changes are flushed before and after func, so queries
+    it causes are counted too. Intended for benchmark tests.
+
+    Args:
+        label (str): text to log measurements with.
+        func (callable): function to measure, called without arguments.
+        trace_alloc (bool): whether to log peak memory allocated by
+            func too (default: {False}).
+
+    Returns:
+        tuple: func result and SQL queries count.
+
+    """
+    env = self.env
+    env['base'].flush()
+    queries_before = env.cr.sql_log_count
+    if trace_alloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        res = func()
+        env['base'].flush()
+        elapsed = time.perf_counter() - start
+        peak = trace_alloc and tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_alloc:
+            tracemalloc.stop()
+    queries = env.cr.sql_log_count - queries_before
+    _logger.info("%s: %s queries, %.3f s", label, queries, elapsed)
+    if trace_alloc:
+        _logger.info("%s: %.1f MiB allocated at peak", label, peak / 2**20)
+    return res, queries
+
+
 def switch_record_currency(
         self, record, mode='over_limit', currency_fld='currency_id'):
     """Change record (or related one) currency to other than company's.
@@ -0,0 +1,22 @@
+from .common import TestOdootilCommon
+
+
+class TestIrRule(TestOdootilCommon):
+    """Class to test record rule helpers."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up rule to check."""
+        super().setUpClass()
+        cls.IrRule = cls.env['ir.rule']
+        cls.rule_xml_id = 'base.res_partner_rule'
+        cls.rule = cls.env.ref(cls.rule_xml_id)
+
+    def test_01_is_rule_active(self):
+        """Get cached rule state, that is cleared on rule change."""
+        self.rule.active = True
+        self.assertTrue(self.IrRule.is_rule_active(self.rule_xml_id))
+        with self.assertQueryCount(0):
+            self.IrRule.is_rule_active(self.rule_xml_id)
+        self.rule.active = False
+        self.assertFalse(self.IrRule.is_rule_active(self.rule_xml_id))
@@ -48,29 +48,99 @@ class TestOrderbyHelpers(common.TestOdootilCommon):
         """Sort keys _order without options."""
         res = self.ResPartner.orderby_to_sort_keys('name, sequence, id')
         self.assertEqual(
-            res, [('name', False), ('sequence', False), ('id', False)])
+            res,
+            [
+                ('name', False, False),
+                ('sequence', False, False),
+                ('id', False, False),
+            ]
+        )
 
     def test_09_orderby_to_sort_keys(self):
         """Sort keys _order with desc, asc options."""
         res = self.ResPartner.orderby_to_sort_keys(
             'name asc,sequence desc, id')
         self.assertEqual(
-            res, [('name', False), ('sequence', True), ('id', False)])
+            res,
+            [
+                ('name', False, False),
+                ('sequence', True, True),
+                ('id', False, False),
+            ]
+        )
 
     def test_10_orderby_to_sort_keys(self):
         """Sort keys _order with mixed options."""
         res = self.ResPartner.orderby_to_sort_keys(
             'name NULLS FIRST, sequence desc NULLS LAST, id asc nulls last')
         self.assertEqual(
-            res, [('name', False), ('sequence', True), ('id', False)])
+            res,
+            [
+                ('name', False, True),
+                ('sequence', True, False),
+                ('id', False, False),
+            ]
+        )
 
     def test_11_orderby_to_sort_keys(self):
         """Sort keys _order with asc desc as keys."""
         res = self.ResPartner.orderby_to_sort_keys(
             'asc desc, desc')
-        self.assertEqual(res, [('asc', True), ('desc', False)])
+        self.assertEqual(res, [('asc', True, True), ('desc', False, False)])
 
     def test_12_orderby_to_sort_keys(self):
         """Sort keys _order with one key only."""
         res = self.ResPartner.orderby_to_sort_keys('id')
-        self.assertEqual(res, [('id', False)])
+        self.assertEqual(res, [('id', False, False)])
+
+    def test_13_get_order_spec(self):
+        """Parse NULLS placement and reuse parsed order spec."""
+        spec = self.ResPartner.get_order_spec(
+            'name NULLS FIRST, sequence desc nulls  last, color desc, id')
+        self.assertEqual(
+            [(i.key, i.reverse, i.nulls_first) for i in spec.items],
+            [
+                ('name', False, True),
+                ('sequence', True, False),
+                # Same as PostgreSQL default.
+                ('color', True, True),
+                ('id', False, False),
+            ]
+        )
+        self.assertEqual(spec.keys, ('name', 'sequence', 'color', 'id'))
+        self.assertIs(
+            self.ResPartner.get_order_spec(
+                'name NULLS FIRST, sequence desc nulls  last, color desc, id'),
+            spec
+        )
+        # Model's _order is used by default.
+        self.assertEqual(
+            self.ResPartner.get_order_spec().keys,
+            self.ResPartner.get_order_spec(self.ResPartner._order).keys
+        )
+
+    def test_14_get_sort_key_function(self):
+        """Sort records with empty values like SQL would."""
+        partners = self.ResPartner.create([
+            {'name': 'Sort B', 'ref': 'b', 'color': 0},
+            {'name': 'Sort Empty', 'ref': False, 'color': 2},
+            {'name': 'Sort A', 'ref': 'a', 'color': 1},
+        ])
+        b_id, empty_id, a_id = partners.ids
+
+        def sort(sort_keys):
+            if isinstance(sort_keys, str):
+                sort_keys = self.ResPartner.orderby_to_sort_keys(sort_keys)
+            key = self.ResPartner.get_sort_key_function(sort_keys)
+            return [r.id for r in sorted(partners, key=key)]
+
+        # Same as PostgreSQL default.
+        self.assertEqual(sort('ref'), [a_id, b_id, empty_id])
+        self.assertEqual(sort('ref desc'), [empty_id, b_id, a_id])
+        self.assertEqual(sort('ref NULLS FIRST'), [empty_id, a_id, b_id])
+        self.assertEqual(sort('ref desc NULLS LAST'), [b_id, a_id, empty_id])
+        # Zero is not empty value.
+        self.assertEqual(sort('color'), [b_id, a_id, empty_id])
+        # Sort keys without NULLS placement.
+        self.assertEqual(sort([('ref', True)]), [empty_id, b_id, a_id])
+        self.assertEqual(sort([('ref', False)]), [a_id, b_id, empty_id])
@@ -221,3 +221,189 @@ class TestRecordSetHelpers(common.TestOdootilCommon):
         self.assertEqual(records[1].id.ref, 2)
         self.assertEqual(records[0].id.origin, None)
         self.assertEqual(records[1].id.origin, None)
+
+    def test_13_sorted_with_newid_reverse(self):
+        """Sort normal records with NewId records, reversing result."""
+        partner_new_4 = self.ResPartner.new({'name': 'new4', 'color': 2})
+        partners_to_sort = partner_new_4 | self.partners_to_sort
+        sorted_partners = partners_to_sort.sorted_virtual(
+            order_spec=self._order)
+        reversed_partners = partners_to_sort.sorted_virtual(
+            order_spec=self._order, reverse=True)
+        # Recordsets equality does not check order.
+        self.assertEqual(
+            reversed_partners._ids, sorted_partners[::-1]._ids)
+        # Empty recordset.
+        self.assertEqual(
+            self.ResPartner.sorted_virtual(order_spec=self._order),
+            self.ResPartner
+        )
+
+    def test_14_new_batch(self):
+        """Create new records in batch with shared values.
+
+        Case 1: with origins.
+        Case 2: with refs.
+        Case 3: with relational values.
+        """
+        # Case 1.
+        records = self.ResPartner.new_batch(
+            values={'name': 'dummy', 'color': 7}, origins=self.partners)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records.mapped('name'), ['dummy'] * 3)
+        self.assertEqual(records.mapped('color'), [7] * 3)
+        self.assertEqual(
+            [r.id.origin for r in records], self.partners.ids)
+        self.assertEqual(records[0].street, self.partner_1.street)
+        # Changing one record does not change others.
+        records[0].name = 'dummy2'
+        self.assertEqual(records.mapped('name'), ['dummy2', 'dummy', 'dummy'])
+        # Case 2.
+        records = self.ResPartner.new_batch(
+            values=dict(self.new_rec_vals), refs=['a', 'b'])
+        self.assertEqual([r.id.ref for r in records], ['a', 'b'])
+        self.assertEqual(records.mapped('name'), ['dummy', 'dummy'])
+        self.assertFalse(self.ResPartner.new_batch(values={'name': 'x'}))
+        # Case 3.
+        records = self.ResPartner.new_batch(
+            values={
+                'name': 'dummy',
+                'parent_id': self.partner_2.id,
+                'child_ids': [(0, 0, {'name': 'child'})],
+            },
+            refs=[1, 2]
+        )
+        self.assertEqual(records.mapped('parent_id'), self.partner_2)
+        self.assertEqual(len(records.mapped('child_ids')), 2)
+        self.assertNotEqual(records[0].child_ids, records[1].child_ids)
+
+    def test_15_get_record_indexes(self):
+        """Get indexes for multiple records using record index.
+
+        Case 1: real records.
+        Case 2: virtual records.
+        Case 3: record not in recordset.
+        """
+        # Case 1.
+        partners = self.partners + self.partner_1
+        self.assertEqual(
+            partners.build_record_index(),
+            {self.partner_1.id: 0, self.partner_2.id: 1, self.partner_3.id: 2}
+        )
+        self.assertEqual(
+            partners.get_record_indexes(self.partner_3 | self.partner_1),
+            [2, 0]
+        )
+        # Case 2.
+        partner_new = self.ResPartner.new({'name': 'new'})
+        partner_new_ref = self.ResPartner.new({'name': 'ref'}, ref='my_ref')
+        partner_new_origin = self.partner_3.new_multi()
+        partners = (
+            self.partners | partner_new | partner_new_ref | partner_new_origin)
+        record_index = partners.build_record_index()
+        self.assertEqual(
+            partners.get_record_indexes(
+                partner_new | partner_new_origin | partner_new_ref,
+                record_index=record_index),
+            [3, 5, 4]
+        )
+        self.assertEqual(partners.get_record_index(partner_new), 3)
+        # Other NewId with same origin or ref.
+        self.assertEqual(
+            partners.get_record_indexes(
+                self.partner_3.new_multi()
+                | self.ResPartner.new({}, ref='my_ref'),
+                record_index=record_index),
+            [5, 4]
+        )
+        # NewId with origin and ref matches NewId with same ref only.
+        partner_new_both = self.ResPartner.new(
+            {}, origin=self.partner_4, ref='both_ref')
+        partners |= partner_new_both
+        self.assertEqual(
+            partners.get_record_indexes(
+                self.ResPartner.new({}, ref='both_ref')),
+            [6]
+        )
+        self.assertEqual(
+            partners.get_record_index(
+                self.ResPartner.new({}, ref='both_ref')),
+            6
+        )
+        with self.assertRaises(ValueError):
+            partners.get_record_index(partner_new | partner_new_ref)
+        # Case 3.
+        with self.assertRaises(ValidationError):
+            partners.get_record_indexes(self.partner_4 | self.partner_1)
+        self.assertEqual(
+            partners.get_record_indexes(
+                self.partner_4 | self.partner_1, raise_if_not_found=False),
+            [-1, 0]
+        )
+
+    def test_16_sorted_virtual_nulls(self):
+        """Sort with empty values, placing them like SQL does.
+
+        Case 1: default placement.
+        Case 2: explicit placement.
+        Case 3: boolean False is not empty value.
+        """
+        self.partner_1.ref = 'B'
+        self.partner_2.ref = False
+        self.partner_3.ref = 'A'
+        # Case 1.
+        sorted_partners = self.partners.sorted_virtual(order_spec='ref, id')
+        self.assertEqual(
+            sorted_partners._ids,
+            (self.partner_3 + self.partner_1 + self.partner_2)._ids
+        )
+        sorted_partners = self.partners.sorted_virtual(
+            order_spec='ref desc, id')
+        self.assertEqual(
+            sorted_partners._ids,
+            (self.partner_2 + self.partner_1 + self.partner_3)._ids
+        )
+        # Case 2.
+        sorted_partners = self.partners.sorted_virtual(
+            order_spec='ref NULLS FIRST, id')
+        self.assertEqual(
+            sorted_partners._ids,
+            (self.partner_2 + self.partner_3 + self.partner_1)._ids
+        )
+        sorted_partners = self.partners.sorted_virtual(
+            order_spec='ref desc NULLS LAST, id')
+        self.assertEqual(
+            sorted_partners._ids,
+            (self.partner_1 + self.partner_3 + self.partner_2)._ids
+        )
+        # Case 3.
+        self.partners.write({'is_company': True})
+        partner_new = self.ResPartner.new({'name': 'new', 'is_company': False})
+        sorted_partners = (self.partners | partner_new).sorted_virtual(
+            order_spec='is_company, id')
+        self.assertEqual(sorted_partners[0], partner_new)
+
+    def test_17_sorted_virtual_many2one(self):
+        """Sort by many2one using related model order."""
+        # Created in reverse order, so IDs differ from names order.
+        parent_z, parent_a = self.ResPartner.create([
+            {'name': 'Sort Parent Z', 'is_company': True},
+            {'name': 'Sort Parent A', 'is_company': True},
+        ])
+        parent_new = self.ResPartner.new({'name': 'Sort Parent New'})
+        children = self.ResPartner.browse()
+        for parent in (parent_z, self.ResPartner, parent_new, parent_a):
+            children |= self.ResPartner.new(
+                {'name': 'Child', 'parent_id': parent})
+        child_z, child_empty, child_new, child_a = children
+        sorted_children = children.sorted_virtual(order_spec='parent_id')
+        self.assertEqual(
+            sorted_children._ids,
+            (child_a + child_z + child_new + child_empty)._ids
+        )
+        sorted_children = children.sorted_virtual(
+            order_spec='parent_id desc')
+        self.assertEqual(
+            sorted_children._ids,
+            (child_empty + child_new + child_z + child_a)._ids
+        )
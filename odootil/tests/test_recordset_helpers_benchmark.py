@@ -0,0 +1,81 @@
+from odoo.tests import tagged
+
+from . import common
+
+LINES_COUNTS = (10000, 100000)
+
+
+@tagged('-standard', 'odootil_benchmark')
+class TestRecordSetHelpersBenchmark(common.TestOdootilCommon):
+    """Benchmark recordset helpers on many virtual records.
+
+    Not run by default. Use `--test-tags odootil_benchmark`.
+    """
+
+    def _new_lines(self, count):
+        # Like one2many lines in onchange: virtual parent with virtual
+        # children.
+        parent = self.ResPartner.new({
+            'name': 'Bench Parent',
+            'child_ids': [
+                (0, 0, {'name': 'Bench Line %s' % i, 'color': i % 10})
+                for i in range(count)
+            ],
+        })
+        return parent.child_ids
+
+    def test_01_sorted_virtual(self):
+        """Sort many virtual lines by color and id."""
+        for count in LINES_COUNTS:
+            lines = self._new_lines(count)
+            sorted_lines, __ = common.measure(
+                self,
+                "sorted_virtual of %s lines" % count,
+                lambda: lines.sorted_virtual(order_spec='color desc, id'))
+            self.assertEqual(len(sorted_lines), count)
+            colors = sorted_lines.mapped('color')
+            self.assertEqual(colors, sorted(colors, reverse=True))
+
+    def _new_multi_union(self, records, values):
+        # Previous new_multi implementation, for comparison.
+        new_recs = self.ResPartner
+        for record in records:
+            new_recs |= self.ResPartner.new(values=values, origin=record)
+        return new_recs
+
+    def test_02_new_multi(self):
+        """Create many virtual records from existing ones."""
+        values = {'name': 'Bench Clone', 'color': 3}
+        for count in LINES_COUNTS:
+            records = self.ResPartner.browse(range(1, count + 1))
+            if count <= LINES_COUNTS[0]:
+                common.measure(
+                    self,
+                    "new with union of %s records" % count,
+                    lambda: self._new_multi_union(records, values),
+                    trace_alloc=True)
+            new_recs, __ = common.measure(
+                self,
+                "new_multi of %s records" % count,
+                lambda: records.new_multi(values=values),
+                trace_alloc=True)
+            self.assertEqual(len(new_recs), count)
+            self.assertEqual(new_recs[-1].id.origin, count)
+
+    def test_03_get_record_indexes(self):
+        """Find positions of many virtual lines."""
+        for count in LINES_COUNTS:
+            lines = self._new_lines(count)
+            to_find = lines[::-100]
+            if count <= LINES_COUNTS[0]:
+                common.measure(
+                    self,
+                    "get_record_index of %s in %s lines" % (
+                        len(to_find), count),
+                    lambda: [lines.get_record_index(r) for r in to_find])
+            indexes, __ = common.measure(
+                self,
+                "get_record_indexes of %s in %s lines" % (
+                    len(to_find), count),
+                lambda: lines.get_record_indexes(to_find))
+            self.assertEqual(indexes, list(range(count - 1, -1, -100)))
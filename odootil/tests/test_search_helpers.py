@@ -69,3 +69,42 @@ class TestSearchHelpers(TestOdootilCommon):
             args=self.partner_1_search_args,
             operator='=')
         self.assertEqual(self.ResPartner.browse(query_obj), self.partner_1)
+
+    def test_04_search_multicompany_grouped(self):
+        """Count records per value for multiple values at once."""
+        self.partner_1.write({'ref': 'GRP1', 'company_id': False})
+        self.partner_2.write({'ref': 'grp1', 'company_id': self.company.id})
+        self.partner_3.write({'ref': 'GRP3', 'company_id': False})
+        counts = self.ResPartner.search_multicompany_grouped(
+            'ref', ['GRP1', 'GRP3', 'GRP4'])
+        self.assertEqual(counts, {'GRP1': 2, 'GRP3': 1})
+        counts = self.ResPartner.search_multicompany_grouped(
+            'ref', ['GRP1'], ignore_case=False)
+        self.assertEqual(counts, {'GRP1': 1})
+        # Other company sees only partners without company.
+        other_company = self.env['res.company'].create({'name': 'Grp Co'})
+        counts = self.ResPartner.search_multicompany_grouped(
+            'ref', ['GRP1'], options={'company_id': other_company.id})
+        self.assertEqual(counts, {'GRP1': 1})
+        self.assertEqual(
+            self.ResPartner.search_multicompany_grouped('ref', [False]), {})
+        # Values are cast to field column type.
+        self.partner_1.color = 7777
+        self.assertEqual(
+            self.ResPartner.search_multicompany_grouped(
+                'color', [7777, 7778]),
+            {7777: 1}
+        )
+        parent = self.ResPartner.create({'name': 'Grp Parent'})
+        self.ResPartner.create([
+            {'name': 'Grp Child 1', 'parent_id': parent.id},
+            {'name': 'Grp Child 2', 'parent_id': parent.id},
+        ])
+        self.assertEqual(
+            self.ResPartner.search_multicompany_grouped(
+                'parent_id', [parent.id]),
+            {parent.id: 2}
+        )
+        for fname in ('contact_address', 'category_id'):
+            with self.assertRaises(ValueError):
+                self.ResPartner.search_multicompany_grouped(fname, ['a'])
@@ -1,2 +1,2 @@
-from . import res_partner, res_company
-__all__ = [res_partner, res_company]
+from . import res_partner, res_company, ir_rule, ir_config_parameter
+__all__ = [res_partner, res_company, ir_rule, ir_config_parameter]
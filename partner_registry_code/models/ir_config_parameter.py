@@ -0,0 +1,33 @@
+from odoo import models, api
+
+from .res_partner import UNIQUE_INDEX_PARAM
+
+
+class IrConfigParameter(models.Model):
+    """Extend to create/drop company registry index on param change."""
+
+    _inherit = 'ir.config_parameter'
+
+    def _update_company_registry_index(self, keys):
+        if UNIQUE_INDEX_PARAM in keys:
+            self.env['res.partner']._update_company_registry_index()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Extend to enable company registry index."""
+        records = super().create(vals_list)
+        self._update_company_registry_index(records.mapped('key'))
+        return records
+
+    def write(self, vals):
+        """Extend to enable or disable company registry index."""
+        res = super().write(vals)
+        self._update_company_registry_index(self.mapped('key'))
+        return res
+
+    def unlink(self):
+        """Extend to disable company registry index."""
+        keys = self.mapped('key')
+        res = super().unlink()
+        self._update_company_registry_index(keys)
+        return res
@@ -0,0 +1,19 @@
+from odoo import models
+
+from .res_partner import MULTI_COMP_RULE_XMLID
+
+
+class IrRule(models.Model):
+    """Extend to keep company registry index scope up to date."""
+
+    _inherit = 'ir.rule'
+
+    def write(self, vals):
+        """Extend to recreate index when partners sharing is changed."""
+        res = super().write(vals)
+        if 'active' in vals:
+            rule = self.env.ref(
+                MULTI_COMP_RULE_XMLID, raise_if_not_found=False)
+            if rule and rule in self:
+                self.env['res.partner']._update_company_registry_index()
+        return res
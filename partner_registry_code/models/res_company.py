@@ -1,3 +1,5 @@
+import collections
+
 from odoo import models, api
 
 from . res_partner import REGISTRY_KEY
@@ -9,10 +11,19 @@ class ResCompany(models.Model):
     _inherit = 'res.company'
 
     def _set_company_registry_on_partner(self):
-        self.ensure_one()
+        """Set company registry on related partners.
+
+        Partners are updated with one write per distinct value.
+        """
         if not self._context.get('company_registry_set'):
-            self.partner_id.with_context(company_registry_set=True).write(
-                {REGISTRY_KEY: self.company_registry})
+            partners_by_value = collections.defaultdict(
+                lambda: self.env['res.partner'])
+            for company in self:
+                partners_by_value[company.company_registry] |= (
+                    company.partner_id)
+            for company_registry, partners in partners_by_value.items():
+                partners.with_context(company_registry_set=True).write(
+                    {REGISTRY_KEY: company_registry})
 
     @api.model
     def create(self, vals):
@@ -26,6 +37,5 @@ class ResCompany(models.Model):
         """Extend to set company registry on partner."""
         res = super(ResCompany, self).write(vals)
         if REGISTRY_KEY in vals:
-            for company in self:
-                company._set_company_registry_on_partner()
+            self._set_company_registry_on_partner()
         return res
@@ -1,9 +1,19 @@
+import collections
+
+import psycopg2
 from footil.formatting import strip_space
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
 REGISTRY_KEY = 'company_registry'
+MULTI_COMP_RULE_XMLID = 'base.res_partner_rule'
+# When enabled, uniqueness is enforced by unique index instead of
+# constraint method.
+UNIQUE_INDEX_PARAM = 'partner_registry_code.company_registry_unique_index'
+UNIQUE_INDEX_NAME = 'res_partner_company_registry_unique_index'
+# Fields that can change values covered by unique index.
+UNIQUE_INDEX_FIELDS = (REGISTRY_KEY, 'company_id', 'parent_id', 'is_company')
 
 
 class ResPartner(models.Model):
@@ -17,44 +27,170 @@ class ResPartner(models.Model):
         copy=False,
     )
 
+    @api.model
+    def _get_company_registry_error(self, company_registry):
+        return ValidationError(
+            _("Company Registry code must be unique per commercial partner."
+                "\nThere might be a partner which belongs to another "
+                "company or an archived partner with the same code too. "
+                "Company Registry: %s") % company_registry
+        )
+
+    @api.model
+    def _is_company_registry_index_used(self):
+        return self.env['ir.config_parameter'].sudo().get_param_eval(
+            UNIQUE_INDEX_PARAM)
+
+    @api.model
+    def _get_company_registry_index_columns(self):
+        columns = 'lower(company_registry)'
+        if self.env['ir.rule'].is_rule_active(MULTI_COMP_RULE_XMLID):
+            columns += ', COALESCE(company_id, 0)'
+        return columns
+
+    @api.model
+    def _get_company_registry_index_comment(self):
+        # Index columns are kept in its comment, to know if it must be
+        # recreated.
+        self.env.cr.execute(
+            "SELECT obj_description(to_regclass(%s), 'pg_class')",
+            (UNIQUE_INDEX_NAME,))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _update_company_registry_index(self):
+        """Create or drop company registry unique index.
+
+        Index is used only if enabled by system parameter. It is unique
+        globally if partners are shared between companies, otherwise
+        per company (partners without company are treated as separate
+        company, so they are also checked by constraint method).
+
+        Index is recreated only if its columns changed.
+        """
+        cr = self.env.cr
+        if not self._is_company_registry_index_used():
+            cr.execute('DROP INDEX IF EXISTS %s' % UNIQUE_INDEX_NAME)
+            return
+        columns = self._get_company_registry_index_columns()
+        if self._get_company_registry_index_comment() == columns:
+            return
+        cr.execute('DROP INDEX IF EXISTS %s' % UNIQUE_INDEX_NAME)
+        self.flush()
+        try:
+            with cr.savepoint():
+                cr.execute("""
+                    CREATE UNIQUE INDEX %s ON res_partner (%s)
+                    WHERE is_commercial_partner
+                        AND company_registry IS NOT NULL
+                        AND company_registry != ''
+                """ % (UNIQUE_INDEX_NAME, columns))
+        except psycopg2.IntegrityError:
+            raise ValidationError(
+                _("Company Registry unique index can't be created, because "
+                    "there are commercial partners with the same codes."))
+        cr.execute(
+            'COMMENT ON INDEX %s IS %%s' % UNIQUE_INDEX_NAME, (columns,))
+
+    def init(self):
+        """Extend to create company registry unique index if enabled."""
+        res = super().init()
+        self._update_company_registry_index()
+        return res
+
+    def _run_with_company_registry_index(self, func, company_registries=None):
+        # Run func, converting index violation into ValidationError.
+        # company_registries are codes being created or written. If not
+        # given, current codes of records are reported.
+        if not self._is_company_registry_index_used():
+            return func()
+        try:
+            # Savepoint flushes changes (including computed commercial
+            # flag), so index is checked inside it.
+            with self.env.cr.savepoint():
+                res = func()
+        except psycopg2.IntegrityError as e:
+            if e.diag.constraint_name != UNIQUE_INDEX_NAME:
+                raise
+            if company_registries is None:
+                # Savepoint rollback cleared cache, so values are read
+                # as they were before func.
+                company_registries = self.mapped(REGISTRY_KEY)
+            raise self._get_company_registry_error(
+                ', '.join(sorted(set(filter(None, company_registries)))))
+        return res
+
+    @api.model
+    def _check_company_registry_without_company(self, partners):
+        # Per company unique index checks partners without company only
+        # between themselves, but such partners must have unique codes
+        # between all partners.
+        domain = [('is_commercial_partner', '=', True)]
+        partners_with_company = partners.filtered('company_id')
+        for records, extra_domain, max_count in (
+            # Partners without company, except themselves.
+            (partners_with_company, [('company_id', '=', False)], 0),
+            (partners - partners_with_company, [], 1),
+        ):
+            if not records:
+                continue
+            matches = self.sudo().search_multicompany_grouped(
+                REGISTRY_KEY,
+                records.mapped(REGISTRY_KEY),
+                domain=domain + extra_domain,
+            )
+            for rec in records:
+                if matches.get(rec.company_registry, 0) > max_count:
+                    raise self._get_company_registry_error(
+                        rec.company_registry)
+
     @api.constrains(REGISTRY_KEY, 'is_commercial_partner', 'company_id')
     def _check_company_registry(self):
-        for rec in self:
-            company_registry = rec.company_registry
-            if rec.company_registry and rec.is_commercial_partner:
-                matches = rec.sudo().search_multicompany_count(
-                    [
-                        (REGISTRY_KEY, '=ilike', company_registry),
-                        ('is_commercial_partner', '=', True),
-                    ],
-                    options={
-                        'multi_comp_rule_xml_id': 'base.res_partner_rule',
-                        'company_id': rec.company_id.id,
-                    }
-                )
-                if matches > 1:
-                    raise ValidationError(
-                        _("Company Registry code must be unique per "
-                            "commercial partner.\nThere might be a partner "
-                            "which belongs to another company or an archived "
-                            "partner with the same code too. Company "
-                            "Registry: %s") % company_registry
-                    )
+        index_used = self._is_company_registry_index_used()
+        is_shared = not self.env['ir.rule'].is_rule_active(
+            MULTI_COMP_RULE_XMLID)
+        if index_used and is_shared:
+            # Global unique index enforces it.
+            return
+        partners = self.filtered(
+            lambda r: r.company_registry and r.is_commercial_partner)
+        if index_used:
+            # Per company unique index enforces the rest.
+            self._check_company_registry_without_company(partners)
+            return
+        # Multi-company domain depends on company, so codes are counted
+        # per company with one query for all its partners.
+        partners_by_company = collections.defaultdict(list)
+        for rec in partners:
+            partners_by_company[rec.company_id.id].append(rec)
+        for company_id, records in partners_by_company.items():
+            matches = self.sudo().search_multicompany_grouped(
+                REGISTRY_KEY,
+                [rec.company_registry for rec in records],
+                domain=[('is_commercial_partner', '=', True)],
+                options={
+                    'multi_comp_rule_xml_id': MULTI_COMP_RULE_XMLID,
+                    'company_id': company_id,
+                }
+            )
+            for rec in records:
+                if matches.get(rec.company_registry, 0) > 1:
+                    raise self._get_company_registry_error(
+                        rec.company_registry)
 
     def _set_company_registry_on_company(self, company_registry):
         """Set company registry value from partner on company.
 
         Related company is company that is related with partner via
-        `res.company -> partner_id` field.
+        `res.company -> partner_id` field. All related companies are
+        found with one search and updated with one write.
         """
         if not self._context.get('company_registry_set'):
-            # Find companies that are related with partner.
-            Company = companies = self.env['res.company']
-            for rec in self:
-                # There can only be o2o relation between partner and company,
-                # because there is a constraint which does not allow to relate
-                # the same partner with different companies.
-                companies |= Company.search([('partner_id', '=', rec.id)])
+            # There can only be o2o relation between partner and company,
+            # because there is a constraint which does not allow to relate
+            # the same partner with different companies.
+            companies = self.env['res.company'].search(
+                [('partner_id', 'in', self.ids)])
             if companies:
                 companies.with_context(
                     company_registry_set=True).write(
@@ -72,7 +208,10 @@ class ResPartner(models.Model):
         for vals in vals_list:
             if vals.get(REGISTRY_KEY):
                 vals[REGISTRY_KEY] = strip_space(vals[REGISTRY_KEY])
-        return super().create(vals_list)
+        return self._run_with_company_registry_index(
+            lambda: super(ResPartner, self).create(vals_list),
+            company_registries=[vals.get(REGISTRY_KEY) for vals in vals_list]
+        )
 
     def write(self, vals):
         """Extend to update related company with company registry.
@@ -81,7 +220,14 @@ class ResPartner(models.Model):
         """
         if vals.get(REGISTRY_KEY):
             vals[REGISTRY_KEY] = strip_space(vals[REGISTRY_KEY])
-        res = super().write(vals)
+        if any(fname in vals for fname in UNIQUE_INDEX_FIELDS):
+            company_registries = (
+                [vals[REGISTRY_KEY]] if REGISTRY_KEY in vals else None)
+            res = self._run_with_company_registry_index(
+                lambda: super(ResPartner, self).write(vals),
+                company_registries=company_registries)
+        else:
+            res = super().write(vals)
         # Note this is only valid for write, because on create, we know
         # there won't be any related company (this is different than
         # `company_id` relation).
@@ -1,2 +1,2 @@
-from . import test_company_registry
-__all__ = [test_company_registry]
+from . import test_company_registry, test_company_registry_benchmark
+__all__ = [test_company_registry, test_company_registry_benchmark]
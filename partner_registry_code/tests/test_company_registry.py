@@ -1,6 +1,14 @@
+from unittest.mock import patch
+
 from odoo.exceptions import ValidationError
+from odoo.tools.misc import mute_logger
+
+from odoo.addons.odootil.tests.common import TestBaseCommon, SQL_DB_PATH
+from odoo.addons.base_is_commercial_partner.models import (
+    res_partner as commercial_partner,
+)
 
-from odoo.addons.odootil.tests.common import TestBaseCommon
+from ..models.res_partner import UNIQUE_INDEX_NAME, UNIQUE_INDEX_PARAM
 
 
 class TestCompanyRegistry(TestBaseCommon):
@@ -271,3 +279,105 @@ class TestCompanyRegistry(TestBaseCommon):
         """Set registry code on partner with related company."""
         self.company.partner_id.company_registry = '123'
         self.assertEqual(self.company.company_registry, '123')
+
+    def test_23_code_unique_bulk(self):
+        """Create many partners with codes at once.
+
+        Case 1: unique codes are checked with one query per company.
+        Case 2: same code with different case raises.
+        """
+        # Case 1.
+        vals_list = [
+            {
+                'name': 'Bulk %s' % i,
+                'company_registry': 'BULK%s' % i,
+                'company_id': (self.company | self.other_company)[i % 2].id,
+            }
+            for i in range(20)
+        ]
+        partners = self.ResPartner.create(vals_list)
+        # One grouped query per company (instead of one per partner),
+        # plus reading multi-company rule state.
+        with self.assertQueryCount(4):
+            partners._check_company_registry()
+        # Case 2.
+        with self.assertRaises(ValidationError):
+            self.ResPartner.create([
+                {'name': 'Bulk A', 'company_registry': 'BULKA'},
+                {'name': 'Bulk B', 'company_registry': 'bulka'},
+            ])
+
+    def _get_registry_index_def(self):
+        self.env.cr.execute(
+            "SELECT indexdef FROM pg_indexes WHERE indexname = %s",
+            (UNIQUE_INDEX_NAME,))
+        row = self.env.cr.fetchone()
+        return row and row[0]
+
+    def _get_registry_index_oid(self):
+        self.env.cr.execute(
+            "SELECT to_regclass(%s)::oid", (UNIQUE_INDEX_NAME,))
+        return self.env.cr.fetchone()[0]
+
+    @mute_logger(SQL_DB_PATH)
+    def test_24_code_unique_index(self):
+        """Enforce unique codes using unique index.
+
+        Case 1: sharing contacts, index is global.
+        Case 2: not sharing contacts, index is per company, partners
+            without company are checked by constraint method.
+        Case 3: disabling index mode drops index.
+        """
+        self.partner_1.company_registry = 'IDX1'
+        # Case 1.
+        self.IrConfigParameter.set_param(UNIQUE_INDEX_PARAM, 'True')
+        self.assertNotIn('company_id', self._get_registry_index_def())
+        with self.assertQueryCount(0):
+            self.partner_2._check_company_registry()
+        with self.assertRaisesRegex(ValidationError, 'Registry: idx1'):
+            self.partner_2.company_registry = 'idx1'
+        # Case 2.
+        self.share_partner_rule.active = True
+        self.assertIn('company_id', self._get_registry_index_def())
+        self.partner_1.company_id = self.company.id
+        self.partner_2.write({
+            'company_registry': 'IDX1',
+            'company_id': self.other_company.id,
+        })
+        with self.assertRaisesRegex(ValidationError, 'Registry: Idx1$'):
+            self.ResPartner.create({
+                'name': 'Idx',
+                'company_registry': 'Idx1',
+                'company_id': self.company.id,
+            })
+        # Partners without company are unique between all companies.
+        with self.assertRaises(ValidationError):
+            self.ResPartner.create({
+                'name': 'Idx',
+                'company_registry': 'IDX1',
+                'company_id': False,
+            })
+        self.ResPartner.create({
+            'name': 'Idx',
+            'company_registry': 'IDX2',
+            'company_id': False,
+        })
+        with self.assertRaises(ValidationError):
+            self.partner_1.company_registry = 'idx2'
+        # Index is not recreated, if its definition did not change.
+        index_oid = self._get_registry_index_oid()
+        self.ResPartner._update_company_registry_index()
+        self.assertEqual(self._get_registry_index_oid(), index_oid)
+        # Case 3.
+        self.IrConfigParameter.set_param(UNIQUE_INDEX_PARAM, 'False')
+        self.assertFalse(self._get_registry_index_def())
+
+    @mute_logger(SQL_DB_PATH)
+    def test_25_code_unique_bulk_unparent(self):
+        """Unparent contact with parent code, recomputing flag in SQL."""
+        self.partner_2.company_registry = '123'
+        self.assertEqual(self.partner_4.company_registry, '123')
+        # Use SQL recompute path even for single partner.
+        with patch.object(commercial_partner, 'SQL_RECOMPUTE_MIN_SIZE', 1):
+            with self.assertRaises(ValidationError):
+                self.partner_4.write({'parent_id': False})
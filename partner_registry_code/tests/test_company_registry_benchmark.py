@@ -0,0 +1,54 @@
+from odoo.tests import tagged
+
+from odoo.addons.odootil.tests.common import TestBaseCommon, measure
+
+PARTNERS_COUNT = 2000
+COMPANIES_COUNT = 50
+
+
+@tagged('-standard', 'partner_registry_code_benchmark')
+class TestCompanyRegistryBenchmark(TestBaseCommon):
+    """Benchmark company registry sync between partners and companies.
+
+    Not run by default. Use `--test-tags partner_registry_code_benchmark`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up partners and companies to sync codes between."""
+        super().setUpClass()
+        cls.ResPartner = cls.env['res.partner']
+        cls.companies = cls.env['res.company'].create([
+            {'name': 'Bench Company %s' % i}
+            for i in range(COMPANIES_COUNT)
+        ])
+        cls.partners = cls.ResPartner.create([
+            {'name': 'Bench Partner %s' % i, 'is_company': True}
+            for i in range(PARTNERS_COUNT)
+        ]) | cls.companies.mapped('partner_id')
+
+    def test_01_write_partners_registry(self):
+        """Mass write registry on partners, syncing related companies."""
+        __, queries = measure(
+            self,
+            "Partners codes write",
+            lambda: self.partners.write({'company_registry': False}))
+        # Related companies must be found with one search, not one per
+        # partner.
+        self.assertLess(queries, PARTNERS_COUNT / 10)
+        self.assertFalse(any(self.companies.mapped('company_registry')))
+
+    def test_02_write_companies_registry(self):
+        """Mass write registry on companies, syncing related partners."""
+        def write_codes():
+            for company in self.companies:
+                company.company_registry = 'BENCH%s' % company.id
+
+        measure(self, "Companies codes write (one by one)", write_codes)
+        __, queries = measure(
+            self,
+            "Companies codes clear",
+            lambda: self.companies.write({'company_registry': False}))
+        self.assertLess(queries, COMPANIES_COUNT)
+        self.assertFalse(
+            any(self.companies.mapped('partner_id.company_registry')))
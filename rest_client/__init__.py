@@ -1,2 +1,2 @@
-from . import models, exceptions
-__all__ = [models, exceptions]
+from . import models, exceptions, tools
+__all__ = [models, exceptions, tools]
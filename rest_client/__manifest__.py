@@ -12,7 +12,11 @@
         'odootil'
     ],
     'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/rest_client_auth_views.xml',
+        'views/rest_client_metric_views.xml',
+        'views/rest_client_outbox_views.xml',
     ],
     'external_dependencies': {'python': ['footil', 'mergedeep']},
     'installable': False,
@@ -5,3 +5,9 @@ class AuthDataError(ValidationError):
     """Exception when Authentication object data can't be used."""
 
     pass
+
+
+class CircuitOpenError(ValidationError):
+    """Exception when call is rejected, because circuit is open."""
+
+    pass
@@ -1,2 +1,12 @@
-from . import rest_client
-__all__ = [rest_client]
+from . import (
+    rest_client,
+    rest_client_rate_bucket,
+    rest_client_metric,
+    rest_client_outbox,
+)
+__all__ = [
+    rest_client,
+    rest_client_rate_bucket,
+    rest_client_metric,
+    rest_client_outbox,
+]
@@ -1,18 +1,79 @@
 import os
+import copy
+import codecs
+import time
+import threading
+import traceback
 import requests
 import logging
 import mergedeep
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 from footil.formatting import get_formatted_exception
 
-from odoo import models, fields, api, _
+from requests.structures import CaseInsensitiveDict
+from requests.utils import guess_json_utf
+
+import odoo
+from odoo import models, fields, api, tools, SUPERUSER_ID, _
 from odoo.exceptions import ValidationError
 
-from .. exceptions import AuthDataError
+from .. exceptions import AuthDataError, CircuitOpenError
+from .. tools import async_transport, compression, health
+from .. tools.http_cache import (
+    http_caches,
+    get_cache_key,
+    CODE_NOT_MODIFIED,
+    DEFAULT_TTL,
+    DEFAULT_MAX_SIZE,
+)
+from .. tools.metrics import metrics
+from .. tools.policy import (
+    DEFAULT_POLICY, circuit_breakers, get_backoff, get_retry_after
+)
+from .. tools.rate_limit import (
+    CODE_TOO_MANY_REQUESTS,
+    rate_limiters,
+    reserve_shared_token,
+    block_shared,
+)
+from .. tools.streaming import (
+    DEFAULT_CHUNK_SIZE, iter_decoded, iter_json_items, iter_ndjson
+)
+from .. tools.serializers import DEFAULT_BACKEND, get_serializer
+from .. tools.session_pool import (
+    session_pool, get_fingerprint, DEFAULT_POOL_SIZE
+)
 
 _logger = logging.getLogger(__name__)
 
 CODE_OK = 200
+DEFAULT_BATCH_MAX_WORKERS = 8
+TRANSPORT_SYNC = 'sync'
+TRANSPORT_ASYNC = 'async'
+# Response types that are parsed incrementally.
+RESPONSE_NDJSON_STREAM = 'ndjson_stream'
+RESPONSE_JSON_ITEMS_STREAM = 'json_items_stream'
+STREAM_RESPONSE_TYPES = (RESPONSE_NDJSON_STREAM, RESPONSE_JSON_ITEMS_STREAM)
+# Changing any of these fields makes pooled session obsolete.
+SESSION_FIELDS = (
+    'url',
+    'auth_method',
+    'username',
+    'password',
+    'session_keep_alive',
+    'session_pool_size',
+)
+# Changing only these fields does not affect cached payloads.
+HEALTH_FIELDS = (
+    'health_state',
+    'health_dns_time',
+    'health_connect_time',
+    'health_latency',
+    'health_checked_at',
+    'health_message',
+)
 
 
 class RestClientAuth(models.AbstractModel):
@@ -40,6 +101,70 @@ class RestClientAuth(models.AbstractModel):
         copy=False,
         readonly=True,
         required=True)
+    session_keep_alive = fields.Boolean(
+        "Keep-Alive",
+        default=True,
+        help="Reuse pooled connections between calls instead of opening "
+        "new connection for each call.")
+    session_pool_size = fields.Integer(
+        "Connection Pool Size",
+        default=DEFAULT_POOL_SIZE,
+        help="Maximum number of connections kept alive per host in each "
+        "worker.")
+    rate_limit = fields.Float(
+        "Rate Limit",
+        help="Maximum number of requests per second. Zero means no limit.")
+    rate_limit_burst = fields.Integer(
+        "Rate Limit Burst",
+        default=1,
+        help="Number of requests that can be sent at once, before rate "
+        "limit is applied.")
+    rate_limit_shared = fields.Boolean(
+        "Share Rate Limit",
+        help="Coordinate rate limit between all workers using database. "
+        "Otherwise each worker has its own limit.")
+    request_compression = fields.Selection(
+        [
+            ('gzip', 'gzip'),
+            ('deflate', 'deflate'),
+            ('br', 'Brotli'),
+            ('zstd', 'Zstandard'),
+        ],
+        help="Compress request bodies using selected encoding and ask for "
+        "compressed responses. Brotli and Zstandard require related "
+        "python packages.")
+    request_compression_min_size = fields.Integer(
+        "Compression Threshold",
+        default=compression.DEFAULT_MIN_SIZE,
+        help="Request bodies smaller than this (bytes) are sent "
+        "uncompressed.")
+    health_check_uri = fields.Char(
+        "Health Check URI",
+        help="URI (relative to URL) to send HEAD requests to when checking "
+        "health. Base URL is used if not set.")
+    warmup_on_start = fields.Boolean(
+        help="Check health and open pooled connections when server "
+        "loads database, so first calls would not pay connection costs.")
+    health_state = fields.Selection(
+        [('ok', 'Reachable'), ('error', 'Unreachable')],
+        "Health",
+        readonly=True,
+        copy=False)
+    health_dns_time = fields.Float(
+        "DNS Resolution (ms)", readonly=True, copy=False)
+    health_connect_time = fields.Float(
+        "Connection Time (ms)",
+        readonly=True,
+        copy=False,
+        help="Slowest request while opening pooled connections.")
+    health_latency = fields.Float(
+        "Round Trip (ms)",
+        readonly=True,
+        copy=False,
+        help="Request duration through already opened connection.")
+    health_checked_at = fields.Datetime(
+        "Health Checked On", readonly=True, copy=False)
+    health_message = fields.Char(readonly=True, copy=False)
 
     @api.model
     def _get_domain(self, company_id=False):
@@ -52,6 +177,33 @@ class RestClientAuth(models.AbstractModel):
         for rec in self:
             self.env['odootil'].check_url(rec.url)
 
+    @api.constrains('session_pool_size')
+    def _check_session_pool_size(self):
+        for rec in self:
+            if rec.session_pool_size < 1:
+                raise ValidationError(
+                    _("Connection Pool Size must be greater than zero."))
+
+    @api.constrains('rate_limit', 'rate_limit_burst')
+    def _check_rate_limit(self):
+        for rec in self:
+            if rec.rate_limit < 0 or rec.rate_limit_burst < 1:
+                raise ValidationError(
+                    _("Rate Limit can't be negative and Rate Limit Burst "
+                        "must be greater than zero."))
+
+    @api.constrains('request_compression', 'request_compression_min_size')
+    def _check_request_compression(self):
+        for rec in self:
+            encoding = rec.request_compression
+            if encoding and not compression.is_available(encoding):
+                raise ValidationError(
+                    _("Compression '%s' is not available. Install related "
+                        "python package.") % encoding)
+            if rec.request_compression_min_size < 0:
+                raise ValidationError(
+                    _("Compression Threshold can't be negative."))
+
     @api.constrains('state', 'company_id')
     def _check_auth_unique(self):
         for rec in self:
@@ -90,6 +242,117 @@ class RestClientAuth(models.AbstractModel):
             data['auth'] = {'auth': (self.username, self.password)}
         return data
 
+    def _get_session_key(self):
+        self.ensure_one()
+        return (self.env.cr.dbname, self._name, self.id)
+
+    def get_session_data(self):
+        """Return data to get pooled session for this auth object.
+
+        Fingerprint is used to identify outdated sessions in workers
+        that did not see auth object changes.
+        """
+        self.ensure_one()
+        return {
+            'key': self._get_session_key(),
+            'fingerprint': get_fingerprint(
+                *[self[fname] for fname in SESSION_FIELDS]),
+            'keep_alive': self.session_keep_alive,
+            'pool_size': self.session_pool_size,
+        }
+
+    def get_rate_limit_data(self):
+        """Return rate limit data or None if rate is not limited."""
+        self.ensure_one()
+        if not self.rate_limit:
+            return None
+        return {
+            'key': '%s,%s' % (self._name, self.id),
+            'rate': self.rate_limit,
+            'burst': self.rate_limit_burst,
+            'shared': self.rate_limit_shared,
+        }
+
+    def get_compression_data(self):
+        """Return request compression data or None if not used."""
+        self.ensure_one()
+        if not self.request_compression:
+            return None
+        return {
+            'encoding': self.request_compression,
+            'min_size': self.request_compression_min_size,
+        }
+
+    def get_payload(self):
+        """Return auth, session, rate limit and compression data."""
+        self.ensure_one()
+        return {
+            'data': self.get_data(),
+            'session': self.get_session_data(),
+            'rate_limit': self.get_rate_limit_data(),
+            'compression': self.get_compression_data(),
+        }
+
+    @api.model
+    @tools.ormcache(
+        'self.env.uid',
+        'self.env.su',
+        # Record rules depend on allowed companies.
+        "tuple(self._context.get('allowed_company_ids') or ())",
+        'company_id'
+    )
+    def _get_auth_payload_cached(self, company_id):
+        auth = self.get_auth(company_id)
+        if auth:
+            return auth.get_payload()
+        return None
+
+    @api.model
+    def get_auth_payload(self, company_id):
+        """Return payload of auth object for specific company.
+
+        Resolved payload is kept in registry cache, so repeated calls
+        do not query database. Cache is cleared in all workers when any
+        auth object is created, changed (including confirming or
+        resetting to draft) or removed.
+
+        Args:
+            company_id (int): Company ID related with auth object.
+
+        Returns:
+            dict or None if there is no auth object.
+
+        """
+        # Copy, so cached payload would not be changed by caller.
+        return copy.deepcopy(self._get_auth_payload_cached(company_id))
+
+    def _invalidate_sessions(self):
+        session_pool.invalidate(
+            keys=[rec._get_session_key() for rec in self])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Extend to clear cached auth payloads."""
+        records = super().create(vals_list)
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        """Extend to drop cached payloads and outdated sessions."""
+        res = super().write(vals)
+        if any(fname not in HEALTH_FIELDS for fname in vals):
+            self.clear_caches()
+        if any(fname in vals for fname in SESSION_FIELDS):
+            self._invalidate_sessions()
+        return res
+
+    def unlink(self):
+        """Extend to drop cached payloads and pooled sessions."""
+        self._invalidate_sessions()
+        res = super().unlink()
+        self.clear_caches()
+        return res
+
     def action_confirm(self):
         """Confirm Authentication records to be used."""
         self.write({'state': 'confirmed'})
@@ -98,6 +361,75 @@ class RestClientAuth(models.AbstractModel):
         """Set Authentication records back to draft state."""
         self.write({'state': 'draft'})
 
+    def _check_health(self):
+        self.ensure_one()
+        session_data = self.get_session_data()
+        session = self.env['rest.client.controller']._get_session(
+            session_data)
+        connections = session_data['pool_size'] if session else 1
+        url = self.url
+        if self.health_check_uri:
+            url = os.path.join(url, self.health_check_uri)
+        kwargs = self.get_data()['auth'] or {}
+        if session:
+            return health.probe(
+                session, url, connections=connections, **kwargs)
+        # Connections are not kept, so only health is checked.
+        with requests.Session() as session:
+            return health.probe(session, url, **kwargs)
+
+    def action_check_health(self):
+        """Check remote health and warm up pooled connections.
+
+        Host is resolved and connections are opened in current worker
+        pool (up to pool size if Keep-Alive is used). Timings are saved
+        on record.
+        """
+        for rec in self:
+            res = rec._check_health()
+            rec.write({
+                'health_state': 'ok' if res['ok'] else 'error',
+                'health_dns_time': res['dns_time'],
+                'health_connect_time': res['connect_time'],
+                'health_latency': res['latency'],
+                'health_checked_at': fields.Datetime.now(),
+                'health_message': res['error'],
+            })
+
+    @api.model
+    def _cron_check_health(self):
+        """Check health of confirmed records.
+
+        Implementing modules can add cron job for their auth model.
+        """
+        self.search([('state', '=', 'confirmed')]).action_check_health()
+
+    @api.model
+    def _warmup_on_start(self, dbname):
+        # Run in separate thread, waiting for registry to be loaded.
+        try:
+            with odoo.registry(dbname).cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env[self._name].search([
+                    ('state', '=', 'confirmed'),
+                    ('warmup_on_start', '=', True),
+                ]).action_check_health()
+        except Exception:
+            _logger.warning(
+                "Could not warm up %s connections.", self._name,
+                exc_info=True)
+
+    def _register_hook(self):
+        """Extend to warm up connections when registry is loaded."""
+        res = super()._register_hook()
+        if not self._abstract and not tools.config['test_enable']:
+            threading.Thread(
+                target=self._warmup_on_start,
+                args=(self.env.cr.dbname,),
+                daemon=True,
+            ).start()
+        return res
+
 
 class RestClientController(models.AbstractModel):
     """Base model as a client side controller with remote system.
@@ -107,14 +439,181 @@ class RestClientController(models.AbstractModel):
 
     _name = 'rest.client.controller'
     _description = "REST Client Controller"
+    # One of: 'json', 'text', 'ndjson_stream', 'json_items_stream'.
     _response_type = 'json'
+    # Bytes to read at once for streamed response types.
+    _stream_chunk_size = DEFAULT_CHUNK_SIZE
+    # JSON backend: 'json' (standard library), 'orjson', 'msgspec',
+    # 'ujson' or 'fast' (fastest installed one). None means 'json'.
+    # Not installed backend falls back to 'json'.
+    _json_serializer = None
+    # Type to decode 'json' response bodies into (e.g. msgspec.Struct,
+    # dataclass or list of them). None keeps plain dicts/lists.
+    _response_struct = None
     _auth_model = None
+    # Transport used for batch calls: 'sync' (thread pool) or 'async'
+    # (asyncio event loop, requires aiohttp). Async transport can't be
+    # used with retries, circuit breaker or responses cache.
+    _transport = TRANSPORT_SYNC
+    # Timeouts, retries and circuit breaker options, overriding
+    # DEFAULT_POLICY.
+    _rest_policy = {}
+    # Options for GET responses cache: ttl (seconds) and max_size
+    # (number of responses). None disables cache.
+    _http_cache_policy = None
+    # Seconds between saving worker collected metrics into database.
+    _metrics_flush_interval = 60
+    # Maximum number of concurrent outbox calls per dispatched batch.
+    _outbox_max_workers = DEFAULT_BATCH_MAX_WORKERS
 
-    def _get_auth_data(self, company_id):
+    def _get_auth_payload(self, company_id):
         if self._auth_model:
-            auth = self.env[self._auth_model].get_auth(company_id)
-            if auth:
-                return auth.get_data()
+            return self.env[self._auth_model].get_auth_payload(company_id)
+
+    def _get_auth_data(self, company_id):
+        payload = self._get_auth_payload(company_id)
+        if payload:
+            return payload['data']
+
+    @api.model
+    def _get_rest_policy(self):
+        return dict(DEFAULT_POLICY, **self._rest_policy)
+
+    def _get_breaker_key(self, endpoint):
+        return (self._name, urlsplit(endpoint).netloc)
+
+    @api.model
+    def get_circuit_breaker_state(self):
+        """Return circuit breaker state per endpoint host.
+
+        State is kept per worker.
+
+        Returns:
+            dict: host as key and dict with state, failures and
+                opened_at (timestamp) keys as value.
+
+        """
+        return {
+            key[1]: state for key, state in circuit_breakers.get_states(
+                key_filter=lambda k: k[0] == self._name).items()
+        }
+
+    @api.model
+    def reset_circuit_breaker(self):
+        """Close circuits for all hosts of this controller."""
+        circuit_breakers.reset(key_filter=lambda k: k[0] == self._name)
+
+    def _get_http_cache(self, call):
+        policy = self._http_cache_policy
+        if (
+            policy is None or
+            call['method_name'].lower() != 'get' or
+                self._is_response_streamed()):
+            return None
+        return http_caches.get_cache(
+            self._name,
+            ttl=policy.get('ttl', DEFAULT_TTL),
+            max_size=policy.get('max_size', DEFAULT_MAX_SIZE),
+        )
+
+    @api.model
+    def get_http_cache_stats(self):
+        """Return GET responses cache counters of this controller.
+
+        Counters are kept per worker. Bodies of cached responses are
+        shared, so they must not be modified.
+
+        Returns:
+            dict: hits, misses, revalidations (304 responses),
+                evictions and size.
+
+        """
+        return http_caches.get_cache(self._name).get_stats()
+
+    @api.model
+    def clear_http_cache(self):
+        """Remove cached GET responses of this controller."""
+        http_caches.get_cache(self._name).clear()
+
+    def _reserve_rate_limit(self, rate_limit_data):
+        # Return seconds to wait before sending request.
+        if not rate_limit_data:
+            return 0
+        key = rate_limit_data['key']
+        rate, burst = rate_limit_data['rate'], rate_limit_data['burst']
+        if rate_limit_data['shared']:
+            # Separate cursor, so bucket row lock would be released
+            # right away.
+            with self.env.registry.cursor() as cr:
+                return reserve_shared_token(cr, key, rate, burst)
+        return rate_limiters.get_bucket(key, rate, burst).reserve()
+
+    def _block_rate_limit(self, rate_limit_data, seconds):
+        key = rate_limit_data['key']
+        if rate_limit_data['shared']:
+            with self.env.registry.cursor() as cr:
+                block_shared(cr, key, seconds)
+        else:
+            rate_limiters.get_bucket(
+                key, rate_limit_data['rate'], rate_limit_data['burst']
+            ).block(seconds)
+
+    def _handle_rate_limit_response(self, rate_limit_data, response):
+        if rate_limit_data and response.status_code == CODE_TOO_MANY_REQUESTS:
+            retry_after = get_retry_after(response)
+            if retry_after:
+                self._block_rate_limit(rate_limit_data, retry_after)
+
+    def _record_metrics(self, call, response, latency):
+        # Record call in worker metrics. Can be run in separate thread.
+        def get_bytes_in():
+            length = response.headers.get('Content-Length')
+            if length:
+                return int(length)
+            # Do not consume streamed body.
+            if self._is_response_streamed():
+                return 0
+            return len(response.content or b'')
+
+        def get_bytes_out():
+            request = getattr(response, 'request', None)
+            body = request is not None and request.body
+            return len(body) if body else 0
+
+        key = (
+            self._name, call['endpoint_template'], call['method_name'].upper())
+        if response is None:
+            metrics.record(
+                key, latency, error=True, retries=call.get('attempts', 1) - 1)
+            return
+        metrics.record(
+            key,
+            latency,
+            error=response.status_code >= 400,
+            retries=call.get('attempts', 1) - 1,
+            bytes_in=get_bytes_in(),
+            bytes_out=get_bytes_out(),
+        )
+
+    @api.model
+    def _flush_metrics_if_due(self):
+        # Called after (possibly failed) REST calls, so it must never
+        # raise and hide call result or its original exception.
+        try:
+            if metrics.is_flush_due(self._metrics_flush_interval):
+                self.env['rest.client.metric'].flush_worker_metrics()
+        except Exception:
+            _logger.exception("Failed to flush REST calls metrics.")
+
+    @api.model
+    def _get_session(self, session_data):
+        """Return pooled session or None if pooling is not used."""
+        if session_data and session_data['keep_alive']:
+            return session_pool.get_session(
+                session_data['key'],
+                session_data['fingerprint'],
+                pool_size=session_data['pool_size'])
+        return None
 
     @api.model
     def get_endpoint(self, base_url, uri_expression, args=None):
@@ -144,17 +643,62 @@ class RestClientController(models.AbstractModel):
         """
         return True
 
+    @api.model
+    def _is_response_streamed(self):
+        return self._response_type in STREAM_RESPONSE_TYPES
+
+    @api.model
+    def _iter_response_items(self, response):
+        try:
+            if self._response_type == RESPONSE_NDJSON_STREAM:
+                lines = response.iter_lines(
+                    chunk_size=self._stream_chunk_size,
+                    decode_unicode=not self._is_utf8_response(response))
+                yield from iter_ndjson(
+                    lines, loads=self._get_json_serializer().loads)
+            else:
+                chunks = response.iter_content(
+                    chunk_size=self._stream_chunk_size)
+                encoding = response.encoding or 'utf-8'
+                yield from iter_json_items(
+                    iter_decoded(chunks, encoding=encoding))
+        finally:
+            # Release connection back to pool.
+            response.close()
+
     @api.model
     def _extract_response_body(self, response):
+        """Return response body as specified by `_response_type`.
+
+        For streamed response types, generator of parsed items is
+        returned, so body is never fully loaded into memory.
+        """
         # TODO: implement body types: content, body, raw, exc.
         if self._response_type == 'json':
-            return response.json()
+            # Cached responses keep parsed body, so it is parsed once.
+            body = getattr(response, '_rest_client_body', None)
+            if body is None:
+                body = self._get_json_serializer().loads(
+                    self._get_json_document(response),
+                    type_=self._response_struct)
+                if self._http_cache_policy is not None:
+                    response._rest_client_body = body
+            return body
+        if self._is_response_streamed():
+            return self._iter_response_items(response)
         return response.text
 
     @api.model
     def _check_response(self, response, method_name, endpoint):
         if response.status_code != CODE_OK:
-            body = self._extract_response_body(response)
+            if (
+                self._is_response_streamed() or
+                    self._response_struct is not None):
+                # Error body is not expected to be stream of items or
+                # to match response struct.
+                body = response.text
+            else:
+                body = self._extract_response_body(response)
             _logger.error(
                 "Endpoint '%s' call failed. Method: %s Error Code: %s, "
                 "Response: %s", endpoint, method_name, response.status_code,
@@ -162,6 +706,80 @@ class RestClientController(models.AbstractModel):
             return False
         return True
 
+    @api.model
+    def _is_utf8_response(self, response):
+        encoding = response.encoding
+        return bool(encoding) and codecs.lookup(encoding).name == 'utf-8'
+
+    @api.model
+    def _get_json_document(self, response):
+        """Return response body to pass to JSON serializer.
+
+        UTF-8 content is passed as bytes (without BOM), so serializer
+        can decode it directly. Other encodings are decoded same as
+        requests `Response.json` does it.
+        """
+        content = response.content
+        if self._is_utf8_response(response):
+            if content.startswith(codecs.BOM_UTF8):
+                return content[len(codecs.BOM_UTF8):]
+            return content
+        if not response.encoding and content:
+            encoding = guess_json_utf(content)
+            if encoding:
+                return content.decode(encoding)
+        return response.text
+
+    @api.model
+    def _get_json_serializer(self):
+        return get_serializer(self._json_serializer)
+
+    @api.model
+    def _serialize_request(self, kwargs, compression_data=None):
+        """Return kwargs with json body serialized by JSON backend.
+
+        With standard library backend, json body is left to be
+        serialized by requests, unless body must be compressed.
+        """
+        if kwargs.get('json') is None or kwargs.get('data') is not None:
+            return kwargs
+        serializer = self._get_json_serializer()
+        if serializer.name == DEFAULT_BACKEND and not compression_data:
+            return kwargs
+        kwargs = dict(kwargs)
+        data = serializer.dumps(kwargs.pop('json'))
+        headers = CaseInsensitiveDict(kwargs.get('headers') or {})
+        headers.setdefault('Content-Type', 'application/json')
+        kwargs.update(data=data, headers=dict(headers))
+        return kwargs
+
+    @api.model
+    def _compress_request(self, kwargs, compression_data):
+        """Return kwargs with compressed body and Accept-Encoding.
+
+        Body is compressed only if it is bytes/str (JSON body is already
+        serialized) and is not smaller than threshold. Responses are
+        decoded incrementally by urllib3, so streamed response types
+        stay streamed.
+        """
+        if not compression_data:
+            return kwargs
+        headers = CaseInsensitiveDict(kwargs.get('headers') or {})
+        headers.setdefault('Accept-Encoding', compression.ACCEPT_ENCODING)
+        kwargs = dict(kwargs, headers=headers)
+        body = kwargs.get('data')
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if (
+            isinstance(body, bytes) and
+            len(body) >= compression_data['min_size'] and
+                'Content-Encoding' not in headers):
+            encoding = compression_data['encoding']
+            kwargs['data'] = compression.compress(body, encoding)
+            headers['Content-Encoding'] = encoding
+        kwargs['headers'] = dict(headers)
+        return kwargs
+
     def _validate_endpoint_with_uri_item(self, endpoint, uri_item):
         if not (bool(endpoint) ^ bool(uri_item)):
             raise ValidationError(
@@ -169,28 +787,19 @@ class RestClientController(models.AbstractModel):
                     " XOR condition."))
 
     @api.model
-    def call_rest_method(self, method_name, options=None):
-        """Call specified REST method.
+    def _prepare_rest_call(self, method_name, options=None, payload=False):
+        """Prepare call data to be sent by `_send_rest_call`.
 
         Args:
             method_name: HTTP verb to use (e.g GET).
-            options (dict): options for REST method calls:
-                endpoint (str): endpoint path to use in REST call
-                    (default: {None}).
-                uri_item (tuple): two pair tuple, where first item is
-                    uri_expression and second, optional tuple of
-                    endpoint arguments. endpoint and uri_item have
-                    exclusive OR condition (default: {None}).
-                company_id (int): company ID to use in finding related
-                    auth object if there is any (default: {None}).
-                kwargs (dict): extra keyword arguments for call, like
-                    payload, auth headers etc. (default: {None}).
+            options (dict): options as described in `call_rest_method`
+                (default: {None}).
+            payload (dict): auth payload to use instead of resolving it
+                by company. False means, it must be resolved
+                (default: {False}).
 
         Returns:
-            response obj
-
-        Raises:
-            ValidationError
+            dict
 
         """
         def get_endpoint_from_uri_item(uri_item, auth_data):
@@ -212,17 +821,440 @@ class RestClientController(models.AbstractModel):
             options = {}
         endpoint, uri_item = options.get('endpoint'), options.get('uri_item')
         self._validate_endpoint_with_uri_item(endpoint, uri_item)
-        company_id = options.get('company_id', False)
-        auth_data = self._get_auth_data(company_id)
+        if payload is False:
+            payload = self._get_auth_payload(options.get('company_id', False))
+        auth_data = payload and payload['data']
         kwargs = options.get('kwargs', {})
         merge_kwargs(kwargs, auth_data)
+        compression_data = payload and payload['compression']
+        kwargs = self._compress_request(
+            self._serialize_request(kwargs, compression_data),
+            compression_data)
+        if self._is_response_streamed():
+            kwargs.setdefault('stream', True)
         if uri_item:
             endpoint = get_endpoint_from_uri_item(uri_item, auth_data)
-        method = getattr(requests, method_name)
+        return {
+            'method_name': method_name,
+            'endpoint': endpoint,
+            'kwargs': kwargs,
+            'session_data': payload and payload['session'],
+            'rate_limit_data': payload and payload['rate_limit'],
+            # Used to group metrics.
+            'endpoint_template': (
+                uri_item[0] if uri_item else endpoint.split('?', 1)[0]),
+        }
+
+    @api.model
+    def _send_rest_request(self, call, kwargs):
+        # Sends request, respecting rate limit and retrying it as
+        # specified by policy.
+        def can_retry(attempt):
+            return (
+                attempt < policy['retries'] and
+                method_name.lower() in policy['retry_methods']
+            )
+
+        policy = self._get_rest_policy()
+        method_name, endpoint = call['method_name'], call['endpoint']
+        rate_limit_data = call.get('rate_limit_data')
+        if policy['timeout'] and 'timeout' not in kwargs:
+            kwargs = dict(kwargs, timeout=policy['timeout'])
+        session = self._get_session(call['session_data'])
+        method = getattr(session or requests, method_name)
+        breaker_key = self._get_breaker_key(endpoint)
+        attempt = 0
+        while True:
+            if not circuit_breakers.allow(breaker_key, policy):
+                raise CircuitOpenError(
+                    _("Circuit is open for '%s', call was rejected.") %
+                    breaker_key[1])
+            response = None
+            # Allowed call must always be recorded, otherwise half open
+            # circuit would never let other calls through.
+            recorded = False
+            try:
+                wait = self._reserve_rate_limit(rate_limit_data)
+                if wait:
+                    time.sleep(wait)
+                call['attempts'] = attempt + 1
+                try:
+                    response = method(endpoint, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    circuit_breakers.record_failure(breaker_key, policy)
+                    recorded = True
+                    if not can_retry(attempt):
+                        raise
+                else:
+                    self._handle_rate_limit_response(
+                        rate_limit_data, response)
+                    if response.status_code in policy['retry_status_codes']:
+                        circuit_breakers.record_failure(breaker_key, policy)
+                        recorded = True
+                        if not can_retry(attempt):
+                            break
+                        # Release (streamed) connection back to pool.
+                        response.close()
+                    else:
+                        circuit_breakers.record_success(breaker_key, policy)
+                        recorded = True
+                        break
+            finally:
+                if not recorded:
+                    circuit_breakers.record_failure(breaker_key, policy)
+            time.sleep(get_backoff(policy, attempt, response=response))
+            attempt += 1
+        return response
+
+    @api.model
+    def _send_rest_call(self, call):
+        # NOTE. This can be run in separate threads (batch calls), so it
+        # must not use database cursor.
+        method_name, endpoint = call['method_name'], call['endpoint']
+        kwargs = call['kwargs']
+        cache = self._get_http_cache(call)
+        entry = None
+        if cache:
+            cache_key = get_cache_key(call)
+            entry = cache.get(cache_key)
+            if entry:
+                if entry.is_fresh(cache.ttl):
+                    cache.count('hits')
+                    return entry.response
+                headers = dict(
+                    kwargs.get('headers') or {},
+                    **entry.get_conditional_headers())
+                kwargs = dict(kwargs, headers=headers)
+        start = time.perf_counter()
+        response = None
         try:
-            response = method(endpoint, **kwargs)
-            self._check_response(response, method_name, endpoint)
-            return response
+            response = self._send_rest_request(call, kwargs)
+        finally:
+            self._record_metrics(
+                call, response, (time.perf_counter() - start) * 1000)
+        if cache:
+            if entry and response.status_code == CODE_NOT_MODIFIED:
+                # Body was not transferred, cached one is still valid.
+                cache.count('hits')
+                cache.count('revalidations')
+                entry = cache.set(cache_key, entry.response)
+                return entry.response
+            cache.count('misses')
+            if response.status_code == CODE_OK:
+                cache.set(cache_key, response)
+        self._check_response(response, method_name, endpoint)
+        return response
+
+    @api.model
+    def call_rest_method(self, method_name, options=None):
+        """Call specified REST method.
+
+        If related auth object has Keep-Alive enabled, call is sent
+        through pooled session, reusing already opened connections.
+
+        Call is retried and circuit breaker is used as specified by
+        controller `_rest_policy`.
+
+        Args:
+            method_name: HTTP verb to use (e.g GET).
+            options (dict): options for REST method calls:
+                endpoint (str): endpoint path to use in REST call
+                    (default: {None}).
+                uri_item (tuple): two pair tuple, where first item is
+                    uri_expression and second, optional tuple of
+                    endpoint arguments. endpoint and uri_item have
+                    exclusive OR condition (default: {None}).
+                company_id (int): company ID to use in finding related
+                    auth object if there is any (default: {None}).
+                kwargs (dict): extra keyword arguments for call, like
+                    payload, auth headers etc. (default: {None}).
+
+        Returns:
+            response obj
+
+        Raises:
+            ValidationError
+            CircuitOpenError: if circuit is open for endpoint host.
+
+        """
+        call = self._prepare_rest_call(method_name, options=options)
+        try:
+            return self._send_rest_call(call)
+        except CircuitOpenError:
+            raise
         # We raise on unexpected exceptions.
         except Exception:
             raise ValidationError(get_formatted_exception())
+        finally:
+            self._flush_metrics_if_due()
+
+    @api.model
+    def iter_rest_items(
+        self,
+        method_name,
+        paginator,
+        options=None,
+            prefetch=False):
+        """Return lazy generator of items from paginated REST API.
+
+        Auth data is resolved once. Pages are requested only when
+        items of previous page were consumed, unless prefetch is used.
+
+        Args:
+            method_name: HTTP verb to use (e.g GET).
+            paginator (Paginator): pagination strategy from
+                `tools.pagination` (e.g. OffsetPaginator).
+            options (dict): first page options, same as in
+                `call_rest_method` (default: {None}).
+            prefetch (bool): whether to request next page in background
+                thread while items of current page are processed
+                (default: {False}).
+
+        Yields:
+            items extracted from response bodies.
+
+        Raises:
+            ValidationError: if any page call fails.
+
+        """
+        def prepare_call(page_options):
+            return self._prepare_rest_call(
+                method_name, options=page_options, payload=payload)
+
+        def send_call(call):
+            try:
+                response = self._send_rest_call(call)
+            except CircuitOpenError:
+                raise
+            except Exception:
+                raise ValidationError(get_formatted_exception())
+            if response.status_code != CODE_OK:
+                raise ValidationError(
+                    _("Endpoint '%s' page call failed with code %s.") %
+                    (call['endpoint'], response.status_code))
+            return response
+
+        if self._is_response_streamed():
+            raise ValidationError(
+                _("Programming error: pagination is not supported for "
+                    "streamed response types."))
+        options = options or {}
+        payload = self._get_auth_payload(options.get('company_id', False))
+        page_options = paginator.first_options(options)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            response = send_call(prepare_call(page_options))
+            while response is not None:
+                body = self._extract_response_body(response)
+                items = paginator.get_items(body)
+                page_options = paginator.next_options(
+                    page_options, response, body, items)
+                future = next_call = None
+                if page_options is not None:
+                    next_call = prepare_call(page_options)
+                    if executor:
+                        future = executor.submit(send_call, next_call)
+                yield from items
+                if future:
+                    response = future.result()
+                elif next_call:
+                    response = send_call(next_call)
+                else:
+                    response = None
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+            self._flush_metrics_if_due()
+
+    @api.model
+    def call_rest_methods_batch(
+            self, calls, max_workers=DEFAULT_BATCH_MAX_WORKERS):
+        """Call multiple REST methods concurrently.
+
+        Calls are prepared in current thread (auth data is resolved
+        once per company) and then sent using bounded thread pool or
+        asyncio event loop if controller `_transport` is 'async'.
+        Failing call does not abort others, its error is returned
+        instead.
+
+        Args:
+            calls (list): list of (method_name, options) tuples. Items
+                are the same as `call_rest_method` arguments.
+            max_workers (int): maximum number of concurrent calls. With
+                async transport, it is event loop semaphore bound
+                (default: {DEFAULT_BATCH_MAX_WORKERS}).
+
+        Returns:
+            list of dicts in same order as calls. Each dict has keys:
+                response: response obj or None if call failed.
+                error (str): formatted exception or False if call
+                    succeeded.
+                exception (Exception): raised exception or None if
+                    call succeeded.
+
+        """
+        def get_payload(company_id):
+            if company_id not in payloads:
+                payloads[company_id] = self._get_auth_payload(company_id)
+            return payloads[company_id]
+
+        def prepare_call(method_name, options):
+            options = options or {}
+            payload = get_payload(options.get('company_id', False))
+            return self._prepare_rest_call(
+                method_name, options=options, payload=payload)
+
+        def get_error_result(exception):
+            # Must be called while handling exception.
+            return {
+                'response': None,
+                'error': get_formatted_exception(),
+                'exception': exception,
+            }
+
+        def send_call(item):
+            call, error_result = item
+            if error_result:
+                return error_result
+            try:
+                response = self._send_rest_call(call)
+            except Exception as e:
+                return get_error_result(e)
+            return {'response': response, 'error': False, 'exception': None}
+
+        payloads = {}
+        prepared = []
+        for method_name, options in calls:
+            try:
+                prepared.append((prepare_call(method_name, options), None))
+            except Exception as e:
+                prepared.append((None, get_error_result(e)))
+        if self._transport == TRANSPORT_ASYNC:
+            results = self._send_rest_calls_async(prepared, max_workers)
+        elif max_workers <= 1 or len(prepared) <= 1:
+            results = [send_call(item) for item in prepared]
+        else:
+            workers = min(max_workers, len(prepared))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(send_call, prepared))
+        self._flush_metrics_if_due()
+        return results
+
+    @api.model
+    def enqueue_rest_call(self, method_name, options=None, **kwargs):
+        """Add REST call to outbox, to be sent in background.
+
+        Call is sent by outbox dispatcher (cron) after current
+        transaction is committed, so remote latency does not block
+        current request. Options must be JSON serializable.
+
+        Args:
+            method_name: HTTP verb to use (e.g POST).
+            options (dict): options, same as in `call_rest_method`
+                (default: {None}).
+            kwargs: extra arguments for outbox enqueue, like priority
+                or max_attempts.
+
+        Returns:
+            rest.client.outbox
+
+        """
+        return self.env['rest.client.outbox'].enqueue(
+            self._name, method_name, options=options, **kwargs)
+
+    @api.model
+    def _is_transport_error(self, exception):
+        """Return True if exception means call did not reach server.
+
+        Such calls can be retried later. Other errors (e.g. invalid
+        auth data or options) would fail the same way again.
+        """
+        return isinstance(
+            exception,
+            (requests.ConnectionError, requests.Timeout, CircuitOpenError)
+        ) or async_transport.is_transport_error(exception)
+
+    @api.model
+    def _handle_outbox_result(self, message, result):
+        """Handle result of sent outbox message.
+
+        Override to process response (e.g. save remote IDs). Message
+        status is already updated.
+
+        Args:
+            message (rest.client.outbox): sent message.
+            result (dict): response and error, as returned by
+                `call_rest_methods_batch`.
+
+        """
+        pass
+
+    @api.model
+    def _check_async_transport(self):
+        if not async_transport.is_available():
+            raise ValidationError(
+                _("Python package 'aiohttp' is required to use async "
+                    "transport."))
+        policy = self._get_rest_policy()
+        if (
+            policy['retries'] or
+            policy['breaker_threshold'] or
+                self._http_cache_policy is not None):
+            raise ValidationError(
+                _("Async transport can't be used with retries, circuit "
+                    "breaker or responses cache (controller '%s').") %
+                self._name)
+
+    @api.model
+    def _send_rest_calls_async(self, prepared, concurrency):
+        def check_response(call, response):
+            self._record_metrics(
+                call, response, response.elapsed.total_seconds() * 1000)
+            self._handle_rate_limit_response(
+                call['rate_limit_data'], response)
+            self._check_response(
+                response, call['method_name'], call['endpoint'])
+            return response
+
+        def reserve_rate_limit(call):
+            return self._reserve_rate_limit(call['rate_limit_data'])
+
+        def record_error(call, error, elapsed):
+            self._record_metrics(call, None, elapsed * 1000)
+
+        def format_exception(e):
+            return ''.join(
+                traceback.format_exception(type(e), e, e.__traceback__))
+
+        self._check_async_transport()
+        timeout = self._get_rest_policy()['timeout']
+        to_send = []
+        for call, error_result in prepared:
+            if error_result:
+                continue
+            if timeout and 'timeout' not in call['kwargs']:
+                call['kwargs'] = dict(call['kwargs'], timeout=timeout)
+            to_send.append(call)
+        responses = iter(async_transport.send_calls(
+            to_send,
+            max(concurrency, 1),
+            check_response,
+            before_send=reserve_rate_limit,
+            on_error=record_error,
+        ))
+        results = []
+        for __, error_result in prepared:
+            if error_result:
+                results.append(error_result)
+                continue
+            response = next(responses)
+            if isinstance(response, Exception):
+                results.append({
+                    'response': None,
+                    'error': format_exception(response),
+                    'exception': response,
+                })
+            else:
+                results.append(
+                    {'response': response, 'error': False, 'exception': None})
+        return results
@@ -0,0 +1,173 @@
+import json
+import logging
+
+from odoo import models, fields, api, SUPERUSER_ID
+
+from .. tools.metrics import (
+    COUNTERS,
+    PERCENTILES,
+    metrics,
+    new_stats,
+    merge_stats,
+    get_percentile,
+    to_prometheus,
+)
+
+_logger = logging.getLogger(__name__)
+
+KEY_FIELDS = ('controller', 'endpoint', 'method')
+
+
+class RestClientMetric(models.Model):
+    """REST calls metrics, aggregated from all workers."""
+
+    _name = 'rest.client.metric'
+    _description = "REST Client Metric"
+    _order = 'controller, endpoint, method'
+
+    controller = fields.Char(required=True, readonly=True, index=True)
+    endpoint = fields.Char(
+        "Endpoint Template",
+        required=True,
+        readonly=True,
+        help="URI expression or endpoint (without query) that was called.")
+    method = fields.Char(required=True, readonly=True)
+    count = fields.Integer("Calls", readonly=True)
+    error_count = fields.Integer("Errors", readonly=True)
+    retry_count = fields.Integer("Retries", readonly=True)
+    bytes_in = fields.Float("Bytes In", readonly=True)
+    bytes_out = fields.Float("Bytes Out", readonly=True)
+    latency_sum = fields.Float("Total Latency (ms)", readonly=True)
+    latency_max = fields.Float("Max Latency (ms)", readonly=True)
+    latency_avg = fields.Float(
+        "Avg Latency (ms)", compute='_compute_latency_avg')
+    latency_p50 = fields.Float("p50 Latency (ms)", readonly=True)
+    latency_p95 = fields.Float("p95 Latency (ms)", readonly=True)
+    latency_p99 = fields.Float("p99 Latency (ms)", readonly=True)
+    histogram = fields.Text(
+        readonly=True, help="Latency histogram bucket counts (JSON).")
+
+    _sql_constraints = [
+        (
+            'key_uniq',
+            'unique(controller, endpoint, method)',
+            "Metric must be unique per controller, endpoint and method."
+        ),
+    ]
+
+    @api.depends('count', 'latency_sum')
+    def _compute_latency_avg(self):
+        for rec in self:
+            rec.latency_avg = rec.count and rec.latency_sum / rec.count
+
+    def _get_stats(self):
+        self.ensure_one()
+        stats = new_stats()
+        for key in COUNTERS + ('latency_sum', 'latency_max'):
+            stats[key] = self[key]
+        if self.histogram:
+            stats['histogram'] = json.loads(self.histogram)
+        return stats
+
+    @api.model
+    def _prepare_stats_vals(self, stats):
+        vals = {
+            key: stats[key] for key in COUNTERS + (
+                'latency_sum', 'latency_max')
+        }
+        for percentile in PERCENTILES:
+            vals['latency_p%s' % percentile] = get_percentile(
+                stats, percentile)
+        vals['histogram'] = json.dumps(stats['histogram'])
+        return vals
+
+    def _lock_metric(self, key):
+        # Empty row is inserted if missing. Worker inserting same row
+        # concurrently does not fail, but waits for it.
+        self.env.cr.execute("""
+            INSERT INTO rest_client_metric (
+                controller, endpoint, method, count, error_count,
+                retry_count, bytes_in, bytes_out, latency_sum, latency_max,
+                create_uid, create_date, write_uid, write_date
+            )
+            VALUES (
+                %s, %s, %s, 0, 0, 0, 0, 0, 0, 0,
+                %s, now() at time zone 'UTC', %s, now() at time zone 'UTC'
+            )
+            ON CONFLICT (controller, endpoint, method) DO NOTHING
+        """, tuple(key) + (self.env.uid, self.env.uid))
+        self.env.cr.execute("""
+            SELECT id FROM rest_client_metric
+            WHERE controller = %s AND endpoint = %s AND method = %s
+            FOR UPDATE
+        """, key)
+        return self.browse(self.env.cr.fetchone()[0])
+
+    @api.model
+    def merge_snapshot(self, snapshot):
+        """Add metrics snapshot to stored metrics.
+
+        Args:
+            snapshot (dict): stats per (controller, endpoint, method)
+                key, as returned by worker metrics snapshot.
+
+        Returns:
+            None
+
+        """
+        for key, stats in snapshot.items():
+            # Lock row, so other workers would wait for their turn.
+            rec = self._lock_metric(key)
+            stats = merge_stats(rec._get_stats(), stats)
+            rec.write(self._prepare_stats_vals(stats))
+
+    @api.model
+    def flush_worker_metrics(self):
+        """Move metrics collected by current worker into database.
+
+        Separate cursor is used, so metrics would be saved even if
+        current transaction is rolled back. If saving fails, metrics
+        are kept in worker to be saved next time.
+        """
+        snapshot = metrics.snapshot(reset=True)
+        if not snapshot:
+            return
+        try:
+            with self.env.registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                env[self._name].merge_snapshot(snapshot)
+        except Exception:
+            metrics.restore(snapshot)
+            _logger.warning("Could not save REST client metrics.",
+                            exc_info=True)
+
+    @api.model
+    def _get_exporters(self):
+        """Return metrics exporters by name.
+
+        Extend to add custom exporters. Exporter is called with metric
+        records and must return exported data.
+        """
+        return {'prometheus': self._export_prometheus}
+
+    def _export_prometheus(self, records):
+        rows = []
+        for rec in records:
+            row = rec._get_stats()
+            row.update({key: rec[key] for key in KEY_FIELDS})
+            rows.append(row)
+        return to_prometheus(rows)
+
+    @api.model
+    def export_metrics(self, exporter='prometheus', domain=None):
+        """Export stored metrics using specified exporter.
+
+        Args:
+            exporter (str): exporter name (default: {'prometheus'}).
+            domain (list): domain to filter metrics (default: {None}).
+
+        Returns:
+            exported data (str for prometheus).
+
+        """
+        return self._get_exporters()[exporter](self.search(domain or []))
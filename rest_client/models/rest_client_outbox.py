@@ -0,0 +1,243 @@
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from footil.formatting import get_formatted_exception
+
+from odoo import models, fields, api, _
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_ATTEMPTS = 5
+# Seconds to wait before first retry. Doubled on each next retry.
+RETRY_DELAY = 60
+RETRY_DELAY_MAX = 3600
+# Days to keep sent messages.
+DONE_MESSAGES_KEEP_DAYS = 30
+
+_logger = logging.getLogger(__name__)
+
+
+class RestClientOutbox(models.Model):
+    """REST calls enqueued to be sent in background."""
+
+    _name = 'rest.client.outbox'
+    _description = "REST Client Outbox"
+    _order = 'priority, id'
+
+    controller = fields.Char(required=True, readonly=True, index=True)
+    method_name = fields.Char("Method", required=True, readonly=True)
+    options = fields.Text(
+        readonly=True,
+        help="Call options (JSON), as passed to call_rest_method.")
+    company_id = fields.Many2one('res.company', readonly=True)
+    priority = fields.Integer(
+        default=10, readonly=True, help="Lower priority is sent first.")
+    state = fields.Selection(
+        [
+            ('pending', 'Pending'),
+            ('done', 'Sent'),
+            ('failed', 'Failed'),
+            ('cancelled', 'Cancelled'),
+        ],
+        default='pending',
+        required=True,
+        readonly=True,
+        index=True)
+    attempts = fields.Integer(readonly=True)
+    max_attempts = fields.Integer(
+        default=DEFAULT_MAX_ATTEMPTS, required=True, readonly=True)
+    next_attempt_at = fields.Datetime(
+        "Next Attempt", readonly=True, index=True)
+    date_sent = fields.Datetime("Last Attempt", readonly=True)
+    response_status = fields.Integer("Response Code", readonly=True)
+    response_body = fields.Text(readonly=True)
+    error = fields.Text(readonly=True)
+
+    @api.model
+    def _trigger_dispatcher(self):
+        cron = self.env.ref(
+            'rest_client.ir_cron_rest_client_outbox',
+            raise_if_not_found=False)
+        if cron:
+            # Cron is run only after current transaction is committed.
+            cron.sudo()._trigger()
+
+    @api.model
+    def enqueue(
+        self,
+        controller,
+        method_name,
+        options=None,
+        priority=10,
+            max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Add REST call to outbox.
+
+        Message is created in current transaction, so it is sent only
+        if transaction is committed.
+
+        Args:
+            controller (str): controller model name.
+            method_name (str): HTTP verb to use (e.g POST).
+            options (dict): JSON serializable options, same as in
+                `call_rest_method` (default: {None}).
+            priority (int): lower priority is sent first
+                (default: {10}).
+            max_attempts (int): how many times to try sending message
+                (default: {DEFAULT_MAX_ATTEMPTS}).
+
+        Returns:
+            rest.client.outbox
+
+        """
+        options = dict(options or {})
+        message = self.sudo().create({
+            'controller': controller,
+            'method_name': method_name,
+            'company_id': options.pop('company_id', False),
+            'options': json.dumps(options),
+            'priority': priority,
+            'max_attempts': max_attempts,
+        })
+        self._trigger_dispatcher()
+        return message
+
+    def _get_call_options(self):
+        self.ensure_one()
+        options = json.loads(self.options or '{}')
+        uri_item = options.get('uri_item')
+        if uri_item:
+            # JSON converts tuples to lists.
+            uri_expression, args = uri_item
+            options['uri_item'] = (uri_expression, args and tuple(args))
+        options['company_id'] = self.company_id.id
+        return options
+
+    @api.model
+    def _get_retry_delay(self, attempts):
+        return min(RETRY_DELAY * 2 ** (attempts - 1), RETRY_DELAY_MAX)
+
+    def _handle_result(self, result, retry_status_codes):
+        self.ensure_one()
+        response = result['response']
+        now = fields.Datetime.now()
+        vals = {'attempts': self.attempts + 1, 'date_sent': now}
+        if response is not None:
+            vals.update({
+                'response_status': response.status_code,
+                'response_body': response.text,
+                'error': False,
+            })
+            if response.ok:
+                vals['state'] = 'done'
+                self.write(vals)
+                return
+            can_retry = response.status_code in retry_status_codes
+        else:
+            vals['error'] = result['error']
+            can_retry = self.env[self.controller]._is_transport_error(
+                result.get('exception'))
+        if can_retry and vals['attempts'] < self.max_attempts:
+            vals['next_attempt_at'] = now + timedelta(
+                seconds=self._get_retry_delay(vals['attempts']))
+        else:
+            vals['state'] = 'failed'
+        self.write(vals)
+
+    def _dispatch(self):
+        for controller in set(self.mapped('controller')):
+            messages = self.filtered(lambda r: r.controller == controller)
+            if controller not in self.env:
+                messages.write({
+                    'state': 'failed',
+                    'error': _("Controller '%s' does not exist.") % controller,
+                })
+                continue
+            Controller = self.env[controller]
+            results = Controller.call_rest_methods_batch(
+                [(m.method_name, m._get_call_options()) for m in messages],
+                max_workers=Controller._outbox_max_workers,
+            )
+            retry_status_codes = Controller._get_rest_policy()[
+                'retry_status_codes']
+            for message, result in zip(messages, results):
+                try:
+                    # Failing result handling must not discard results
+                    # of other messages in batch.
+                    with self.env.cr.savepoint():
+                        message._handle_result(result, retry_status_codes)
+                        Controller._handle_outbox_result(message, result)
+                except Exception:
+                    _logger.exception(
+                        "Failed to handle result of outbox message %s.",
+                        message.id)
+                    message.write({
+                        'state': 'failed',
+                        'attempts': message.attempts + 1,
+                        'date_sent': fields.Datetime.now(),
+                        'error': get_formatted_exception(),
+                    })
+
+    @api.model
+    def _lock_pending_messages(self, limit):
+        self.flush(['state', 'next_attempt_at', 'priority'])
+        # Skipping locked rows lets multiple dispatchers run at once.
+        self.env.cr.execute("""
+            SELECT id FROM rest_client_outbox
+            WHERE state = 'pending'
+                AND (next_attempt_at IS NULL OR next_attempt_at <= %s)
+            ORDER BY priority, id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """, (fields.Datetime.now(), limit))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def process_outbox(self, limit=DEFAULT_BATCH_SIZE, auto_commit=False):
+        """Send pending messages that are due.
+
+        Messages are sent in batches, concurrently per controller.
+
+        Args:
+            limit (int): batch size (default: {DEFAULT_BATCH_SIZE}).
+            auto_commit (bool): whether to commit after each batch and
+                continue with next one, until there are no due messages.
+                Otherwise only one batch is sent (default: {False}).
+
+        Returns:
+            None
+
+        """
+        while True:
+            messages = self._lock_pending_messages(limit)
+            if not messages:
+                break
+            messages._dispatch()
+            if not auto_commit:
+                break
+            self.env.cr.commit()
+
+    @api.model
+    def _cron_process_outbox(self, limit=DEFAULT_BATCH_SIZE):
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        self.process_outbox(limit=limit, auto_commit=auto_commit)
+
+    @api.autovacuum
+    def _gc_done_messages(self):
+        date = fields.Datetime.now() - timedelta(days=DONE_MESSAGES_KEEP_DAYS)
+        self.search(
+            [('state', '=', 'done'), ('date_sent', '<', date)]).unlink()
+
+    def action_retry(self):
+        """Send failed or cancelled messages again."""
+        self.write({
+            'state': 'pending',
+            'attempts': 0,
+            'next_attempt_at': False,
+        })
+        self._trigger_dispatcher()
+
+    def action_cancel(self):
+        """Cancel pending messages."""
+        self.filtered(lambda r: r.state == 'pending').write(
+            {'state': 'cancelled'})
@@ -0,0 +1,22 @@
+from odoo import models, fields
+
+
+class RestClientRateBucket(models.Model):
+    """Token bucket shared between workers to limit REST calls rate.
+
+    Rows are managed with plain SQL (see tools.rate_limit), model is
+    used to create and maintain table.
+    """
+
+    _name = 'rest.client.rate.bucket'
+    _description = "REST Client Rate Limit Bucket"
+    _log_access = False
+
+    key = fields.Char(required=True, readonly=True)
+    tokens = fields.Float(readonly=True)
+    updated_at = fields.Float(readonly=True)
+    blocked_until = fields.Float(readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', "Rate limit bucket key must be unique."),
+    ]
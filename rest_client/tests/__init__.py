@@ -1,2 +1,12 @@
-from . import test_rest_client_controller
-__all__ = [test_rest_client_controller]
+from . import (
+    test_rest_client_controller,
+    test_rest_client_streaming,
+    test_rest_client_serializers,
+    test_rest_client_stub_server,
+)
+__all__ = [
+    test_rest_client_controller,
+    test_rest_client_streaming,
+    test_rest_client_serializers,
+    test_rest_client_stub_server,
+]
@@ -0,0 +1,78 @@
+"""Load harness to measure REST clients throughput and latency."""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def get_percentile(values, percentile):
+    """Return percentile of sorted values (nearest rank)."""
+    if not values:
+        return 0.0
+    rank = max(int(round(percentile / 100.0 * len(values))), 1)
+    return values[rank - 1]
+
+
+def run_load(send, count, concurrency=1, is_error=None):
+    """Call send count times from concurrency threads.
+
+    Args:
+        send (callable): called with call index. Raised exception is
+            counted as error.
+        count (int): total number of calls.
+        concurrency (int): number of threads calling send at once
+            (default: {1}).
+        is_error (callable): called with send result to check whether
+            it is error, e.g. by response code (default: {None}).
+
+    Returns:
+        dict: count, concurrency, errors, elapsed (seconds), rps,
+            latency percentiles (e.g. p95), min, max and mean in
+            milliseconds.
+
+    """
+    def call(index):
+        start = time.perf_counter()
+        try:
+            res = send(index)
+            error = bool(is_error and is_error(res))
+        except Exception:
+            error = True
+        latency = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(latency)
+            if error:
+                errors.append(index)
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(count)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    report = {
+        'count': count,
+        'concurrency': concurrency,
+        'errors': len(errors),
+        'elapsed': elapsed,
+        'rps': count / elapsed if elapsed else 0.0,
+        'min': latencies[0] if latencies else 0.0,
+        'max': latencies[-1] if latencies else 0.0,
+        'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+    }
+    for percentile in PERCENTILES:
+        report['p%s' % percentile] = get_percentile(latencies, percentile)
+    return report
+
+
+def format_report(report):
+    """Return load report as one line text."""
+    percentiles = ', '.join(
+        'p%s: %.2f ms' % (p, report['p%s' % p]) for p in PERCENTILES)
+    return (
+        "calls: %(count)s, concurrency: %(concurrency)s, errors: "
+        "%(errors)s, %(rps).1f req/s, " % report + percentiles +
+        ", max: %.2f ms" % report['max']
+    )
@@ -0,0 +1,232 @@
+"""Local HTTP stub server to exercise REST clients over real sockets."""
+import json
+import time
+import base64
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+ERROR_RESPONSE = (503, JSON_HEADERS, {'error': 'Injected error'})
+# Headers that are not recorded, because they are set by stub server
+# or body is sent already decoded.
+SKIP_RECORD_HEADERS = (
+    'connection',
+    'content-encoding',
+    'content-length',
+    'date',
+    'keep-alive',
+    'server',
+    'transfer-encoding',
+)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Handler that responds using stub server routes."""
+
+    # HTTP/1.1 is needed for persistent (keep-alive) connections.
+    protocol_version = 'HTTP/1.1'
+    # Buffer writes and disable Nagle's algorithm, so headers and body
+    # would not be delayed on persistent connections.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        """Extend to count opened connections."""
+        super().setup()
+        self.server.stub.register_connection()
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _respond(self):
+        body = self._read_body()
+        status, headers, data = self.server.stub.get_response(
+            self.command, self.path, self.headers, body)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _respond
+
+    def log_message(self, format, *args):
+        """Override to not pollute tests output."""
+        pass
+
+
+class StubServer(object):
+    """HTTP server, running in background thread on localhost.
+
+    Routes map (method, path) to response tuple (status, headers,
+    body). body can be dict/list (dumped as JSON), str or bytes. If
+    route is not found, default response is used.
+
+    Latency (seconds, with optional random jitter) is added to each
+    response and random share of requests (error_rate) can be answered
+    with error_response instead. Use seed to make injection repeatable.
+
+    If upstream URL is set, requests without route are forwarded to it
+    and its responses are recorded. Recorded responses can be saved as
+    fixtures and replayed later using `load_fixtures`.
+
+    Can be used as context manager:
+
+        with StubServer() as server:
+            requests.get(server.url + '/abc')
+    """
+
+    def __init__(
+        self,
+        routes=None,
+        default=(200, JSON_HEADERS, {}),
+        latency=0,
+        jitter=0,
+        error_rate=0,
+        error_response=ERROR_RESPONSE,
+        seed=None,
+            upstream=None):
+        """Initialize stub server with routes and default response."""
+        self.routes = dict(routes or {})
+        self.default = default
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_response = error_response
+        self.upstream = upstream
+        self.recorded = {}
+        self.requests_count = 0
+        self.errors_count = 0
+        self.connections_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Return base URL of running server."""
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def register_connection(self):
+        """Increment opened connections counter."""
+        with self._lock:
+            self.connections_count += 1
+
+    def _prepare_response(self, response):
+        status, headers, body = response
+        headers = dict(headers)
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+            headers.setdefault('Content-Type', 'application/json')
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return status, headers, body
+
+    def _forward(self, method, path, headers, body):
+        # Send request to upstream and record its response.
+        headers = {
+            k: v for k, v in headers.items() if k.lower() != 'host'}
+        upstream_response = requests.request(
+            method, self.upstream + path, headers=headers, data=body or None)
+        response = (
+            upstream_response.status_code,
+            {
+                k: v for k, v in upstream_response.headers.items()
+                if k.lower() not in SKIP_RECORD_HEADERS
+            },
+            upstream_response.content,
+        )
+        with self._lock:
+            self.recorded[(method, path)] = response
+        return response
+
+    def _inject(self):
+        # Return True if error must be returned instead of response.
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            error = self._random.random() < self.error_rate
+            if error:
+                self.errors_count += 1
+        if delay:
+            time.sleep(delay)
+        return error
+
+    def get_response(self, method, path, headers, body):
+        """Return response tuple for request."""
+        with self._lock:
+            self.requests_count += 1
+        if self._inject():
+            return self._prepare_response(self.error_response)
+        response = self.routes.get((method, path))
+        if response is None:
+            if self.upstream:
+                response = self._forward(method, path, headers, body)
+            else:
+                response = self.default
+        if callable(response):
+            response = response(method, path, headers, body)
+        return self._prepare_response(response)
+
+    def save_fixtures(self, path):
+        """Save recorded responses into JSON fixtures file."""
+        fixtures = []
+        for (method, route_path), response in self.recorded.items():
+            status, headers, body = self._prepare_response(response)
+            fixture = {
+                'method': method,
+                'path': route_path,
+                'status': status,
+                'headers': headers,
+            }
+            try:
+                fixture['body'] = body.decode('utf-8')
+            except UnicodeDecodeError:
+                fixture['body_base64'] = base64.b64encode(body).decode()
+            fixtures.append(fixture)
+        with open(path, 'w') as f:
+            json.dump(fixtures, f, indent=2)
+
+    def load_fixtures(self, path):
+        """Add routes from JSON fixtures file to replay them."""
+        with open(path) as f:
+            fixtures = json.load(f)
+        for fixture in fixtures:
+            if 'body_base64' in fixture:
+                body = base64.b64decode(fixture['body_base64'])
+            else:
+                body = fixture['body']
+            self.routes[(fixture['method'], fixture['path'])] = (
+                fixture['status'], fixture['headers'], body)
+
+    def start(self):
+        """Start serving in background thread."""
+        self._server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), StubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        """Start server on entering context."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop server on leaving context."""
+        self.stop()
@@ -0,0 +1,104 @@
+import codecs
+import typing
+import dataclasses
+
+from requests.models import Response
+
+from ..tools.serializers import FAST_BACKEND, SERIALIZERS, get_serializer
+from . import common
+
+
+@dataclasses.dataclass
+class Item:
+    """Struct to decode into."""
+
+    id: int
+    name: str
+
+
+class TestRestClientSerializers(common.TestRestClientCommon):
+    """Class to test JSON serializers backends."""
+
+    def test_01_get_serializer(self):
+        """Get serializer by name, falling back to standard library."""
+        self.assertEqual(get_serializer('json').name, 'json')
+        self.assertEqual(get_serializer().name, 'json')
+        self.assertEqual(get_serializer('not_installed').name, 'json')
+        self.assertIn(get_serializer(FAST_BACKEND).name, SERIALIZERS)
+
+    def test_02_dumps_loads(self):
+        """Encode and decode same data with all available backends."""
+        data = {'id': 1, 'name': 'ąčę', 'tags': [1.5, None, True]}
+        for name, serializer in SERIALIZERS.items():
+            dumped = serializer.dumps(data)
+            self.assertIsInstance(dumped, bytes, name)
+            self.assertEqual(serializer.loads(dumped), data, name)
+            self.assertEqual(serializer.loads(dumped.decode()), data, name)
+            with self.assertRaises(ValueError):
+                serializer.loads(b'{"a": ')
+
+    def test_03_loads_typed(self):
+        """Decode JSON into structs."""
+        data = b'[{"id": 1, "name": "A"}, {"id": 2, "name": "B"}]'
+        for name, serializer in SERIALIZERS.items():
+            self.assertEqual(
+                serializer.loads(data, type_=typing.List[Item]),
+                [Item(1, 'A'), Item(2, 'B')],
+                name
+            )
+
+    def test_04_dumps_fallback(self):
+        """Encode data only standard library supports."""
+        # Integer keys and integers wider than 64 bits.
+        data = {1: 'a', 'big': 2 ** 70}
+        for name, serializer in SERIALIZERS.items():
+            self.assertEqual(
+                serializer.loads(serializer.dumps(data)),
+                {'1': 'a', 'big': 2 ** 70},
+                name
+            )
+
+    def _get_response(self, content, encoding):
+        response = Response()
+        response._content = content
+        response.encoding = encoding
+        return response
+
+    def test_05_get_json_document(self):
+        """Decode response body using its encoding."""
+        Controller = self.RestClientController
+        data = {'name': 'ąčę'}
+        # UTF-8 is passed as bytes, without BOM.
+        content = '{"name": "ąčę"}'.encode('utf-8')
+        for encoding in ('utf-8', 'UTF8'):
+            document = Controller._get_json_document(
+                self._get_response(codecs.BOM_UTF8 + content, encoding))
+            self.assertEqual(document, content)
+        # Charset from header.
+        response = self._get_response(
+            '{"name": "ąčę"}'.encode('iso-8859-13'), 'iso-8859-13')
+        self.assertEqual(
+            get_serializer().loads(Controller._get_json_document(response)),
+            data
+        )
+        # Encoding guessed from content.
+        response = self._get_response(
+            '{"name": "ąčę"}'.encode('utf-16'), None)
+        self.assertEqual(
+            get_serializer().loads(Controller._get_json_document(response)),
+            data
+        )
+
+    def test_06_serialize_request(self):
+        """Serialize json body only if it is not done by requests."""
+        Controller = self.RestClientController
+        kwargs = {'json': {'a': 1}}
+        # Standard library backend, body is serialized by requests.
+        self.assertIs(Controller._serialize_request(kwargs), kwargs)
+        # Body must be compressed, so it is serialized beforehand.
+        res = Controller._serialize_request(
+            kwargs, {'encoding': 'gzip', 'min_size': 0})
+        self.assertEqual(res['data'], b'{"a": 1}')
+        self.assertEqual(res['headers']['Content-Type'], 'application/json')
+        self.assertNotIn('json', res)
+        self.assertEqual(kwargs, {'json': {'a': 1}})
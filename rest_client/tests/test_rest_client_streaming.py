@@ -0,0 +1,44 @@
+import json
+
+from ..tools.streaming import iter_decoded, iter_json_items, iter_ndjson
+from . import common
+
+
+def _to_chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestRestClientStreaming(common.TestRestClientCommon):
+    """Class to test incremental response parsing."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up data to parse."""
+        super().setUpClass()
+        cls.items = [
+            {'id': 1, 'name': 'ąčę', 'tags': [1, 2]},
+            12345,
+            "x],[y",
+            None,
+            [],
+        ]
+
+    def test_01_iter_json_items(self):
+        """Parse JSON array split into chunks of various sizes."""
+        data = json.dumps(self.items).encode('utf-8')
+        for size in (1, 3, 16, len(data)):
+            items = list(iter_json_items(iter_decoded(_to_chunks(data, size))))
+            self.assertEqual(items, self.items)
+
+    def test_02_iter_json_items(self):
+        """Parse empty and invalid JSON arrays."""
+        self.assertEqual(list(iter_json_items([' [ ] '])), [])
+        with self.assertRaises(ValueError):
+            list(iter_json_items(['{"a": 1}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_items(['[1, 2']))
+
+    def test_03_iter_ndjson(self):
+        """Parse newline delimited JSON."""
+        lines = [json.dumps(item) for item in self.items] + ['']
+        self.assertEqual(list(iter_ndjson(lines)), self.items)
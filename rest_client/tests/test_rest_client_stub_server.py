@@ -0,0 +1,53 @@
+import os
+import time
+import tempfile
+
+import requests
+
+from .stub_server import StubServer
+from .load_harness import run_load
+from . import common
+
+
+class TestRestClientStubServer(common.TestRestClientCommon):
+    """Class to test stub server and load harness used in benchmarks."""
+
+    def test_01_record_replay(self):
+        """Record upstream responses and replay them from fixtures."""
+        routes = {
+            ('GET', '/items?page=1'): (200, {'ETag': '"1"'}, [{'id': 1}]),
+            ('GET', '/binary'): (200, {}, b'\xff\x00'),
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'fixtures.json')
+            with StubServer(routes=routes) as upstream:
+                with StubServer(upstream=upstream.url) as recorder:
+                    for route_path in ('/items?page=1', '/binary'):
+                        requests.get(recorder.url + route_path)
+                    recorder.save_fixtures(path)
+            replay = StubServer()
+            replay.load_fixtures(path)
+            with replay:
+                response = requests.get(replay.url + '/items?page=1')
+                self.assertEqual(response.json(), [{'id': 1}])
+                self.assertEqual(response.headers['ETag'], '"1"')
+                response = requests.get(replay.url + '/binary')
+                self.assertEqual(response.content, b'\xff\x00')
+
+    def test_02_inject_latency_errors(self):
+        """Inject latency and errors into stub server responses."""
+        with StubServer(latency=0.02, error_rate=0.5, seed=1) as server:
+            start = time.perf_counter()
+            report = run_load(
+                lambda i: requests.get(server.url),
+                20,
+                concurrency=4,
+                is_error=lambda r: r.status_code != 200,
+            )
+            self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual(report['count'], 20)
+        self.assertEqual(report['errors'], server.errors_count)
+        self.assertGreater(report['errors'], 0)
+        self.assertLess(report['errors'], 20)
+        self.assertGreaterEqual(report['p50'], 20)
+        self.assertGreaterEqual(report['p99'], report['p50'])
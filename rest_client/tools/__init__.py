@@ -0,0 +1,26 @@
+from . import (
+    session_pool,
+    async_transport,
+    policy,
+    streaming,
+    pagination,
+    http_cache,
+    rate_limit,
+    metrics,
+    compression,
+    serializers,
+    health,
+)
+__all__ = [
+    session_pool,
+    async_transport,
+    policy,
+    streaming,
+    pagination,
+    http_cache,
+    rate_limit,
+    metrics,
+    compression,
+    serializers,
+    health,
+]
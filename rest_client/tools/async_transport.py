@@ -0,0 +1,174 @@
+"""asyncio based transport to send many REST calls from one thread."""
+import json
+import time
+import asyncio
+import datetime
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+# requests keyword arguments that are passed to aiohttp as is.
+PASSTHROUGH_KWARGS = ('params', 'data', 'json', 'headers', 'cookies')
+# requests keyword arguments that have no meaning, when body is read
+# eagerly.
+IGNORED_KWARGS = ('stream',)
+
+
+class AsyncResponse(object):
+    """Response with requests.Response like interface.
+
+    Body is read eagerly, so response can be used after event loop is
+    closed.
+    """
+
+    def __init__(
+        self,
+        status_code,
+        headers,
+        content,
+        url,
+        encoding=None,
+            elapsed=None):
+        """Initialize response with already read data."""
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.encoding = encoding or 'utf-8'
+        self.elapsed = elapsed or datetime.timedelta()
+
+    @property
+    def ok(self):
+        """Return True if status code is not error."""
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        """Return decoded body."""
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self, **kwargs):
+        """Return JSON decoded body."""
+        return json.loads(self.text, **kwargs)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        """Iterate over already read body in chunks."""
+        data = self.text if decode_unicode else self.content
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+    def iter_lines(self, chunk_size=None, decode_unicode=False):
+        """Iterate over already read body lines."""
+        data = self.text if decode_unicode else self.content
+        yield from data.splitlines()
+
+    def close(self):
+        """Do nothing, body is already read."""
+        pass
+
+
+def is_available():
+    """Return True if asyncio transport can be used."""
+    return aiohttp is not None
+
+
+def is_transport_error(exception):
+    """Return True if exception is connection or timeout error."""
+    if isinstance(exception, asyncio.TimeoutError):
+        return True
+    return aiohttp is not None and isinstance(exception, aiohttp.ClientError)
+
+
+def _to_aiohttp_kwargs(kwargs):
+    """Convert requests keyword arguments to aiohttp ones."""
+    res = {k: v for k, v in kwargs.items() if k in PASSTHROUGH_KWARGS}
+    auth = kwargs.get('auth')
+    if auth:
+        res['auth'] = aiohttp.BasicAuth(*auth)
+    timeout = kwargs.get('timeout')
+    if timeout:
+        # requests can have (connect, read) timeout tuple.
+        if isinstance(timeout, tuple):
+            timeout = sum(timeout)
+        res['timeout'] = aiohttp.ClientTimeout(total=timeout)
+    if kwargs.get('verify') is False:
+        res['ssl'] = False
+    unsupported = set(kwargs) - set(PASSTHROUGH_KWARGS) - set(
+        IGNORED_KWARGS) - {'auth', 'timeout', 'verify'}
+    if unsupported:
+        raise TypeError(
+            "Unsupported arguments for async transport: %s" %
+            ', '.join(sorted(unsupported)))
+    return res
+
+
+async def _send_call(session, semaphore, call):
+    async with semaphore:
+        start = time.perf_counter()
+        async with session.request(
+            call['method_name'].upper(),
+            call['endpoint'],
+                **_to_aiohttp_kwargs(call['kwargs'])) as resp:
+            content = await resp.read()
+            return AsyncResponse(
+                resp.status,
+                resp.headers,
+                content,
+                str(resp.url),
+                encoding=resp.charset,
+                elapsed=datetime.timedelta(
+                    seconds=time.perf_counter() - start),
+            )
+
+
+async def _send_calls(
+        calls, concurrency, callback, before_send=None, on_error=None):
+    async def send(call):
+        if before_send:
+            wait = before_send(call)
+            if wait:
+                await asyncio.sleep(wait)
+        start = time.perf_counter()
+        try:
+            response = await _send_call(session, semaphore, call)
+        except Exception as e:
+            if on_error:
+                on_error(call, e, time.perf_counter() - start)
+            raise
+        return callback(call, response)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            *[send(call) for call in calls], return_exceptions=True)
+
+
+def send_calls(
+        calls, concurrency, callback, before_send=None, on_error=None):
+    """Send prepared calls concurrently using event loop.
+
+    Args:
+        calls (list): prepared calls (as prepared by REST controller).
+        concurrency (int): maximum number of calls in flight.
+        callback (callable): called with call and response, when call
+            is done. Its return value is used as result.
+        before_send (callable): called with call before sending it.
+            Can return seconds to wait (e.g. for rate limit)
+            (default: {None}).
+        on_error (callable): called with call, exception and elapsed
+            seconds, when call raises (default: {None}).
+
+    Returns:
+        list: callback results or exceptions, in same order as calls.
+
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(
+            _send_calls(
+                calls, concurrency, callback, before_send, on_error))
+    finally:
+        loop.close()
@@ -0,0 +1,49 @@
+"""Request body compression and compressed responses negotiation."""
+import gzip
+import zlib
+
+# Encodings urllib3 can decode incrementally, depending on installed
+# packages.
+from urllib3.util.request import ACCEPT_ENCODING  # noqa: F401
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_MIN_SIZE = 1024
+
+ENCODERS = {
+    'gzip': gzip.compress,
+    'deflate': zlib.compress,
+}
+if brotli:
+    ENCODERS['br'] = brotli.compress
+if zstandard:
+    ENCODERS['zstd'] = lambda data: zstandard.ZstdCompressor().compress(data)
+
+
+def is_available(encoding):
+    """Return True if body can be compressed using encoding."""
+    return encoding in ENCODERS
+
+
+def compress(data, encoding):
+    """Return data compressed using encoding.
+
+    Args:
+        data (bytes): data to compress.
+        encoding (str): one of ENCODERS keys (Content-Encoding value).
+
+    Returns:
+        bytes
+
+    """
+    return ENCODERS[encoding](data)
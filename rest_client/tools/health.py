@@ -0,0 +1,79 @@
+"""Remote host health probe and connections warmup."""
+import time
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 10
+CODE_SERVER_ERROR = 500
+
+
+def _elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def resolve_host(url):
+    """Resolve URL host and return time it took in milliseconds.
+
+    Raises:
+        socket.gaierror: if host can't be resolved.
+
+    """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    start = time.perf_counter()
+    socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    return _elapsed_ms(start)
+
+
+def probe(session, url, connections=1, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """Check remote host, opening connections in session pool.
+
+    Host is resolved, then `connections` HEAD requests are sent at once,
+    so session pool would open that many connections (including TLS
+    handshakes). Then one more request is sent through already opened
+    connection to measure round trip latency.
+
+    Any response below 500 code means remote is reachable.
+
+    Args:
+        session (requests.Session): session to open connections in.
+        url (str): URL to send HEAD requests to.
+        connections (int): number of connections to open
+            (default: {1}).
+        timeout (float): requests timeout (default: {DEFAULT_TIMEOUT}).
+        kwargs: extra keyword arguments for requests (e.g. auth).
+
+    Returns:
+        dict: ok (bool), dns_time, connect_time (slowest cold request)
+            and latency (warm request) in milliseconds, status_code
+            and error (str or None).
+
+    """
+    def send(__=None):
+        start = time.perf_counter()
+        response = session.head(url, timeout=timeout, **kwargs)
+        response.close()
+        return response.status_code, _elapsed_ms(start)
+
+    res = {
+        'ok': False,
+        'dns_time': 0.0,
+        'connect_time': 0.0,
+        'latency': 0.0,
+        'status_code': None,
+        'error': None,
+    }
+    try:
+        res['dns_time'] = resolve_host(url)
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            results = list(executor.map(send, range(connections)))
+        res['connect_time'] = max(elapsed for __, elapsed in results)
+        res['status_code'], res['latency'] = send()
+    except Exception as e:
+        res['error'] = '%s: %s' % (type(e).__name__, e)
+        return res
+    res['ok'] = res['status_code'] < CODE_SERVER_ERROR
+    if not res['ok']:
+        res['error'] = "Server responded with code %s." % res['status_code']
+    return res
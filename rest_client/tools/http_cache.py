@@ -0,0 +1,141 @@
+"""LRU cache for GET responses with conditional requests support."""
+import time
+import threading
+import collections
+
+from .session_pool import get_fingerprint
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_SIZE = 256
+CODE_NOT_MODIFIED = 304
+
+
+class CacheEntry(object):
+    """Cached response with its validators."""
+
+    __slots__ = ('response', 'stored_at', 'etag', 'last_modified')
+
+    def __init__(self, response):
+        """Initialize entry from response."""
+        self.response = response
+        self.stored_at = time.time()
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+
+    def is_fresh(self, ttl):
+        """Return True if entry can be used without revalidating it."""
+        return time.time() - self.stored_at < ttl
+
+    def get_conditional_headers(self):
+        """Return headers to revalidate entry on remote side."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache(object):
+    """Thread safe LRU cache of responses with hit/miss counters."""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE):
+        """Initialize empty cache."""
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = collections.Counter()
+
+    def get(self, key):
+        """Return entry for key (marking it as recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, response):
+        """Store response, evicting least recently used entries."""
+        entry = CacheEntry(response)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return entry
+
+    def count(self, name):
+        """Increment named counter."""
+        with self._lock:
+            self.stats[name] += 1
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.stats.clear()
+
+    def get_stats(self):
+        """Return counters and current cache size."""
+        with self._lock:
+            return dict(
+                self.stats,
+                hits=self.stats['hits'],
+                misses=self.stats['misses'],
+                size=len(self._entries),
+            )
+
+    def __len__(self):
+        """Return number of cached entries."""
+        return len(self._entries)
+
+
+def get_cache_key(call):
+    """Return cache key for prepared call.
+
+    Key consists of endpoint, query parameters and auth related data,
+    so responses would not be shared between different credentials.
+    """
+    kwargs = call['kwargs']
+    params = kwargs.get('params') or {}
+    if isinstance(params, dict):
+        params = sorted(params.items())
+    headers = sorted((kwargs.get('headers') or {}).items())
+    session_data = call.get('session_data') or {}
+    return get_fingerprint(
+        call['endpoint'],
+        params,
+        headers,
+        kwargs.get('auth'),
+        session_data.get('fingerprint'),
+    )
+
+
+class HttpCaches(object):
+    """HTTP caches per owner (usually controller)."""
+
+    def __init__(self):
+        """Initialize without any caches."""
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def get_cache(self, owner, ttl=None, max_size=None):
+        """Return cache for owner, creating it if needed.
+
+        If ttl or max_size is specified, cache is updated to use it.
+        """
+        with self._lock:
+            cache = self._caches.get(owner)
+            if cache is None:
+                cache = self._caches[owner] = HttpCache()
+            if ttl is not None:
+                cache.ttl = ttl
+            if max_size is not None:
+                cache.max_size = max_size
+            return cache
+
+
+# Caches are shared inside worker process.
+http_caches = HttpCaches()
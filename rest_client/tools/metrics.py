@@ -0,0 +1,182 @@
+"""In-memory metrics of REST calls, kept per worker."""
+import time
+import threading
+
+# Latency histogram buckets upper bounds in milliseconds. Last bucket
+# is for everything above.
+LATENCY_BUCKETS = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+PERCENTILES = (50, 95, 99)
+COUNTERS = ('count', 'error_count', 'retry_count', 'bytes_in', 'bytes_out')
+
+
+def new_stats():
+    """Return empty stats dict."""
+    stats = dict.fromkeys(COUNTERS, 0)
+    stats.update(
+        latency_sum=0.0,
+        latency_max=0.0,
+        histogram=[0] * len(LATENCY_BUCKETS),
+    )
+    return stats
+
+
+def merge_stats(target, source):
+    """Add source stats to target stats in place."""
+    for key in COUNTERS:
+        target[key] += source[key]
+    target['latency_sum'] += source['latency_sum']
+    target['latency_max'] = max(target['latency_max'], source['latency_max'])
+    target['histogram'] = [
+        a + b for a, b in zip(target['histogram'], source['histogram'])]
+    return target
+
+
+def get_percentile(stats, percentile):
+    """Estimate latency percentile (ms) from histogram.
+
+    Bucket upper bound is used as estimate (capped by max latency).
+    """
+    total = sum(stats['histogram'])
+    if not total:
+        return 0.0
+    threshold = total * percentile / 100.0
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS, stats['histogram']):
+        cumulative += count
+        if cumulative >= threshold:
+            return min(bound, stats['latency_max'])
+    return stats['latency_max']
+
+
+class Metrics(object):
+    """Thread safe REST calls metrics per key.
+
+    Key is usually (controller, endpoint template, method).
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.flushed_at = time.time()
+
+    def record(
+        self,
+        key,
+        latency,
+        error=False,
+        retries=0,
+        bytes_in=0,
+            bytes_out=0):
+        """Record one call.
+
+        Args:
+            key (tuple): metrics key.
+            latency (float): call duration in milliseconds.
+            error (bool): whether call failed (default: {False}).
+            retries (int): number of retried attempts (default: {0}).
+            bytes_in (int): response body size (default: {0}).
+            bytes_out (int): request body size (default: {0}).
+        """
+        bucket = next(
+            i for i, bound in enumerate(LATENCY_BUCKETS) if latency <= bound)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = new_stats()
+            stats['count'] += 1
+            stats['error_count'] += int(bool(error))
+            stats['retry_count'] += retries
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['latency_sum'] += latency
+            stats['latency_max'] = max(stats['latency_max'], latency)
+            stats['histogram'][bucket] += 1
+
+    def snapshot(self, reset=False):
+        """Return copy of stats per key.
+
+        Args:
+            reset (bool): whether to remove returned stats, so next
+                snapshot would only have new calls (default: {False}).
+        """
+        with self._lock:
+            res = {
+                key: dict(stats, histogram=list(stats['histogram']))
+                for key, stats in self._stats.items()
+            }
+            if reset:
+                self._stats.clear()
+                self.flushed_at = time.time()
+            return res
+
+    def restore(self, snapshot):
+        """Add back stats of snapshot, that could not be saved.
+
+        Calls recorded after snapshot was taken are kept.
+        """
+        with self._lock:
+            for key, stats in snapshot.items():
+                current = self._stats.get(key)
+                if current is None:
+                    self._stats[key] = dict(
+                        stats, histogram=list(stats['histogram']))
+                else:
+                    merge_stats(current, stats)
+
+    def is_flush_due(self, interval):
+        """Return True if interval seconds passed since last flush."""
+        return bool(self._stats) and time.time() - self.flushed_at >= interval
+
+
+def to_prometheus(rows, prefix='rest_client'):
+    """Return stats in Prometheus text exposition format.
+
+    Args:
+        rows (list): dicts with controller, endpoint, method keys and
+            stats keys.
+        prefix (str): metric names prefix (default: {'rest_client'}).
+
+    Returns:
+        str
+
+    """
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+    def labels(row, extra=None):
+        items = [
+            (k, row[k]) for k in ('controller', 'endpoint', 'method')
+        ] + (extra or [])
+        return ','.join('%s="%s"' % (k, escape(v)) for k, v in items)
+
+    lines = []
+    counters = (
+        ('requests_total', 'count'),
+        ('errors_total', 'error_count'),
+        ('retries_total', 'retry_count'),
+        ('received_bytes_total', 'bytes_in'),
+        ('sent_bytes_total', 'bytes_out'),
+    )
+    for name, key in counters:
+        lines.append('# TYPE %s_%s counter' % (prefix, name))
+        for row in rows:
+            lines.append(
+                '%s_%s{%s} %s' % (prefix, name, labels(row), row[key]))
+    name = '%s_latency_milliseconds' % prefix
+    lines.append('# TYPE %s histogram' % name)
+    for row in rows:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, row['histogram']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else bound
+            lines.append('%s_bucket{%s} %s' % (
+                name, labels(row, [('le', le)]), cumulative))
+        lines.append('%s_sum{%s} %s' % (name, labels(row), row['latency_sum']))
+        lines.append('%s_count{%s} %s' % (name, labels(row), row['count']))
+    return '\n'.join(lines) + '\n'
+
+
+# Metrics are collected inside worker process.
+metrics = Metrics()
@@ -0,0 +1,189 @@
+"""Pagination strategies to walk paginated REST APIs."""
+import copy
+
+
+def get_path_value(data, path, default=None):
+    """Return value from nested dicts using dotted path.
+
+    Empty path returns data itself.
+    """
+    if not path:
+        return data
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return default
+        data = data[key]
+    return data
+
+
+def _set_params(options, params):
+    kwargs = options.setdefault('kwargs', {})
+    kwargs['params'] = dict(kwargs.get('params') or {}, **params)
+
+
+def _set_endpoint(options, endpoint):
+    # Next link is absolute URL, with query parameters already
+    # included.
+    options.pop('uri_item', None)
+    options['endpoint'] = endpoint
+    options.get('kwargs', {}).pop('params', None)
+
+
+class Paginator(object):
+    """Base pagination strategy.
+
+    Strategy prepares call options for the first page, extracts items
+    from response body and prepares options for the next page.
+    Options are the same as used in `call_rest_method`.
+    """
+
+    def __init__(self, items_key=None, page_size=100):
+        """Initialize paginator.
+
+        Args:
+            items_key (str): dotted path to items list in response
+                body. If not set, body itself is items list
+                (default: {None}).
+            page_size (int): number of items to ask per page
+                (default: {100}).
+        """
+        self.items_key = items_key
+        self.page_size = page_size
+
+    def first_options(self, options):
+        """Return options for the first page."""
+        return copy.deepcopy(options)
+
+    def get_items(self, body):
+        """Return items from response body."""
+        return get_path_value(body, self.items_key) or []
+
+    def next_options(self, options, response, body, items):
+        """Return options for the next page or None if it was last."""
+        raise NotImplementedError()
+
+
+class OffsetPaginator(Paginator):
+    """Pagination using offset and limit query parameters."""
+
+    def __init__(
+        self,
+        offset_param='offset',
+        limit_param='limit',
+            **kwargs):
+        """Initialize with offset and limit parameter names."""
+        super().__init__(**kwargs)
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self._offset = 0
+
+    def _page_options(self, options):
+        options = copy.deepcopy(options)
+        _set_params(
+            options,
+            {self.offset_param: self._offset, self.limit_param: self.page_size}
+        )
+        return options
+
+    def first_options(self, options):
+        """Return options with zero offset."""
+        self._offset = 0
+        return self._page_options(options)
+
+    def next_options(self, options, response, body, items):
+        """Return options with shifted offset, unless page was partial."""
+        if len(items) < self.page_size:
+            return None
+        self._offset += len(items)
+        return self._page_options(options)
+
+
+class PagePaginator(Paginator):
+    """Pagination using page number query parameter."""
+
+    def __init__(
+        self,
+        page_param='page',
+        size_param='per_page',
+        first_page=1,
+            **kwargs):
+        """Initialize with page number and page size parameter names."""
+        super().__init__(**kwargs)
+        self.page_param = page_param
+        self.size_param = size_param
+        self.first_page = first_page
+        self._page = first_page
+
+    def _page_options(self, options):
+        options = copy.deepcopy(options)
+        params = {self.page_param: self._page}
+        if self.size_param:
+            params[self.size_param] = self.page_size
+        _set_params(options, params)
+        return options
+
+    def first_options(self, options):
+        """Return options for first page number."""
+        self._page = self.first_page
+        return self._page_options(options)
+
+    def next_options(self, options, response, body, items):
+        """Return options for next page number, unless page was partial."""
+        if len(items) < self.page_size:
+            return None
+        self._page += 1
+        return self._page_options(options)
+
+
+class CursorPaginator(Paginator):
+    """Pagination using cursor returned in response body."""
+
+    def __init__(
+        self,
+        cursor_key='next_cursor',
+        cursor_param='cursor',
+            **kwargs):
+        """Initialize with cursor path in body and its parameter name."""
+        super().__init__(**kwargs)
+        self.cursor_key = cursor_key
+        self.cursor_param = cursor_param
+
+    def next_options(self, options, response, body, items):
+        """Return options with next cursor if there is one."""
+        cursor = get_path_value(body, self.cursor_key)
+        if not cursor:
+            return None
+        options = copy.deepcopy(options)
+        _set_params(options, {self.cursor_param: cursor})
+        return options
+
+
+class NextLinkPaginator(Paginator):
+    """Pagination using next page URL returned in response body."""
+
+    def __init__(self, next_key='next', **kwargs):
+        """Initialize with next URL path in body."""
+        super().__init__(**kwargs)
+        self.next_key = next_key
+
+    def next_options(self, options, response, body, items):
+        """Return options with next page endpoint if there is one."""
+        endpoint = get_path_value(body, self.next_key)
+        if not endpoint:
+            return None
+        options = copy.deepcopy(options)
+        _set_endpoint(options, endpoint)
+        return options
+
+
+class LinkHeaderPaginator(Paginator):
+    """Pagination using `Link: <url>; rel="next"` header (RFC 8288)."""
+
+    def next_options(self, options, response, body, items):
+        """Return options with next page endpoint from Link header."""
+        endpoint = response.links.get('next', {}).get('url')
+        if not endpoint:
+            return None
+        options = copy.deepcopy(options)
+        _set_endpoint(options, endpoint)
+        return options
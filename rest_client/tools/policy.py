@@ -0,0 +1,144 @@
+"""Retry, backoff and circuit breaker helpers for REST calls."""
+import time
+import random
+import threading
+
+# Circuit breaker states.
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+DEFAULT_POLICY = {
+    # Seconds to wait for remote. Used only if call kwargs have no
+    # timeout specified.
+    'timeout': None,
+    # Number of retries after first attempt.
+    'retries': 0,
+    # Response status codes that are retried and count as failure for
+    # circuit breaker.
+    'retry_status_codes': (429, 502, 503, 504),
+    # Only idempotent methods are retried by default.
+    'retry_methods': ('get', 'head', 'options', 'put', 'delete'),
+    # Delay is backoff_factor * 2 ** attempt, capped by backoff_max.
+    'backoff_factor': 0.5,
+    'backoff_max': 30,
+    # Randomize delay in [0, delay] range (full jitter).
+    'jitter': True,
+    # Consecutive failures to open circuit. 0 disables circuit breaker.
+    'breaker_threshold': 0,
+    # Seconds to keep circuit open, before letting trial call through.
+    'breaker_reset_timeout': 60,
+}
+
+
+def get_retry_after(response):
+    """Return seconds from Retry-After header or None.
+
+    Only delta seconds form is supported.
+    """
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_backoff(policy, attempt, response=None):
+    """Return seconds to wait before next retry attempt.
+
+    Args:
+        policy (dict): REST call policy.
+        attempt (int): zero-based number of failed attempt.
+        response (obj): failed response, if there is any. Used to
+            honour Retry-After header (default: {None}).
+
+    Returns:
+        float
+
+    """
+    delay = min(policy['backoff_max'], policy['backoff_factor'] * 2 ** attempt)
+    if policy['jitter']:
+        delay = random.uniform(0, delay)
+    retry_after = get_retry_after(response)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, policy['backoff_max']))
+    return delay
+
+
+class CircuitBreakers(object):
+    """Circuit breakers state per key (usually controller and host).
+
+    Circuit is opened after threshold of consecutive failures. When
+    it is open, calls fail fast until reset timeout passes. Then one
+    trial call is let through (half open state): success closes
+    circuit, failure opens it again.
+    """
+
+    def __init__(self):
+        """Initialize breakers without any state."""
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _get_state(self, key):
+        return self._states.setdefault(
+            key,
+            {'state': STATE_CLOSED, 'failures': 0, 'opened_at': None}
+        )
+
+    def allow(self, key, policy):
+        """Return True if call is allowed for key."""
+        if not policy['breaker_threshold']:
+            return True
+        with self._lock:
+            state = self._get_state(key)
+            if state['state'] == STATE_CLOSED:
+                return True
+            if state['state'] == STATE_OPEN:
+                elapsed = time.time() - state['opened_at']
+                if elapsed >= policy['breaker_reset_timeout']:
+                    state['state'] = STATE_HALF_OPEN
+                    return True
+            # Half open circuit already let trial call through.
+            return False
+
+    def record_success(self, key, policy):
+        """Close circuit for key."""
+        if not policy['breaker_threshold']:
+            return
+        with self._lock:
+            state = self._get_state(key)
+            state.update(state=STATE_CLOSED, failures=0, opened_at=None)
+
+    def record_failure(self, key, policy):
+        """Count failure and open circuit if threshold is reached."""
+        threshold = policy['breaker_threshold']
+        if not threshold:
+            return
+        with self._lock:
+            state = self._get_state(key)
+            state['failures'] += 1
+            if (
+                state['state'] == STATE_HALF_OPEN or
+                    state['failures'] >= threshold):
+                state.update(state=STATE_OPEN, opened_at=time.time())
+
+    def get_states(self, key_filter=None):
+        """Return copy of states, optionally filtered by key."""
+        with self._lock:
+            return {
+                key: dict(state) for key, state in self._states.items()
+                if not key_filter or key_filter(key)
+            }
+
+    def reset(self, key_filter=None):
+        """Remove states, optionally filtered by key."""
+        with self._lock:
+            for key in list(self._states):
+                if not key_filter or key_filter(key):
+                    del self._states[key]
+
+
+# Breakers are shared inside worker process.
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,132 @@
+"""Token bucket rate limiters for outgoing REST calls."""
+import time
+import threading
+
+CODE_TOO_MANY_REQUESTS = 429
+BUCKET_TABLE = 'rest_client_rate_bucket'
+
+
+def reserve_token(state, rate, burst, now):
+    """Reserve one token from bucket state and return seconds to wait.
+
+    Token is reserved even if bucket is empty (tokens go negative), so
+    concurrent callers are queued fairly one after another.
+
+    Args:
+        state (dict): bucket state with tokens, updated_at and
+            blocked_until keys. It is updated in place.
+        rate (float): tokens added per second.
+        burst (int): bucket capacity.
+        now (float): current timestamp.
+
+    Returns:
+        float: seconds to wait before sending request.
+
+    """
+    elapsed = max(now - state['updated_at'], 0)
+    state['tokens'] = min(burst, state['tokens'] + elapsed * rate)
+    state['updated_at'] = now
+    wait = max(state['blocked_until'] - now, 0)
+    if state['tokens'] < 1:
+        wait = max(wait, (1 - state['tokens']) / rate)
+    state['tokens'] -= 1
+    return wait
+
+
+class TokenBucket(object):
+    """Thread safe token bucket, kept in worker memory."""
+
+    def __init__(self, rate, burst):
+        """Initialize full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._state = {
+            'tokens': burst, 'updated_at': time.time(), 'blocked_until': 0}
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserve token and return seconds to wait."""
+        with self._lock:
+            return reserve_token(
+                self._state, self.rate, self.burst, time.time())
+
+    def block(self, seconds):
+        """Do not let calls through for specified seconds."""
+        with self._lock:
+            self._state['blocked_until'] = max(
+                self._state['blocked_until'], time.time() + seconds)
+
+
+class RateLimiters(object):
+    """Token buckets per key (usually auth object)."""
+
+    def __init__(self):
+        """Initialize without any buckets."""
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, key, rate, burst):
+        """Return bucket for key, updating its rate and burst."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            bucket.rate, bucket.burst = rate, burst
+            return bucket
+
+    def reset(self):
+        """Remove all buckets."""
+        with self._lock:
+            self._buckets.clear()
+
+
+def reserve_shared_token(cr, key, rate, burst):
+    """Reserve token from bucket stored in database.
+
+    Bucket row is locked until transaction ends, so workers sharing
+    same quota are serialized. Intended to be used with separate short
+    lived cursor.
+
+    Returns:
+        float: seconds to wait before sending request.
+
+    """
+    now = time.time()
+    cr.execute("""
+        INSERT INTO {table} (key, tokens, updated_at, blocked_until)
+        VALUES (%s, %s, %s, 0)
+        ON CONFLICT (key) DO NOTHING
+    """.format(table=BUCKET_TABLE), (key, burst, now))
+    cr.execute("""
+        SELECT tokens, updated_at, blocked_until
+        FROM {table}
+        WHERE key = %s
+        FOR UPDATE
+    """.format(table=BUCKET_TABLE), (key,))
+    tokens, updated_at, blocked_until = cr.fetchone()
+    state = {
+        'tokens': tokens,
+        'updated_at': updated_at,
+        'blocked_until': blocked_until,
+    }
+    wait = reserve_token(state, rate, burst, now)
+    query = """
+        UPDATE {table}
+        SET tokens = %s, updated_at = %s
+        WHERE key = %s
+    """.format(table=BUCKET_TABLE)
+    cr.execute(query, (state['tokens'], state['updated_at'], key))
+    return wait
+
+
+def block_shared(cr, key, seconds):
+    """Do not let calls through shared bucket for specified seconds."""
+    cr.execute("""
+        UPDATE {table}
+        SET blocked_until = GREATEST(blocked_until, %s)
+        WHERE key = %s
+    """.format(table=BUCKET_TABLE), (time.time() + seconds, key))
+
+
+# Buckets are shared inside worker process.
+rate_limiters = RateLimiters()
@@ -0,0 +1,154 @@
+"""JSON serializers using fastest available backend."""
+import json
+import typing
+import dataclasses
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DEFAULT_BACKEND = 'json'
+# Pseudo backend name to use fastest installed backend.
+FAST_BACKEND = 'fast'
+# First available one is used for FAST_BACKEND.
+PREFERRED_BACKENDS = ('orjson', 'msgspec', 'ujson', 'json')
+
+
+def convert(obj, type_):
+    """Convert decoded JSON object into specified type.
+
+    With msgspec, any type it supports can be used (e.g. msgspec.Struct
+    or List[Struct]). Otherwise type must be dataclass or List of
+    dataclasses. Unknown keys are ignored.
+    """
+    if msgspec:
+        try:
+            return msgspec.convert(obj, type_)
+        except msgspec.ValidationError as e:
+            raise ValueError(str(e))
+    # typing.get_origin is not available in Python < 3.8 and origin of
+    # List[X] there is typing.List.
+    if getattr(type_, '__origin__', None) in (list, typing.List):
+        item_type = type_.__args__[0]
+        return [convert(item, item_type) for item in obj]
+    names = {f.name for f in dataclasses.fields(type_)}
+    return type_(**{k: v for k, v in obj.items() if k in names})
+
+
+class JsonSerializer(object):
+    """Standard library JSON serializer.
+
+    Other backends override `_dumps` and `_loads`. All backends raise
+    ValueError on invalid data. Objects other backends can't encode
+    (e.g. integers wider than 64 bits) are encoded by standard library.
+    """
+
+    name = 'json'
+
+    def _dumps(self, obj):
+        # Same as requests does it.
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+    def dumps(self, obj):
+        """Return obj encoded as UTF-8 JSON bytes."""
+        try:
+            return self._dumps(obj)
+        except (TypeError, OverflowError):
+            if self.name == JsonSerializer.name:
+                raise
+            return JsonSerializer._dumps(self, obj)
+
+    def _loads(self, data):
+        return json.loads(data)
+
+    def loads(self, data, type_=None):
+        """Return decoded JSON.
+
+        Args:
+            data (bytes/str): JSON document.
+            type_: type to decode into (default: {None}).
+
+        """
+        obj = self._loads(data)
+        if type_ is None:
+            return obj
+        return convert(obj, type_)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """orjson based serializer."""
+
+    name = 'orjson'
+
+    def _dumps(self, obj):
+        # Non string keys are converted to strings, like json does.
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def _loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonSerializer(JsonSerializer):
+    """ujson based serializer."""
+
+    name = 'ujson'
+
+    def _dumps(self, obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def _loads(self, data):
+        return ujson.loads(data)
+
+
+class MsgspecSerializer(JsonSerializer):
+    """msgspec based serializer.
+
+    Decodes directly into specified type, without intermediate objects.
+    """
+
+    name = 'msgspec'
+
+    def _dumps(self, obj):
+        return msgspec.json.encode(obj)
+
+    def loads(self, data, type_=None):
+        """Return decoded JSON, validated against type if it is set."""
+        try:
+            if type_ is None:
+                return msgspec.json.decode(data)
+            return msgspec.json.decode(data, type=type_)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e))
+
+
+SERIALIZERS = {'json': JsonSerializer()}
+if orjson:
+    SERIALIZERS['orjson'] = OrjsonSerializer()
+if msgspec:
+    SERIALIZERS['msgspec'] = MsgspecSerializer()
+if ujson:
+    SERIALIZERS['ujson'] = UjsonSerializer()
+
+
+def get_serializer(name=None):
+    """Return serializer by backend name.
+
+    If name is not specified or backend is not installed, standard
+    library serializer is returned. FAST_BACKEND returns fastest
+    installed one.
+    """
+    if name == FAST_BACKEND:
+        return next(
+            SERIALIZERS[name] for name in PREFERRED_BACKENDS
+            if name in SERIALIZERS
+        )
+    return SERIALIZERS.get(name) or SERIALIZERS[DEFAULT_BACKEND]
@@ -0,0 +1,97 @@
+"""Per worker pool of keep-alive HTTP sessions."""
+import os
+import hashlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 10
+
+
+def get_fingerprint(*values):
+    """Return digest for values, so secrets would not be kept as is."""
+    data = '\x00'.join(str(v) for v in values)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """Create requests session with mounted connection pool adapters.
+
+    Args:
+        pool_size (int): maximum number of connections to keep alive
+            per host (default: {DEFAULT_POOL_SIZE}).
+
+    Returns:
+        requests.Session
+
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class SessionPool(object):
+    """Keep requests sessions per key, so connections would be reused.
+
+    Each session is stored together with fingerprint of data it was
+    created with. If fingerprint does not match anymore (e.g. URL or
+    credentials were changed in another worker), old session is closed
+    and new one is created instead.
+
+    Sessions created before fork (e.g. warmed up in master process) are
+    not reused in forked worker, because sockets would be shared.
+    """
+
+    def __init__(self):
+        """Initialize empty sessions pool."""
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get_session(self, key, fingerprint, pool_size=DEFAULT_POOL_SIZE):
+        """Return pooled session for key, creating new one if needed.
+
+        Args:
+            key (tuple): identifier of session owner.
+            fingerprint (str): digest of data session is valid for.
+            pool_size (int): connections pool size for new session
+                (default: {DEFAULT_POOL_SIZE}).
+
+        Returns:
+            requests.Session
+
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forget parent process sessions without closing them.
+                self._sessions = {}
+                self._pid = os.getpid()
+            item = self._sessions.get(key)
+            if item:
+                if item[0] == fingerprint:
+                    return item[1]
+                item[1].close()
+            session = create_session(pool_size=pool_size)
+            self._sessions[key] = (fingerprint, session)
+            return session
+
+    def invalidate(self, keys=None):
+        """Close and remove sessions for keys or all if keys not given."""
+        with self._lock:
+            if keys is None:
+                keys = list(self._sessions)
+            for key in keys:
+                item = self._sessions.pop(key, None)
+                if item:
+                    item[1].close()
+
+    def __len__(self):
+        """Return number of pooled sessions."""
+        return len(self._sessions)
+
+
+# Sessions are shared inside worker process.
+session_pool = SessionPool()
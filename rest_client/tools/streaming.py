@@ -0,0 +1,96 @@
+"""Incremental parsing of large JSON response bodies."""
+import json
+import codecs
+
+DEFAULT_CHUNK_SIZE = 65536
+WHITESPACE = ' \t\n\r'
+
+
+def iter_decoded(chunks, encoding='utf-8'):
+    """Decode bytes chunks, keeping split multibyte characters."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def iter_ndjson(lines, loads=json.loads):
+    """Yield parsed items from newline delimited JSON lines.
+
+    Empty lines are ignored.
+    """
+    for line in lines:
+        if line.strip():
+            yield loads(line)
+
+
+def _skip_whitespace(buf, pos):
+    while pos < len(buf) and buf[pos] in WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_items(chunks):
+    """Yield items of top level JSON array from text chunks.
+
+    Only one item at a time (plus unparsed part of chunk) is kept in
+    memory, so array of any size can be processed.
+
+    Args:
+        chunks (iterable): text chunks of JSON array document.
+
+    Yields:
+        parsed array items.
+
+    Raises:
+        ValueError: if document is not valid JSON array.
+
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    started = finished = False
+    chunks = iter(chunks)
+    final = False
+    while not finished:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+        else:
+            buf += chunk
+        pos = _skip_whitespace(buf, 0)
+        while pos < len(buf):
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError("JSON array expected.")
+                started = True
+                pos = _skip_whitespace(buf, pos + 1)
+                continue
+            if buf[pos] == ']':
+                finished = True
+                break
+            if buf[pos] == ',':
+                pos = _skip_whitespace(buf, pos + 1)
+                continue
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # Need more data to parse item.
+                break
+            # Value at the end of buffer might be incomplete (e.g.
+            # number split between chunks).
+            if end == len(buf) and not final:
+                break
+            yield item
+            pos = _skip_whitespace(buf, end)
+        buf = buf[pos:]
+        if final and not finished:
+            raise ValueError("Unexpected end of JSON array.")
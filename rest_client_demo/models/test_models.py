@@ -1,8 +1,19 @@
+import typing
+import dataclasses
+
 from odoo import models, api
 
 GROUP_CONTROLLER_XMLID = 'rest_client_demo.controller_group_use'
 
 
+@dataclasses.dataclass
+class ItemStruct:
+    """Struct to decode test responses into."""
+
+    id: int
+    name: str
+
+
 class RestClientTestAuth(models.Model):
     """Model to handle test auth."""
 
@@ -26,3 +37,56 @@ class RestClientTestController(models.AbstractModel):
         group_user = self.env.ref('base.group_user')
         group_controller = self.env.ref(GROUP_CONTROLLER_XMLID)
         return group_controller in group_user.implied_ids
+
+
+class RestClientTestAsyncController(models.AbstractModel):
+    """Test controller model using async transport."""
+
+    _name = 'rest.client.test.async.controller'
+    _inherit = 'rest.client.test.controller'
+    _description = "Rest Client Async Controller"
+    _transport = 'async'
+
+
+class RestClientTestPolicyController(models.AbstractModel):
+    """Test controller model with retries and circuit breaker."""
+
+    _name = 'rest.client.test.policy.controller'
+    _inherit = 'rest.client.test.controller'
+    _description = "Rest Client Policy Controller"
+    _rest_policy = {
+        'timeout': 5,
+        'retries': 2,
+        'backoff_factor': 0,
+        'breaker_threshold': 3,
+        'breaker_reset_timeout': 60,
+    }
+
+
+class RestClientTestStreamController(models.AbstractModel):
+    """Test controller model with streamed JSON array response."""
+
+    _name = 'rest.client.test.stream.controller'
+    _inherit = 'rest.client.test.controller'
+    _description = "Rest Client Stream Controller"
+    _response_type = 'json_items_stream'
+    _stream_chunk_size = 7
+
+
+class RestClientTestCacheController(models.AbstractModel):
+    """Test controller model with GET responses cache."""
+
+    _name = 'rest.client.test.cache.controller'
+    _inherit = 'rest.client.test.controller'
+    _description = "Rest Client Cache Controller"
+    _http_cache_policy = {'ttl': 60, 'max_size': 2}
+
+
+class RestClientTestStructController(models.AbstractModel):
+    """Test controller model decoding responses into structs."""
+
+    _name = 'rest.client.test.struct.controller'
+    _inherit = 'rest.client.test.controller'
+    _description = "Rest Client Struct Controller"
+    _json_serializer = 'json'
+    _response_struct = typing.List[ItemStruct]
@@ -1,2 +1,12 @@
-from . import test_rest_client_demo_auth, test_rest_client_demo_controller
-__all__ = [test_rest_client_demo_auth, test_rest_client_demo_controller]
+from . import (
+    test_rest_client_demo_auth,
+    test_rest_client_demo_controller,
+    test_rest_client_demo_benchmark,
+    test_rest_client_demo_async,
+)
+__all__ = [
+    test_rest_client_demo_auth,
+    test_rest_client_demo_controller,
+    test_rest_client_demo_benchmark,
+    test_rest_client_demo_async,
+]
@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+
 from odoo.addons.rest_client.tests import common
 
 from .. models.test_models import GROUP_CONTROLLER_XMLID
@@ -33,6 +35,20 @@ class TestRestClientDemoCommon(common.TestRestClientCommon):
         # Enable controller.
         cls.group_user.implied_ids = [(4, cls.group_controller.id)]
 
+    @contextmanager
+    def _registry_test_mode(self):
+        """Make new registry cursors reuse test cursor.
+
+        Shared state (rate limit buckets, metrics) is saved via separate
+        cursor, which would otherwise be committed and not visible in
+        test transaction.
+        """
+        self.registry.enter_test_mode(self.cr)
+        try:
+            yield
+        finally:
+            self.registry.leave_test_mode()
+
     @classmethod
     def _get_auth_model(cls):
         return cls.RestClientTestAuth
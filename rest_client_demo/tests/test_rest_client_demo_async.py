@@ -0,0 +1,121 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from odoo.tools import mute_logger
+from odoo.exceptions import ValidationError
+
+from odoo.addons.rest_client.tools import async_transport
+from odoo.addons.rest_client.tests.common import REST_CLIENT_MODULE_PATH
+from odoo.addons.rest_client.tests.stub_server import StubServer
+from odoo.addons.rest_client.tools.metrics import metrics
+
+from . import common
+
+DELAY = 0.2
+
+
+def _slow_response(method, path, headers, body):
+    time.sleep(DELAY)
+    return (
+        200,
+        {},
+        {'path': path, 'authorization': headers.get('Authorization')}
+    )
+
+
+@unittest.skipIf(
+    not async_transport.is_available(), "aiohttp is not installed")
+class TestRestClientDemoAsync(common.TestRestClientDemoCommon):
+    """Class to test async transport against local stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start stub server and point auth objects to it."""
+        super().setUpClass()
+        cls.RestClientTestAsyncController = cls.env[
+            'rest.client.test.async.controller']
+        cls.stub_server = StubServer(
+            routes={
+                ('GET', '/slow'): _slow_response,
+                ('GET', '/missing'): (404, {}, {'error': 'missing'}),
+            }
+        ).start()
+        (cls.test_auth_1 | cls.test_auth_2).write(
+            {'url': cls.stub_server.url})
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop stub server."""
+        cls.stub_server.stop()
+        super().tearDownClass()
+
+    def _get_calls(self, uri, count, company_id):
+        return [
+            ('get', {'uri_item': (uri, False), 'company_id': company_id})
+        ] * count
+
+    def test_01_call_rest_methods_batch(self):
+        """Call slow endpoint concurrently with async transport."""
+        count = 20
+        start = time.perf_counter()
+        results = self.RestClientTestAsyncController.call_rest_methods_batch(
+            self._get_calls('slow', count, self.main_company.id),
+            max_workers=count
+        )
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), count)
+        for res in results:
+            self.assertFalse(res['error'])
+            self.assertEqual(res['response'].status_code, 200)
+            self.assertEqual(res['response'].json()['path'], '/slow')
+        # Sequential calls would take count * DELAY.
+        self.assertLess(elapsed, count * DELAY / 2)
+
+    def test_02_call_rest_methods_batch(self):
+        """Call with password auth, failed response and bad call."""
+        calls = self._get_calls('slow', 1, self.company_2.id)
+        calls += self._get_calls('missing', 1, self.main_company.id)
+        # XOR condition is not satisfied.
+        calls.append(('get', {}))
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            results = (
+                self.RestClientTestAsyncController.call_rest_methods_batch(
+                    calls)
+            )
+        body = results[0]['response'].json()
+        self.assertTrue(body['authorization'].startswith('Basic '))
+        self.assertEqual(results[1]['response'].status_code, 404)
+        self.assertEqual(results[1]['response'].json(), {'error': 'missing'})
+        self.assertIsNone(results[2]['response'])
+        self.assertTrue(results[2]['error'])
+
+    def test_03_call_rest_methods_batch(self):
+        """Call not reachable endpoint with async transport."""
+        Controller = self.RestClientTestAsyncController
+        # Drop metrics collected by other tests.
+        metrics.snapshot(reset=True)
+        results = Controller.call_rest_methods_batch(
+            [('get', {'endpoint': 'http://127.0.0.1:1/abc'})])
+        self.assertIsNone(results[0]['response'])
+        self.assertTrue(results[0]['error'])
+        # Failed call is recorded in metrics too.
+        stats = [
+            stats for key, stats in metrics.snapshot(reset=True).items()
+            if key[0] == Controller._name
+        ]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['error_count'], 1)
+
+    def test_04_call_rest_methods_batch(self):
+        """Reject async transport with retries or responses cache."""
+        Controller = self.RestClientTestAsyncController
+        calls = self._get_calls('slow', 1, self.main_company.id)
+        with patch.object(
+                type(Controller), '_rest_policy', {'retries': 1}):
+            with self.assertRaises(ValidationError):
+                Controller.call_rest_methods_batch(calls)
+        with patch.object(
+                type(Controller), '_http_cache_policy', {'ttl': 60}):
+            with self.assertRaises(ValidationError):
+                Controller.call_rest_methods_batch(calls)
@@ -126,3 +126,25 @@ class TestRestClientDemoAuth(common.TestRestClientDemoCommon):
         auth = self._create_auth({'company_id': False})
         with self.assertRaises(ValidationError):
             auth.action_confirm()
+
+    def test_10_get_auth_payload(self):
+        """Get cached auth payload.
+
+        Case 1: payload is cached, so no queries are done.
+        Case 2: company auth is reset to draft, so global is used.
+        Case 3: auth URL is changed.
+        """
+        Auth = self.RestClientTestAuth
+        # Case 1.
+        payload = Auth.get_auth_payload(self.main_company.id)
+        self.assertEqual(payload, self.test_auth_1.get_payload())
+        with self.assertQueryCount(0):
+            Auth.get_auth_payload(self.main_company.id)
+        # Case 2.
+        self.test_auth_1.action_to_draft()
+        payload = Auth.get_auth_payload(self.main_company.id)
+        self.assertEqual(payload, self.test_auth_3.get_payload())
+        # Case 3.
+        self.test_auth_3.url = 'http://other-dummy-url.com'
+        payload = Auth.get_auth_payload(self.main_company.id)
+        self.assertEqual(payload['data']['url'], 'http://other-dummy-url.com')
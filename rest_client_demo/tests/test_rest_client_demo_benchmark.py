@@ -0,0 +1,237 @@
+import time
+import gzip
+import json
+import logging
+
+from odoo.tests import tagged
+from odoo.tools import mute_logger
+
+from odoo.addons.rest_client.tests.common import REST_CLIENT_MODULE_PATH
+from odoo.addons.rest_client.tests.load_harness import (
+    run_load, format_report
+)
+from odoo.addons.rest_client.tests.stub_server import StubServer
+from odoo.addons.rest_client.tools.serializers import SERIALIZERS
+
+from . import common
+
+_logger = logging.getLogger(__name__)
+
+CALLS_COUNT = 500
+# Number of items in typical small, medium and large JSON payloads.
+PAYLOAD_SIZES = (10, 1000, 20000)
+PAYLOAD_CALLS_COUNT = 20
+SERIALIZER_ROUNDS = 20
+LOAD_CALLS_COUNT = 400
+LOAD_CONCURRENCY = (1, 4, 16)
+# Seconds added to each stub server response.
+LOAD_LATENCY = 0.005
+LOAD_ERROR_RATE = 0.05
+
+
+@tagged('-standard', 'rest_client_benchmark')
+class TestRestClientDemoBenchmark(common.TestRestClientDemoCommon):
+    """Benchmark REST calls against local stub server.
+
+    Not run by default. Use `--test-tags rest_client_benchmark`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Start stub server to be used by benchmarks."""
+        super().setUpClass()
+        cls.stub_server = StubServer(
+            routes={('POST', '/bench_echo'): cls._echo_compressed},
+        ).start()
+        cls.wire_bytes = []
+        cls.test_auth_1.url = cls.stub_server.url
+
+    @classmethod
+    def _echo_compressed(cls, method, path, headers, body):
+        # Respond with same body, compressing it if client accepts it.
+        cls.wire_bytes.append(len(body))
+        if headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        response_headers = {'Content-Type': 'application/json'}
+        if 'gzip' in headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            response_headers['Content-Encoding'] = 'gzip'
+        cls.wire_bytes.append(len(body))
+        return (200, response_headers, body)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop stub server."""
+        cls.stub_server.stop()
+        super().tearDownClass()
+
+    def _call_many(self, count=CALLS_COUNT):
+        options = {
+            'uri_item': ('bench', False),
+            'company_id': self.main_company.id,
+        }
+        start = time.perf_counter()
+        for __ in range(count):
+            self.RestClientTestController.call_rest_method(
+                'get', options=dict(options))
+        return time.perf_counter() - start
+
+    def _benchmark_calls(self, keep_alive):
+        self.test_auth_1.session_keep_alive = keep_alive
+        connections_before = self.stub_server.connections_count
+        elapsed = self._call_many()
+        connections = self.stub_server.connections_count - connections_before
+        _logger.info(
+            "Keep-Alive: %s, calls: %s, connections: %s, %.1f calls/s",
+            keep_alive, CALLS_COUNT, connections, CALLS_COUNT / elapsed)
+        return elapsed, connections
+
+    def test_01_session_pool_benchmark(self):
+        """Compare pooled and unpooled calls throughput."""
+        __, connections_unpooled = self._benchmark_calls(False)
+        __, connections_pooled = self._benchmark_calls(True)
+        self.assertEqual(connections_unpooled, CALLS_COUNT)
+        self.assertLess(connections_pooled, connections_unpooled)
+
+    def _benchmark_compression(self, encoding, items_count):
+        self.test_auth_1.request_compression = encoding
+        data = {
+            'items': [
+                {'id': i, 'name': 'Item %s' % i, 'active': True}
+                for i in range(items_count)
+            ]
+        }
+        options = {
+            'uri_item': ('bench_echo', False),
+            'company_id': self.main_company.id,
+        }
+        del self.wire_bytes[:]
+        start = time.perf_counter()
+        for __ in range(PAYLOAD_CALLS_COUNT):
+            response = self.RestClientTestController.call_rest_method(
+                'post', options=dict(options, kwargs={'json': data}))
+            self.assertEqual(response.json(), data)
+        elapsed = time.perf_counter() - start
+        wire_bytes = sum(self.wire_bytes)
+        _logger.info(
+            "Compression: %s, payload: %s bytes, bytes on wire per call: %s, "
+            "%.2f ms per call",
+            encoding or 'none', len(json.dumps(data)),
+            wire_bytes // PAYLOAD_CALLS_COUNT,
+            elapsed * 1000 / PAYLOAD_CALLS_COUNT)
+        return wire_bytes
+
+    def test_02_compression_benchmark(self):
+        """Compare bytes on wire and time with and without gzip.
+
+        Responses are compressed in both cases, because requests asks
+        for them by default. Smallest payload is below threshold.
+        """
+        for items_count in PAYLOAD_SIZES:
+            plain_bytes = self._benchmark_compression(False, items_count)
+            gzip_bytes = self._benchmark_compression('gzip', items_count)
+            self.assertLessEqual(gzip_bytes, plain_bytes)
+        self.assertLess(gzip_bytes, plain_bytes)
+
+    def _get_serializer_payloads(self):
+        # Flat records list, nested documents and one big document.
+        records = [
+            {
+                'id': i,
+                'code': 'P%06d' % i,
+                'name': 'Product ąčę %s' % i,
+                'price': i * 1.25,
+                'active': bool(i % 2),
+                'tag_ids': [1, 2, 3],
+                'parent_id': None,
+            }
+            for i in range(1000)
+        ]
+        orders = [
+            {
+                'id': i,
+                'partner': {'id': i, 'name': 'Partner %s' % i, 'vat': None},
+                'lines': records[i:i + 10],
+            }
+            for i in range(200)
+        ]
+        return {
+            'records': records,
+            'orders': orders,
+            'document': {'records': records * 10},
+        }
+
+    def test_03_serializers_benchmark(self):
+        """Compare available JSON backends encode and decode speed."""
+        for payload_name, payload in self._get_serializer_payloads().items():
+            for name, serializer in SERIALIZERS.items():
+                data = serializer.dumps(payload)
+                start = time.perf_counter()
+                for __ in range(SERIALIZER_ROUNDS):
+                    serializer.dumps(payload)
+                dumps_time = time.perf_counter() - start
+                start = time.perf_counter()
+                for __ in range(SERIALIZER_ROUNDS):
+                    loaded = serializer.loads(data)
+                loads_time = time.perf_counter() - start
+                self.assertEqual(loaded, payload)
+                _logger.info(
+                    "Serializer: %s, payload: %s (%s bytes), dumps: %.2f ms, "
+                    "loads: %.2f ms",
+                    name, payload_name, len(data),
+                    dumps_time * 1000 / SERIALIZER_ROUNDS,
+                    loads_time * 1000 / SERIALIZER_ROUNDS)
+
+    def _run_controller_load(
+        self,
+        Controller,
+        method_name,
+        options,
+        count=LOAD_CALLS_COUNT,
+            concurrency=1):
+        # Resolve auth payload before threads start, so they would only
+        # use cached one.
+        Controller._get_auth_payload(options.get('company_id', False))
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            return run_load(
+                lambda i: Controller.call_rest_method(
+                    method_name, options=dict(options)),
+                count,
+                concurrency=concurrency,
+                is_error=lambda response: response.status_code >= 400,
+            )
+
+    def test_04_load_benchmark(self):
+        """Drive controller at different concurrency levels.
+
+        Stub server adds latency and injects errors, so throughput and
+        latency percentiles would be closer to real remote.
+        """
+        options = {
+            'uri_item': ('bench_load', False),
+            'company_id': self.main_company.id,
+        }
+        self.test_auth_1.write({
+            'url': self.stub_server.url,
+            'session_keep_alive': True,
+            'session_pool_size': max(LOAD_CONCURRENCY),
+        })
+        self.stub_server.latency = LOAD_LATENCY
+        self.stub_server.error_rate = LOAD_ERROR_RATE
+        reports = []
+        try:
+            for concurrency in LOAD_CONCURRENCY:
+                report = self._run_controller_load(
+                    self.RestClientTestController,
+                    'get',
+                    options,
+                    concurrency=concurrency)
+                _logger.info("Load: %s", format_report(report))
+                reports.append(report)
+        finally:
+            self.stub_server.latency = 0
+            self.stub_server.error_rate = 0
+        for report in reports:
+            self.assertGreater(report['errors'], 0)
+            self.assertGreaterEqual(report['p50'], LOAD_LATENCY * 1000)
+        self.assertGreater(reports[-1]['rps'], reports[0]['rps'])
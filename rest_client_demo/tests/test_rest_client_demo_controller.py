@@ -1,8 +1,32 @@
+import time
+import gzip
+import json
+import requests
 import requests_mock
+from unittest.mock import patch
 
-from odoo.addons.rest_client.exceptions import AuthDataError
-from odoo.addons.rest_client.tests.common import DUMMY_URL, DUMMY_ENDPOINT
+from odoo.tools import mute_logger
+from odoo.exceptions import ValidationError
 
+from odoo.addons.rest_client.exceptions import AuthDataError, CircuitOpenError
+from odoo.addons.rest_client.tests.common import (
+    DUMMY_URL,
+    DUMMY_ENDPOINT,
+    REST_CLIENT_MODULE_PATH,
+)
+from odoo.addons.rest_client.tests.stub_server import StubServer
+from odoo.addons.rest_client.tools.http_cache import http_caches
+from odoo.addons.rest_client.tools.metrics import metrics
+from odoo.addons.rest_client.tools.policy import circuit_breakers
+from odoo.addons.rest_client.tools.rate_limit import rate_limiters
+from odoo.addons.rest_client.tools.pagination import (
+    OffsetPaginator,
+    PagePaginator,
+    CursorPaginator,
+    LinkHeaderPaginator,
+)
+
+from .. models.test_models import ItemStruct
 from . import common
 
 
@@ -67,3 +91,711 @@ class TestRestClientDemoController(common.TestRestClientDemoCommon):
             }
         )
         self.assertEqual(response.status_code, 200)
+
+    def test_04_get_session(self):
+        """Get pooled session for auth object.
+
+        Case 1: same session is reused.
+        Case 2: auth URL is changed, so new session is used.
+        Case 3: Keep-Alive is disabled.
+        """
+        Controller = self.RestClientTestController
+        # Case 1.
+        session_data = self.test_auth_1.get_session_data()
+        session = Controller._get_session(session_data)
+        self.assertTrue(session)
+        self.assertIs(Controller._get_session(session_data), session)
+        # Case 2.
+        self.test_auth_1.url = 'http://other-dummy-url.com'
+        session_data_2 = self.test_auth_1.get_session_data()
+        self.assertNotEqual(
+            session_data['fingerprint'], session_data_2['fingerprint'])
+        self.assertIsNot(Controller._get_session(session_data_2), session)
+        # Case 3.
+        self.test_auth_1.session_keep_alive = False
+        self.assertIsNone(
+            Controller._get_session(self.test_auth_1.get_session_data()))
+
+    @requests_mock.Mocker()
+    def test_05_call_rest_method(self, mock):
+        """Call REST method through pooled session."""
+        endpoint = DUMMY_URL + '/my_uri'
+        self.mock_get(
+            mock, endpoint, response_body={'status_code': 200, 'json': {}}
+        )
+        for __ in range(2):
+            response = self.RestClientTestController.call_rest_method(
+                'get',
+                options={
+                    'uri_item': ('my_uri', False),
+                    'company_id': self.main_company.id,
+                }
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_06_call_rest_methods_batch(self, mock):
+        """Call multiple REST methods in batch.
+
+        Case 1: calls for different companies, with one failing.
+        Case 2: calls are run sequentially.
+        """
+        self.mock_get(
+            mock,
+            DUMMY_URL + '/my_uri/a',
+            response_body={'status_code': 200, 'json': {'a': 1}}
+        )
+        self.mock_post(
+            mock,
+            DUMMY_URL + '/my_uri/b',
+            response_body={'status_code': 400, 'json': {}}
+        )
+        calls = [
+            (
+                'get',
+                {
+                    'uri_item': ('my_uri/%s', ('a',)),
+                    'company_id': self.main_company.id,
+                }
+            ),
+            # XOR condition is not satisfied.
+            ('get', {'endpoint': DUMMY_URL, 'uri_item': ('my_uri', False)}),
+            (
+                'post',
+                {
+                    'uri_item': ('my_uri/%s', ('b',)),
+                    'company_id': self.company_2.id,
+                }
+            ),
+        ]
+        # Case 1.
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            results = self.RestClientTestController.call_rest_methods_batch(
+                calls)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['response'].json(), {'a': 1})
+        self.assertFalse(results[0]['error'])
+        self.assertIsNone(results[1]['response'])
+        self.assertTrue(results[1]['error'])
+        self.assertEqual(results[2]['response'].status_code, 400)
+        self.assertFalse(results[2]['error'])
+        # Case 2.
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            results = self.RestClientTestController.call_rest_methods_batch(
+                calls, max_workers=1)
+        self.assertEqual(
+            [bool(r['error']) for r in results], [False, True, False])
+
+    @requests_mock.Mocker()
+    def test_07_call_rest_method_retry(self, mock):
+        """Call REST method that is retried.
+
+        Case 1: second attempt succeeds.
+        Case 2: all attempts fail.
+        Case 3: POST is not retried.
+        """
+        Controller = self.env['rest.client.test.policy.controller']
+        Controller.reset_circuit_breaker()
+        endpoint = DUMMY_URL + '/my_uri'
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        # Case 1.
+        mock.get(endpoint, [{'status_code': 503}, {'status_code': 200}])
+        response = Controller.call_rest_method('get', options=dict(options))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock.call_count, 2)
+        # Case 2.
+        mock.reset_mock()
+        mock.get(endpoint, status_code=503)
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            response = Controller.call_rest_method(
+                'get', options=dict(options))
+        self.assertEqual(response.status_code, 503)
+        # First attempt and two retries.
+        self.assertEqual(mock.call_count, 3)
+        # Case 3.
+        Controller.reset_circuit_breaker()
+        mock.reset_mock()
+        mock.post(endpoint, status_code=503)
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            Controller.call_rest_method('post', options=dict(options))
+        self.assertEqual(mock.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_08_call_rest_method_circuit_breaker(self, mock):
+        """Open circuit after consecutive failures and fail fast."""
+        Controller = self.env['rest.client.test.policy.controller']
+        Controller.reset_circuit_breaker()
+        endpoint = DUMMY_URL + '/my_uri'
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        mock.get(endpoint, status_code=503)
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            Controller.call_rest_method('get', options=dict(options))
+        state = Controller.get_circuit_breaker_state()['dummy-url.com']
+        self.assertEqual(state['state'], 'open')
+        self.assertEqual(state['failures'], 3)
+        mock.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            Controller.call_rest_method('get', options=dict(options))
+        self.assertEqual(mock.call_count, 0)
+        # Other controllers are not affected.
+        self.assertEqual(
+            self.RestClientTestController.get_circuit_breaker_state(), {})
+        Controller.reset_circuit_breaker()
+        self.assertEqual(Controller.get_circuit_breaker_state(), {})
+
+    @requests_mock.Mocker()
+    def test_09_call_rest_method_stream(self, mock):
+        """Call REST method and iterate over streamed items."""
+        Controller = self.env['rest.client.test.stream.controller']
+        endpoint = DUMMY_URL + '/my_uri'
+        items = [{'id': i} for i in range(100)]
+        mock.get(endpoint, json=items)
+        response = Controller.call_rest_method(
+            'get',
+            options={
+                'uri_item': ('my_uri', False),
+                'company_id': self.main_company.id,
+            }
+        )
+        self.assertTrue(mock.last_request.stream)
+        body = Controller._extract_response_body(response)
+        self.assertEqual(next(body), {'id': 0})
+        self.assertEqual(list(body), items[1:])
+
+    def _get_paginated_options(self):
+        return {
+            'uri_item': ('items', False),
+            'company_id': self.main_company.id,
+        }
+
+    @requests_mock.Mocker()
+    def test_10_iter_rest_items(self, mock):
+        """Iterate over items using offset and page pagination.
+
+        Case 1: offset pagination.
+        Case 2: page number pagination with prefetch.
+        """
+        def offset_response(request, context):
+            offset = int(request.qs['offset'][0])
+            limit = int(request.qs['limit'][0])
+            return items[offset:offset + limit]
+
+        def page_response(request, context):
+            page = int(request.qs['page'][0])
+            size = int(request.qs['per_page'][0])
+            return {'data': items[(page - 1) * size:page * size]}
+
+        items = list(range(5))
+        endpoint = DUMMY_URL + '/items'
+        Controller = self.RestClientTestController
+        # Case 1.
+        mock.get(endpoint, json=offset_response)
+        res = Controller.iter_rest_items(
+            'get',
+            OffsetPaginator(page_size=2),
+            options=self._get_paginated_options()
+        )
+        self.assertEqual(list(res), items)
+        self.assertEqual(mock.call_count, 3)
+        # Case 2.
+        mock.reset_mock()
+        mock.get(endpoint, json=page_response)
+        res = Controller.iter_rest_items(
+            'get',
+            PagePaginator(items_key='data', page_size=5),
+            options=self._get_paginated_options(),
+            prefetch=True,
+        )
+        self.assertEqual(list(res), items)
+        # Last page is empty.
+        self.assertEqual(mock.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_11_iter_rest_items(self, mock):
+        """Iterate over items using cursor and Link header pagination.
+
+        Case 1: cursor pagination.
+        Case 2: Link header pagination with prefetch.
+        Case 3: page call fails.
+        """
+        endpoint = DUMMY_URL + '/items'
+        endpoint_2 = DUMMY_URL + '/items/2'
+        Controller = self.RestClientTestController
+        # Case 1.
+        mock.get(
+            endpoint + '?cursor=abc',
+            json={'data': {'items': [3]}, 'next_cursor': False})
+        mock.get(
+            endpoint,
+            json={'data': {'items': [1, 2]}, 'next_cursor': 'abc'},
+            complete_qs=True)
+        res = Controller.iter_rest_items(
+            'get',
+            CursorPaginator(items_key='data.items'),
+            options=self._get_paginated_options()
+        )
+        self.assertEqual(list(res), [1, 2, 3])
+        # Case 2.
+        mock.get(
+            endpoint,
+            json=[1, 2],
+            headers={'Link': '<%s>; rel="next"' % endpoint_2})
+        mock.get(endpoint_2, json=[3])
+        res = Controller.iter_rest_items(
+            'get',
+            LinkHeaderPaginator(),
+            options=self._get_paginated_options(),
+            prefetch=True,
+        )
+        self.assertEqual(list(res), [1, 2, 3])
+        # Case 3.
+        mock.get(endpoint_2, status_code=500, json={})
+        res = Controller.iter_rest_items(
+            'get',
+            LinkHeaderPaginator(),
+            options=self._get_paginated_options(),
+        )
+        self.assertEqual(next(res), 1)
+        with self.assertRaises(ValidationError), mute_logger(
+                REST_CLIENT_MODULE_PATH):
+            list(res)
+
+    @requests_mock.Mocker()
+    def test_12_call_rest_method_cached(self, mock):
+        """Call GET method with responses cache.
+
+        Case 1: second call is served from cache.
+        Case 2: stale entry is revalidated with 304 response.
+        Case 3: entries are evicted when cache is full.
+        """
+        def etag_response(request, context):
+            if request.headers.get('If-None-Match') == '"v1"':
+                context.status_code = 304
+                return None
+            context.headers['ETag'] = '"v1"'
+            return {'a': 1}
+
+        Controller = self.env['rest.client.test.cache.controller']
+        Controller.clear_http_cache()
+        mock.get(DUMMY_URL + '/my_uri', json=etag_response)
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        # Case 1.
+        response = Controller.call_rest_method('get', options=dict(options))
+        self.assertEqual(Controller._extract_response_body(response), {'a': 1})
+        response_2 = Controller.call_rest_method(
+            'get', options=dict(options))
+        self.assertIs(response_2, response)
+        self.assertEqual(mock.call_count, 1)
+        stats = Controller.get_http_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        # Case 2.
+        cache = http_caches.get_cache(Controller._name)
+        for entry in cache._entries.values():
+            entry.stored_at -= 60
+        response_3 = Controller.call_rest_method(
+            'get', options=dict(options))
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(mock.last_request.headers['If-None-Match'], '"v1"')
+        self.assertIs(response_3, response)
+        self.assertEqual(
+            Controller._extract_response_body(response_3), {'a': 1})
+        stats = Controller.get_http_cache_stats()
+        self.assertEqual(stats['revalidations'], 1)
+        # Case 3.
+        for uri in ('my_uri_2', 'my_uri_3'):
+            mock.get(DUMMY_URL + '/' + uri, json={})
+            Controller.call_rest_method(
+                'get', options=dict(options, uri_item=(uri, False)))
+        stats = Controller.get_http_cache_stats()
+        self.assertEqual((stats['size'], stats['evictions']), (2, 1))
+        Controller.clear_http_cache()
+        self.assertEqual(Controller.get_http_cache_stats()['size'], 0)
+
+    @requests_mock.Mocker()
+    def test_13_call_rest_method_rate_limit(self, mock):
+        """Call REST method with rate limited auth.
+
+        Case 1: calls are delayed by worker rate limiter.
+        Case 2: Retry-After header blocks rate limiter.
+        Case 3: rate limit is shared using database.
+        """
+        rate_limiters.reset()
+        mock.get(DUMMY_URL + '/my_uri', json={})
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        self.test_auth_1.write({'rate_limit': 10, 'rate_limit_burst': 1})
+        Controller = self.RestClientTestController
+        # Case 1.
+        start = time.perf_counter()
+        for __ in range(3):
+            Controller.call_rest_method('get', options=dict(options))
+        # Second call waits ~0.1s and third one ~0.2s.
+        self.assertGreater(time.perf_counter() - start, 0.2)
+        # Case 2.
+        mock.get(
+            DUMMY_URL + '/my_uri',
+            status_code=429,
+            headers={'Retry-After': '30'},
+            json={})
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            Controller.call_rest_method('get', options=dict(options))
+        data = self.test_auth_1.get_rate_limit_data()
+        bucket = rate_limiters.get_bucket(data['key'], 10, 1)
+        self.assertGreater(bucket.reserve(), 20)
+        # Case 3.
+        self.test_auth_1.rate_limit_shared = True
+        mock.get(DUMMY_URL + '/my_uri', json={})
+        with self._registry_test_mode():
+            Controller.call_rest_method('get', options=dict(options))
+        bucket = self.env['rest.client.rate.bucket'].search(
+            [('key', '=', data['key'])])
+        self.assertEqual(len(bucket), 1)
+        self.assertLess(bucket.tokens, 1)
+
+    @requests_mock.Mocker()
+    def test_14_call_rest_method_metrics(self, mock):
+        """Collect REST calls metrics and export them."""
+        with self._registry_test_mode():
+            RestClientMetric = self.env['rest.client.metric']
+            # Drop metrics collected by other tests.
+            metrics.snapshot(reset=True)
+            mock.get(DUMMY_URL + '/my_uri/a', json={'a': 1})
+            mock.get(DUMMY_URL + '/my_uri/b', status_code=404, json={})
+            Controller = self.RestClientTestController
+            with mute_logger(REST_CLIENT_MODULE_PATH):
+                for arg in ('a', 'a', 'b'):
+                    Controller.call_rest_method(
+                        'get',
+                        options={
+                            'uri_item': ('my_uri/%s', (arg,)),
+                            'company_id': self.main_company.id,
+                        }
+                    )
+            RestClientMetric.flush_worker_metrics()
+            metric = RestClientMetric.search([
+                ('controller', '=', Controller._name),
+                ('endpoint', '=', 'my_uri/%s'),
+                ('method', '=', 'GET'),
+            ])
+            self.assertEqual(metric.count, 3)
+            self.assertEqual(metric.error_count, 1)
+            self.assertEqual(metric.retry_count, 0)
+            self.assertGreater(metric.bytes_in, 0)
+            self.assertGreaterEqual(metric.latency_p99, metric.latency_p50)
+            # Merge metrics flushed second time.
+            metrics.record(
+                (Controller._name, 'my_uri/%s', 'GET'), 10.0, error=True)
+            RestClientMetric.flush_worker_metrics()
+            metric.invalidate_cache()
+            self.assertEqual(metric.count, 4)
+            self.assertEqual(metric.error_count, 2)
+            text = RestClientMetric.export_metrics(
+                domain=[('id', '=', metric.id)])
+            self.assertIn(
+                'rest_client_requests_total{controller="%s",'
+                'endpoint="my_uri/%%s",method="GET"} 4' % Controller._name,
+                text
+            )
+            self.assertIn('rest_client_latency_milliseconds_bucket', text)
+
+    @requests_mock.Mocker()
+    def test_15_enqueue_rest_call(self, mock):
+        """Send enqueued REST calls from outbox."""
+        RestClientOutbox = self.env['rest.client.outbox']
+        mock.post(DUMMY_URL + '/my_uri/a', status_code=201, json={'id': 7})
+        mock.post(DUMMY_URL + '/my_uri/b', status_code=503, json={})
+        mock.post(DUMMY_URL + '/my_uri/c', status_code=404, json={})
+        Controller = self.RestClientTestController
+        messages = RestClientOutbox
+        for arg in ('a', 'b', 'c'):
+            messages |= Controller.enqueue_rest_call(
+                'post',
+                options={
+                    'uri_item': ('my_uri/%s', (arg,)),
+                    'company_id': self.main_company.id,
+                    'kwargs': {'json': {'name': arg}},
+                }
+            )
+        # Nothing is sent while enqueuing.
+        self.assertEqual(mock.call_count, 0)
+        self.assertEqual(messages.mapped('state'), ['pending'] * 3)
+        self.assertEqual(messages[0].company_id, self.main_company)
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            RestClientOutbox.process_outbox()
+        self.assertEqual(mock.call_count, 3)
+        self.assertEqual(
+            sorted(r.json() for r in mock.request_history),
+            [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+        )
+        msg_a, msg_b, msg_c = messages
+        self.assertEqual(msg_a.state, 'done')
+        self.assertEqual(msg_a.response_status, 201)
+        self.assertEqual(msg_a.response_body, '{"id": 7}')
+        # Retryable code, so message is postponed.
+        self.assertEqual(msg_b.state, 'pending')
+        self.assertEqual(msg_b.attempts, 1)
+        self.assertTrue(msg_b.next_attempt_at)
+        self.assertEqual(msg_c.state, 'failed')
+        self.assertEqual(msg_c.response_status, 404)
+        # Postponed message is not due yet.
+        RestClientOutbox.process_outbox()
+        self.assertEqual(mock.call_count, 3)
+        msg_c.action_retry()
+        self.assertEqual(msg_c.state, 'pending')
+        msg_b.action_cancel()
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            RestClientOutbox.process_outbox()
+        self.assertEqual(mock.call_count, 4)
+        self.assertEqual(msg_b.state, 'cancelled')
+        self.assertEqual(msg_c.attempts, 1)
+
+    @requests_mock.Mocker()
+    def test_16_call_rest_method_compression(self, mock):
+        """Call REST method with request compression.
+
+        Case 1: JSON body above threshold is compressed.
+        Case 2: body below threshold is sent as is.
+        """
+        mock.post(DUMMY_URL + '/my_uri', json={})
+        self.test_auth_1.write({
+            'request_compression': 'gzip',
+            'request_compression_min_size': 100,
+        })
+        data = {'items': [{'name': 'Item %s' % i} for i in range(50)]}
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        Controller = self.RestClientTestController
+        # Case 1.
+        Controller.call_rest_method(
+            'post', options=dict(options, kwargs={'json': data}))
+        request = mock.last_request
+        self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+        self.assertIn('gzip', request.headers['Accept-Encoding'])
+        self.assertEqual(json.loads(gzip.decompress(request.body)), data)
+        # Case 2.
+        Controller.call_rest_method(
+            'post', options=dict(options, kwargs={'json': {'a': 1}}))
+        request = mock.last_request
+        self.assertNotIn('Content-Encoding', request.headers)
+        self.assertEqual(request.json(), {'a': 1})
+
+    @requests_mock.Mocker()
+    def test_17_call_rest_method_struct(self, mock):
+        """Call REST method decoding response into structs."""
+        mock.get(
+            DUMMY_URL + '/my_uri',
+            json=[
+                {'id': 1, 'name': 'A', 'extra': True},
+                {'id': 2, 'name': 'B'},
+            ]
+        )
+        Controller = self.env['rest.client.test.struct.controller']
+        response = Controller.call_rest_method(
+            'get',
+            options={
+                'uri_item': ('my_uri', False),
+                'company_id': self.main_company.id,
+            }
+        )
+        self.assertEqual(
+            Controller._extract_response_body(response),
+            [ItemStruct(id=1, name='A'), ItemStruct(id=2, name='B')]
+        )
+
+    def test_18_action_check_health(self):
+        """Check auth health and warm up pooled connections.
+
+        Case 1: reachable remote with Keep-Alive.
+        Case 2: unreachable remote.
+        """
+        def respond_slowly(method, path, headers, body):
+            # So warmup requests would not reuse each other connections.
+            time.sleep(0.05)
+            return (200, {}, b'')
+
+        # Case 1.
+        with StubServer(routes={('HEAD', '/'): respond_slowly}) as server:
+            self.test_auth_1.write({
+                'url': server.url,
+                'session_keep_alive': True,
+                'session_pool_size': 3,
+            })
+            self.test_auth_1.action_check_health()
+            self.assertEqual(self.test_auth_1.health_state, 'ok')
+            self.assertFalse(self.test_auth_1.health_message)
+            self.assertGreater(self.test_auth_1.health_latency, 0)
+            self.assertTrue(self.test_auth_1.health_checked_at)
+            self.assertEqual(server.connections_count, 3)
+            self.RestClientTestController.call_rest_method(
+                'get',
+                options={
+                    'uri_item': ('my_uri', False),
+                    'company_id': self.main_company.id,
+                }
+            )
+            # Call used warm connection.
+            self.assertEqual(server.connections_count, 3)
+        # Case 2. Nothing listens on port 1.
+        self.test_auth_1.url = 'http://127.0.0.1:1'
+        self.test_auth_1.action_check_health()
+        self.assertEqual(self.test_auth_1.health_state, 'error')
+        self.assertIn('ConnectionError', self.test_auth_1.health_message)
+
+    @requests_mock.Mocker()
+    def test_19_call_rest_method_circuit_breaker_half_open(self, mock):
+        """Let trial call through half open circuit, that raises."""
+        Controller = self.env['rest.client.test.policy.controller']
+        Controller.reset_circuit_breaker()
+        endpoint = DUMMY_URL + '/my_uri'
+        options = {
+            'uri_item': ('my_uri', False),
+            'company_id': self.main_company.id,
+        }
+        breaker_key = Controller._get_breaker_key(endpoint)
+        mock.get(endpoint, status_code=503)
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            Controller.call_rest_method('get', options=dict(options))
+        # Pretend reset timeout passed.
+        circuit_breakers._get_state(breaker_key)['opened_at'] = 0
+        mock.get(endpoint, exc=ValueError)
+        with self.assertRaises(ValidationError):
+            Controller.call_rest_method('get', options=dict(options))
+        # Failed trial call opens circuit again.
+        state = Controller.get_circuit_breaker_state()['dummy-url.com']
+        self.assertEqual(state['state'], 'open')
+        circuit_breakers._get_state(breaker_key)['opened_at'] = 0
+        mock.get(endpoint, status_code=200, json={})
+        response = Controller.call_rest_method('get', options=dict(options))
+        self.assertEqual(response.status_code, 200)
+        state = Controller.get_circuit_breaker_state()['dummy-url.com']
+        self.assertEqual(state['state'], 'closed')
+        Controller.reset_circuit_breaker()
+
+    def test_20_flush_worker_metrics_failed(self):
+        """Keep worker metrics in memory, when they can't be saved."""
+        with self._registry_test_mode():
+            RestClientMetric = self.env['rest.client.metric']
+            metrics.snapshot(reset=True)
+            key = (self.RestClientTestController._name, 'my_uri/%s', 'GET')
+            metrics.record(key, 10.0)
+            with patch.object(
+                    type(RestClientMetric), 'merge_snapshot',
+                    side_effect=Exception("Save failed")):
+                with mute_logger('odoo.addons.rest_client.models'
+                                 '.rest_client_metric'):
+                    RestClientMetric.flush_worker_metrics()
+            metrics.record(key, 20.0, error=True)
+            stats = metrics.snapshot()[key]
+            self.assertEqual(stats['count'], 2)
+            self.assertEqual(stats['error_count'], 1)
+            RestClientMetric.flush_worker_metrics()
+            metric = RestClientMetric.search([
+                ('controller', '=', key[0]),
+                ('endpoint', '=', key[1]),
+                ('method', '=', key[2]),
+            ])
+            self.assertEqual(metric.count, 2)
+            self.assertFalse(metrics.snapshot())
+
+    @requests_mock.Mocker()
+    def test_21_outbox_result_handling_failed(self, mock):
+        """Fail only message, which result handling failed."""
+        RestClientOutbox = self.env['rest.client.outbox']
+        mock.post(DUMMY_URL + '/my_uri/a', status_code=201, json={})
+        mock.post(DUMMY_URL + '/my_uri/b', status_code=201, json={})
+        Controller = self.RestClientTestController
+        messages = RestClientOutbox
+        for arg in ('a', 'b'):
+            messages |= Controller.enqueue_rest_call(
+                'post',
+                options={
+                    'uri_item': ('my_uri/%s', (arg,)),
+                    'company_id': self.main_company.id,
+                }
+            )
+        msg_a, msg_b = messages
+
+        def handle_outbox_result(message, result):
+            if message == msg_b:
+                raise Exception("Handling failed")
+
+        with patch.object(
+                type(Controller), '_handle_outbox_result',
+                side_effect=handle_outbox_result):
+            with mute_logger('odoo.addons.rest_client.models'
+                             '.rest_client_outbox'):
+                RestClientOutbox.process_outbox()
+        self.assertEqual(msg_a.state, 'done')
+        self.assertEqual(msg_b.state, 'failed')
+        self.assertEqual(msg_b.attempts, 1)
+        self.assertIn('Handling failed', msg_b.error)
+
+    @requests_mock.Mocker()
+    def test_22_outbox_retry_transport_errors(self, mock):
+        """Retry only messages, which failed to reach server."""
+        RestClientOutbox = self.env['rest.client.outbox']
+        mock.post(DUMMY_URL + '/my_uri/a', exc=requests.ConnectTimeout)
+        mock.post(DUMMY_URL + '/my_uri/b', exc=ValueError("Bad call"))
+        Controller = self.RestClientTestController
+        messages = RestClientOutbox
+        for arg in ('a', 'b'):
+            messages |= Controller.enqueue_rest_call(
+                'post',
+                options={
+                    'uri_item': ('my_uri/%s', (arg,)),
+                    'company_id': self.main_company.id,
+                }
+            )
+        # Auth data error would fail the same way on next attempt.
+        messages |= Controller.enqueue_rest_call(
+            'post',
+            options={
+                'uri_item': ('my_uri/c', False),
+                'company_id': self.company_2.id,
+            }
+        )
+        (self.test_auth_2 | self.test_auth_3).action_to_draft()
+        with mute_logger(REST_CLIENT_MODULE_PATH):
+            RestClientOutbox.process_outbox()
+        msg_a, msg_b, msg_c = messages
+        self.assertEqual(msg_a.state, 'pending')
+        self.assertTrue(msg_a.next_attempt_at)
+        self.assertIn('ConnectTimeout', msg_a.error)
+        self.assertEqual(msg_b.state, 'failed')
+        self.assertIn('Bad call', msg_b.error)
+        self.assertEqual(msg_c.state, 'failed')
+        self.assertIn('AuthDataError', msg_c.error)
+
+    @requests_mock.Mocker()
+    def test_23_call_rest_method_metrics_flush_failed(self, mock):
+        """Return response, even if metrics flush fails."""
+        mock.get(DUMMY_URL + '/my_uri', json={'a': 1})
+        RestClientMetric = self.env['rest.client.metric']
+        with patch.object(metrics, 'is_flush_due', return_value=True):
+            with patch.object(
+                    type(RestClientMetric), 'flush_worker_metrics',
+                    side_effect=Exception("Flush failed")):
+                with mute_logger(REST_CLIENT_MODULE_PATH):
+                    response = self.RestClientTestController.call_rest_method(
+                        'get',
+                        options={
+                            'uri_item': ('my_uri', False),
+                            'company_id': self.main_company.id,
+                        }
+                    )
+        self.assertEqual(response.json(), {'a': 1})